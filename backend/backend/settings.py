@@ -209,3 +209,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Notifications are queued in NotificationOutbox and fanned out by
+# `python manage.py run_notification_worker`. Set to True to fan out right
+# after each commit instead (handy for local development without a worker).
+NOTIFICATIONS_DISPATCH_INLINE = False
+
+# Read notifications older than this are removed by
+# `python manage.py prune_notifications` (schedule it, e.g. nightly via cron).
+NOTIFICATION_RETENTION_DAYS = 90
+# Processed notification outbox events are kept this long (same command)
+NOTIFICATION_OUTBOX_RETENTION_DAYS = 7
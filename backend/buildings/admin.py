@@ -1,6 +1,29 @@
 from django.contrib import admin
-from .models import Building, Floor, Room
+from .models import Building, Floor, FloorLayout, LayoutShape, Room
 
 admin.site.register(Building)
-admin.site.register(Floor)
-admin.site.register(Room)
+
+
+@admin.register(Floor)
+class FloorAdmin(admin.ModelAdmin):
+    # __str__ renders the building name
+    list_select_related = ["building"]
+
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    # __str__ renders the building name and floor label
+    list_select_related = ["building", "floor"]
+
+
+class LayoutShapeInline(admin.TabularInline):
+    model = LayoutShape
+    extra = 0
+    raw_id_fields = ["room"]
+
+
+@admin.register(FloorLayout)
+class FloorLayoutAdmin(admin.ModelAdmin):
+    list_display = ["floor", "canvas_width", "canvas_height", "updated_at"]
+    list_select_related = ["floor__building"]
+    inlines = [LayoutShapeInline]
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BuildingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "buildings"
+
+    def ready(self):
+        """Import signals when the app is ready"""
+        import buildings.signals  # Registers the cache invalidation handlers
@@ -0,0 +1,135 @@
+"""
+Cached read models of the location endpoints.
+
+Each payload is cached under a key that includes its version, a
+``CacheVersion`` row shared by all worker processes. ``buildings.signals``
+bumps the version once a transaction that changes the inputs commits, so
+every process moves to a new key and rebuilds the payload on its next
+request; reading the version costs one primary-key lookup.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from .models import Building, CacheVersion, Floor, Room
+
+ISSUES_VERSION = "buildings:issues"
+ISSUES_CACHE_TIMEOUT = 60 * 60  # safety net; saves and deletes invalidate it
+
+# Requests that still need attention (not completed or rejected)
+OPEN_STATUSES = ("pending", "approved", "in_progress")
+
+
+def get_version(name):
+    """The current version of a cached payload (0 until first bumped)"""
+    version = CacheVersion.objects.filter(name=name).values_list("version", flat=True).first()
+    return version or 0
+
+
+def bump_version(name):
+    """Move every process to a new key for ``name``"""
+    if not CacheVersion.objects.filter(name=name).update(version=F("version") + 1):
+        CacheVersion.objects.get_or_create(name=name, defaults={"version": 1})
+
+
+def compute_building_issues():
+    """Open maintenance requests per building, split by status, in one grouped query"""
+    counts = {
+        status: Count("maintenancerequest", filter=Q(maintenancerequest__status=status))
+        for status in OPEN_STATUSES
+    }
+    buildings = Building.objects.annotate(**counts).values(
+        "id", "name", "total_floors", *OPEN_STATUSES
+    )
+
+    results = []
+    for building in buildings:
+        issue_count = sum(building[status] for status in OPEN_STATUSES)
+        results.append({
+            "id": building["id"],
+            "name": building["name"],
+            "total_floors": building["total_floors"],
+            "issue_count": issue_count,
+            "has_issue": issue_count > 0,
+            "by_status": {status: building[status] for status in OPEN_STATUSES},
+        })
+    return results
+
+
+def get_building_issues():
+    """The cached result of compute_building_issues()"""
+    key = f"{ISSUES_VERSION}:{get_version(ISSUES_VERSION)}"
+    return cache.get_or_set(key, compute_building_issues, ISSUES_CACHE_TIMEOUT)
+
+
+def invalidate_building_issues():
+    bump_version(ISSUES_VERSION)
+
+
+# =============================================================================
+# LOCATION TREE - buildings > floors > rooms, keyed by its version
+# =============================================================================
+TREE_VERSION = "buildings:tree"
+TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_tree_version():
+    """The current version of the location tree"""
+    return get_version(TREE_VERSION)
+
+
+def bump_tree_version():
+    """Invalidate the cached tree (any Building/Floor/Room change)"""
+    bump_version(TREE_VERSION)
+
+
+def compute_location_tree():
+    """Every building with its floors and rooms, in three queries"""
+    rooms_by_floor, rooms_by_building = {}, {}
+    for room in Room.objects.order_by("name").values("id", "name", "room_type", "building_id", "floor_id"):
+        entry = {"id": room["id"], "name": room["name"], "room_type": room["room_type"]}
+        if room["floor_id"] is None:
+            rooms_by_building.setdefault(room["building_id"], []).append(entry)
+        else:
+            rooms_by_floor.setdefault(room["floor_id"], []).append(entry)
+
+    floors_by_building = {}
+    for floor in Floor.objects.order_by("number").values("id", "number", "label", "building_id"):
+        floors_by_building.setdefault(floor["building_id"], []).append({
+            "id": floor["id"],
+            "number": floor["number"],
+            "label": floor["label"],
+            "rooms": rooms_by_floor.get(floor["id"], []),
+        })
+
+    return [
+        {
+            **building,
+            "floors": floors_by_building.get(building["id"], []),
+            # Rooms of ground-level buildings have no floor
+            "rooms": rooms_by_building.get(building["id"], []),
+        }
+        for building in Building.objects.order_by("name").values(
+            "id", "name", "has_floors", "total_floors"
+        )
+    ]
+
+
+def get_location_tree():
+    """
+    Return ``(etag, tree)`` for the current version of the location tree
+
+    The ETag is a hash of the content, so it stays the same across processes
+    and cache flushes as long as the tree itself does not change.
+    """
+    key = f"{TREE_VERSION}:{get_tree_version()}"
+    cached = cache.get(key)
+    if cached is None:
+        tree = compute_location_tree()
+        body = json.dumps(tree, sort_keys=True).encode()
+        cached = ('"%s"' % hashlib.md5(body).hexdigest(), tree)
+        cache.set(key, cached, TREE_CACHE_TIMEOUT)
+    return cached
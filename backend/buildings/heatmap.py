@@ -0,0 +1,47 @@
+"""
+Request status per room, as drawn on the floor plans.
+
+Approved requests are left out (they are waiting to be scheduled and are
+not shown on the plan).
+"""
+
+from django.db.models import Count, Q
+
+from .models import Room
+
+
+def dominant_status(counts):
+    """
+    The colour of a room on the floor plan: any pending request wins, then
+    any in-progress one; a room whose requests are all completed is
+    "completed" and a room without requests is "no_request".
+    """
+    if counts["pending"]:
+        return "pending"
+    if counts["in_progress"]:
+        return "in_progress"
+    if counts["total"] and counts["completed"] == counts["total"]:
+        return "completed"
+    return "no_request"
+
+
+def floor_room_statuses(floor_id):
+    """Rooms of a floor with their request counts and status, in one grouped query"""
+    counted = ~Q(maintenancerequest__status="approved")
+    rooms = (
+        Room.objects.filter(floor_id=floor_id)
+        .annotate(
+            total=Count("maintenancerequest", filter=counted),
+            pending=Count("maintenancerequest", filter=Q(maintenancerequest__status="pending")),
+            in_progress=Count("maintenancerequest", filter=Q(maintenancerequest__status="in_progress")),
+            completed=Count("maintenancerequest", filter=Q(maintenancerequest__status="completed")),
+        )
+        .values("id", "name", "room_type", "total", "pending", "in_progress", "completed")
+        .order_by("name")
+    )
+
+    results = []
+    for room in rooms:
+        room["status"] = dominant_status(room)
+        results.append(room)
+    return results
@@ -0,0 +1,162 @@
+"""
+Bulk import of floors and rooms.
+
+Rows are validated together in memory against buildings, floors and rooms
+loaded up front (three queries), then written with ``bulk_create``: the
+cost of an import no longer grows with one ``Room.save()``/``clean()`` round
+trip per row. Either every row is valid and the whole batch is written, or
+nothing is.
+
+A row describes one room, or one floor when ``room`` is empty:
+
+    building      building name (must exist)
+    floor         floor number (required in buildings with floors,
+                  must be empty in ground-level buildings)
+    floor_label   label used when the floor is created (default "Floor <n>")
+    room          room name
+    room_type     one of Room's room_type choices (default "other")
+
+Floors and rooms that already exist are skipped, so an import can be re-run.
+"""
+
+import csv
+import io
+
+from django.db import transaction
+
+from . import caching
+from .models import Building, Floor, Room
+
+ROW_FIELDS = ("building", "floor", "floor_label", "room", "room_type")
+ROOM_TYPES = {value for value, _ in Room._meta.get_field("room_type").choices}
+BATCH_SIZE = 500
+
+
+class LocationImportError(Exception):
+    """The batch has invalid rows; ``errors`` maps row numbers to messages"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+def parse_csv(text):
+    """Read rows from CSV text with a header line naming ROW_FIELDS"""
+    reader = csv.DictReader(io.StringIO(text))
+    missing = {"building"} - set(reader.fieldnames or ())
+    if missing:
+        raise LocationImportError({0: "CSV header must include: building, floor, floor_label, room, room_type"})
+    return list(reader)
+
+
+def _clean(value):
+    return str(value).strip() if value is not None else ""
+
+
+class _Plan:
+    """Floors and rooms to create, resolved against what already exists"""
+
+    def __init__(self):
+        self.buildings = {b.name: b for b in Building.objects.all()}
+        self.floors = {
+            (floor.building_id, floor.number): floor
+            for floor in Floor.objects.all()
+        }
+        # (building id, floor key, name) with floor key = (building id, number)
+        self.rooms = {
+            (building_id, (building_id, number) if number is not None else None, name)
+            for building_id, number, name in Room.objects.values_list(
+                "building_id", "floor__number", "name"
+            )
+        }
+        self.new_floors = []
+        self.new_rooms = []  # (building, floor key or None, name, room_type)
+        self.skipped = 0
+
+    def add(self, row):
+        building_name = _clean(row.get("building"))
+        building = self.buildings.get(building_name)
+        if building is None:
+            raise ValueError(f"Unknown building '{building_name}'")
+
+        floor_key = self._floor(building, row)
+        room_name = _clean(row.get("room"))
+        if not room_name:
+            if floor_key is None:
+                raise ValueError("Row has neither a floor nor a room")
+            return
+
+        room_type = _clean(row.get("room_type")) or "other"
+        if room_type not in ROOM_TYPES:
+            raise ValueError(f"Invalid room_type '{room_type}'")
+
+        key = (building.id, floor_key, room_name)
+        if key in self.rooms:
+            self.skipped += 1
+            return
+        self.rooms.add(key)
+        self.new_rooms.append((building, floor_key, room_name, room_type))
+
+    def _floor(self, building, row):
+        """Resolve (and plan) the row's floor, mirroring Floor/Room.clean()"""
+        number = _clean(row.get("floor"))
+        if not number:
+            if building.has_floors and _clean(row.get("room")):
+                raise ValueError(f"'{building.name}' requires a floor to be specified for rooms")
+            return None
+        if not building.has_floors:
+            raise ValueError(f"'{building.name}' doesn't have floors - leave floor empty")
+        if not number.isdigit():
+            raise ValueError(f"Invalid floor number '{number}'")
+
+        key = (building.id, int(number))
+        if key not in self.floors:
+            label = _clean(row.get("floor_label")) or f"Floor {number}"
+            floor = Floor(building=building, number=int(number), label=label)
+            self.floors[key] = floor
+            self.new_floors.append(floor)
+        return key
+
+
+def import_locations(rows, dry_run=False):
+    """
+    Validate and insert ``rows`` (dicts with ROW_FIELDS)
+
+    Returns a summary dict; raises LocationImportError listing every invalid row.
+    With ``dry_run`` the batch is validated and summarised but not written.
+    """
+    plan = _Plan()
+    errors = {}
+    for number, row in enumerate(rows, start=1):
+        try:
+            plan.add(row)
+        except ValueError as exc:
+            errors[number] = str(exc)
+    if errors:
+        raise LocationImportError(errors)
+
+    summary = {
+        "floors_created": len(plan.new_floors),
+        "rooms_created": len(plan.new_rooms),
+        "rooms_skipped": plan.skipped,
+    }
+    if dry_run:
+        return summary
+
+    with transaction.atomic():
+        Floor.objects.bulk_create(plan.new_floors, batch_size=BATCH_SIZE)
+        Room.objects.bulk_create(
+            [
+                Room(
+                    building=building,
+                    floor=plan.floors[floor_key] if floor_key else None,
+                    name=name,
+                    room_type=room_type,
+                )
+                for building, floor_key, name, room_type in plan.new_rooms
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # bulk_create sends no post_save, so invalidate the location tree here
+        transaction.on_commit(caching.bump_tree_version)
+    return summary
@@ -0,0 +1,258 @@
+"""
+Floor plan layouts: import, export and the per-floor payload.
+
+A layout file lists the plans of one or more floors:
+
+    {"layouts": [
+        {"building": "New Building", "floor": "Ground Floor",
+         "canvas_width": 1000, "canvas_height": 520,
+         "rooms": [{"id": "NB1", "room_number": "NB1", "room_name": "Room NB1",
+                    "x": 40, "y": 40, "width": 140, "height": 100,
+                    "special": null}, ...]},
+        ...]}
+
+``floor`` is the floor label or number. The rooms of a plan are matched to
+``Room`` rows once, when the file is imported, with the rule the floor plan
+page used to apply on every view (a room name equal to the shape's number or
+name, or containing its number; exact matches first). Hallways and stairs
+are never matched. Importing a floor replaces its previous plan; the whole
+file is written, or nothing is.
+
+``manage.py load_floor_layouts`` imports a file; the frontend's built-in
+plans can be exported with ``node scripts/export-room-layouts.mjs``.
+"""
+
+from django.db import transaction
+
+from .heatmap import floor_room_statuses
+from .importer import LocationImportError
+from .models import Building, Floor, FloorLayout, LayoutShape, Room
+
+SPECIAL_SHAPES = {value for value, _ in LayoutShape.SPECIAL_CHOICES}
+SHAPE_FIELDS = ("x", "y", "width", "height")
+BATCH_SIZE = 500
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ""
+
+
+def match_room(shape, rooms):
+    """
+    Pick the room a shape draws out of ``rooms`` (dicts with id and name)
+
+    Exact name matches win over a name that merely contains the room number.
+    """
+    if shape.special in LayoutShape.UNMATCHED_SPECIALS:
+        return None
+    number = shape.room_number.lower()
+    name = shape.room_name.lower()
+    partial = None
+    for room in rooms:
+        room_name = room["name"].lower()
+        if room_name in (number, name):
+            return room["id"]
+        if partial is None and number and number in room_name:
+            partial = room["id"]
+    return partial
+
+
+class _Layouts:
+    """Buildings, floors and rooms loaded once to resolve a whole file"""
+
+    def __init__(self):
+        self.buildings = {b.name: b for b in Building.objects.all()}
+        self.floors = {}
+        for floor in Floor.objects.all():
+            self.floors[(floor.building_id, floor.label)] = floor
+            self.floors[(floor.building_id, str(floor.number))] = floor
+        self.rooms = {}
+        for room in Room.objects.filter(floor__isnull=False).values("id", "name", "floor_id").order_by("name"):
+            self.rooms.setdefault(room["floor_id"], []).append(room)
+
+    def floor(self, entry):
+        building_name = _text(entry.get("building"))
+        building = self.buildings.get(building_name)
+        if building is None:
+            raise ValueError(f"Unknown building '{building_name}'")
+        floor = self.floors.get((building.id, _text(entry.get("floor"))))
+        if floor is None:
+            raise ValueError(f"'{building_name}' has no floor '{_text(entry.get('floor'))}'")
+        return floor
+
+    def shapes(self, floor, entries):
+        shapes = []
+        keys = set()
+        for order, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise ValueError(f"Room #{order + 1} is not an object")
+            key = _text(entry.get("id")) or f"shape-{order + 1}"
+            if key in keys:
+                raise ValueError(f"Duplicate room id '{key}'")
+            keys.add(key)
+
+            special = _text(entry.get("special"))
+            if special and special not in SPECIAL_SHAPES:
+                raise ValueError(f"Room '{key}' has an invalid special '{special}'")
+            try:
+                geometry = {field: float(entry[field]) for field in SHAPE_FIELDS}
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Room '{key}' needs numeric x, y, width and height")
+
+            shape = LayoutShape(
+                key=key,
+                room_number=_text(entry.get("room_number")),
+                room_name=_text(entry.get("room_name")),
+                special=special,
+                order=order,
+                **geometry,
+            )
+            shape.room_id = match_room(shape, self.rooms.get(floor.id, ()))
+            shapes.append(shape)
+        return shapes
+
+
+def import_layouts(data):
+    """
+    Store the floor plans of ``data`` (see the module docstring)
+
+    Returns a summary dict; raises LocationImportError mapping the position
+    of every invalid layout to a message.
+    """
+    entries = data.get("layouts") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise LocationImportError({0: 'Expected {"layouts": [...]}'})
+
+    resolver = _Layouts()
+    plans = {}
+    errors = {}
+    for number, entry in enumerate(entries, start=1):
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("Layout is not an object")
+            floor = resolver.floor(entry)
+            if floor.id in plans:
+                raise ValueError(f"Floor '{floor.label}' appears twice")
+            canvas = {
+                "canvas_width": int(entry.get("canvas_width") or 800),
+                "canvas_height": int(entry.get("canvas_height") or 600),
+            }
+            plans[floor.id] = (floor, canvas, resolver.shapes(floor, entry.get("rooms") or []))
+        except (TypeError, ValueError) as exc:
+            errors[number] = str(exc)
+    if errors:
+        raise LocationImportError(errors)
+
+    with transaction.atomic():
+        existing = {
+            layout.floor_id: layout
+            for layout in FloorLayout.objects.filter(floor_id__in=plans)
+        }
+        LayoutShape.objects.filter(layout__floor_id__in=plans).delete()
+
+        shapes = []
+        for floor_id, (floor, canvas, floor_shapes) in plans.items():
+            layout = existing.get(floor_id)
+            if layout is None:
+                layout = FloorLayout.objects.create(floor=floor, **canvas)
+            else:
+                for field, value in canvas.items():
+                    setattr(layout, field, value)
+                layout.save()
+            for shape in floor_shapes:
+                shape.layout = layout
+            shapes.extend(floor_shapes)
+
+        LayoutShape.objects.bulk_create(shapes, batch_size=BATCH_SIZE)
+    return {
+        "floors": len(plans),
+        "shapes": len(shapes),
+        "matched": sum(1 for shape in shapes if shape.room_id),
+    }
+
+
+def _shape_dict(shape):
+    return {
+        "id": shape["key"],
+        "room_number": shape["room_number"],
+        "room_name": shape["room_name"],
+        "x": shape["x"],
+        "y": shape["y"],
+        "width": shape["width"],
+        "height": shape["height"],
+        "special": shape["special"] or None,
+    }
+
+
+def export_layouts(building=None):
+    """All stored plans (of one building name, if given) in the import format"""
+    layouts = FloorLayout.objects.select_related("floor__building").order_by(
+        "floor__building__name", "floor__number"
+    )
+    if building:
+        layouts = layouts.filter(floor__building__name=building)
+    layouts = list(layouts)
+
+    shapes = {}
+    for shape in LayoutShape.objects.filter(layout__in=layouts).values(
+        "layout_id", "key", "room_number", "room_name", *SHAPE_FIELDS, "special"
+    ):
+        shapes.setdefault(shape["layout_id"], []).append(_shape_dict(shape))
+
+    return {
+        "layouts": [
+            {
+                "building": layout.floor.building.name,
+                "floor": layout.floor.label,
+                "canvas_width": layout.canvas_width,
+                "canvas_height": layout.canvas_height,
+                "rooms": shapes.get(layout.id, []),
+            }
+            for layout in layouts
+        ]
+    }
+
+
+def floor_layout_payload(floor_id):
+    """
+    The plan of a floor with each room's request status, or None
+
+    Three queries: the layout, its shapes and the grouped room statuses.
+    Shapes without a room keep the "no_request" defaults.
+    """
+    layout = (
+        FloorLayout.objects.filter(floor_id=floor_id)
+        .values(
+            "id", "canvas_width", "canvas_height",
+            "floor__number", "floor__label", "floor__building_id", "floor__building__name",
+        )
+        .first()
+    )
+    if layout is None:
+        return None
+
+    statuses = {room["id"]: room for room in floor_room_statuses(floor_id)}
+    rooms = []
+    for shape in LayoutShape.objects.filter(layout_id=layout["id"]).values(
+        "key", "room_id", "room__name", "room_number", "room_name", *SHAPE_FIELDS, "special"
+    ):
+        room = _shape_dict(shape)
+        counts = statuses.get(shape["room_id"])
+        room["room_id"] = shape["room_id"]
+        if shape["room__name"]:
+            room["room_name"] = shape["room__name"]
+        room["status"] = counts["status"] if counts else "no_request"
+        room["request_count"] = counts["total"] if counts else 0
+        rooms.append(room)
+
+    return {
+        "floor": {
+            "id": floor_id,
+            "number": layout["floor__number"],
+            "label": layout["floor__label"],
+            "building": {"id": layout["floor__building_id"], "name": layout["floor__building__name"]},
+        },
+        "canvas_width": layout["canvas_width"],
+        "canvas_height": layout["canvas_height"],
+        "rooms": rooms,
+    }
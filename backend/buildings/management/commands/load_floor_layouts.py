@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from buildings.importer import LocationImportError
+from buildings.layouts import import_layouts
+
+
+class Command(BaseCommand):
+    help = "Import floor plan layouts from a JSON file (see buildings.layouts)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON file holding {\"layouts\": [...]}")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], encoding="utf-8-sig") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        try:
+            summary = import_layouts(data)
+        except LocationImportError as exc:
+            for number, message in exc.errors.items():
+                self.stderr.write(f"Layout {number}: {message}")
+            raise CommandError("No layouts were imported")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary['shapes']} shapes on {summary['floors']} floors "
+            f"({summary['matched']} matched to rooms)"
+        ))
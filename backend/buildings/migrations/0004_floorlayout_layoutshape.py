@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0003_alter_building_options_alter_floor_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FloorLayout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('canvas_width', models.PositiveIntegerField(default=800)),
+                ('canvas_height', models.PositiveIntegerField(default=600)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('floor', models.OneToOneField(help_text='The floor this plan draws', on_delete=django.db.models.deletion.CASCADE, related_name='layout', to='buildings.floor')),
+            ],
+            options={
+                'verbose_name': 'Floor layout',
+                'verbose_name_plural': 'Floor layouts',
+            },
+        ),
+        migrations.CreateModel(
+            name='LayoutShape',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text="Identifier of the shape within the plan (e.g. 'NB1')", max_length=50)),
+                ('room_number', models.CharField(blank=True, max_length=50)),
+                ('room_name', models.CharField(blank=True, max_length=100)),
+                ('x', models.FloatField()),
+                ('y', models.FloatField()),
+                ('width', models.FloatField()),
+                ('height', models.FloatField()),
+                ('special', models.CharField(blank=True, choices=[('hallway', 'Hallway'), ('stairs', 'Stairs'), ('cr', 'Comfort room')], max_length=20)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('layout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shapes', to='buildings.floorlayout')),
+                ('room', models.ForeignKey(blank=True, help_text='The room this shape draws, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='layout_shapes', to='buildings.room')),
+            ],
+            options={
+                'verbose_name': 'Layout shape',
+                'verbose_name_plural': 'Layout shapes',
+                'ordering': ['layout', 'order'],
+                'unique_together': {('layout', 'key')},
+            },
+        ),
+    ]
@@ -123,22 +123,54 @@ class Room(models.Model):
         verbose_name = "Room"
         verbose_name_plural = "Rooms"
 
+    def _location_facts(self):
+        """
+        Return ``(floor's building id, building has floors)`` for clean()
+
+        Uses the building and floor objects when they are already loaded
+        (passed in, or select_related) and one query otherwise.
+        """
+        floor_loaded = self.floor_id is None or Room.floor.is_cached(self)
+        if floor_loaded and Room.building.is_cached(self):
+            floor_building_id = self.floor.building_id if self.floor_id is not None else None
+            return floor_building_id, self.building.has_floors
+        if self.floor_id is None:
+            has_floors = (
+                Building.objects.filter(pk=self.building_id)
+                .values_list("has_floors", flat=True)
+                .first()
+            )
+            return None, has_floors
+        # The floor's building stands in for ours; a mismatch is an error anyway
+        return (
+            Floor.objects.filter(pk=self.floor_id)
+            .values_list("building_id", "building__has_floors")
+            .first()
+        ) or (None, None)
+
     def clean(self):
-        """Validate room-floor-building relationships"""
+        """
+        Validate room-floor-building relationships
+
+        Compares ids, so a room built with its building and floor objects
+        validates without queries and one built from ids with one query.
+        """
+        floor_building_id, has_floors = self._location_facts()
+
         # If floor is specified, ensure it matches the building
-        if self.floor and self.floor.building != self.building:
+        if self.floor_id is not None and floor_building_id != self.building_id:
             raise ValidationError(
                 f"Room's building ('{self.building.name}') must match the floor's building ('{self.floor.building.name}')"
             )
 
         # If building requires floors, ensure floor is specified
-        if self.building.has_floors and not self.floor:
+        if has_floors and self.floor_id is None:
             raise ValidationError(
                 f"'{self.building.name}' requires a floor to be specified for rooms"
             )
 
         # If building doesn't have floors, ensure floor is NOT specified
-        if not self.building.has_floors and self.floor:
+        if has_floors is False and self.floor_id is not None:
             raise ValidationError(
                 f"'{self.building.name}' doesn't have floors - room should not have a floor assigned"
             )
@@ -147,3 +179,88 @@ class Room(models.Model):
         # Run validation before saving
         self.clean()
         super().save(*args, **kwargs)
+
+
+class FloorLayout(models.Model):
+    """
+    Floor plan of a floor: the canvas size plus one LayoutShape per room,
+    hallway or staircase drawn on it
+    """
+
+    floor = models.OneToOneField(
+        Floor,
+        on_delete=models.CASCADE,
+        related_name="layout",
+        help_text="The floor this plan draws",
+    )
+    canvas_width = models.PositiveIntegerField(default=800)
+    canvas_height = models.PositiveIntegerField(default=600)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Layout of floor #{self.floor_id}"
+
+    class Meta:
+        verbose_name = "Floor layout"
+        verbose_name_plural = "Floor layouts"
+
+
+class LayoutShape(models.Model):
+    """
+    One rectangle of a floor plan
+
+    ``room`` is resolved when the layout is imported (see buildings.layouts),
+    so serving a plan needs no name matching.
+    """
+
+    SPECIAL_CHOICES = [
+        ("hallway", "Hallway"),
+        ("stairs", "Stairs"),
+        ("cr", "Comfort room"),
+    ]
+    # Shapes that never stand for a Room
+    UNMATCHED_SPECIALS = {"hallway", "stairs"}
+
+    layout = models.ForeignKey(FloorLayout, on_delete=models.CASCADE, related_name="shapes")
+    key = models.CharField(max_length=50, help_text="Identifier of the shape within the plan (e.g. 'NB1')")
+    room = models.ForeignKey(
+        Room,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="layout_shapes",
+        help_text="The room this shape draws, if any",
+    )
+    room_number = models.CharField(max_length=50, blank=True)
+    room_name = models.CharField(max_length=100, blank=True)
+    x = models.FloatField()
+    y = models.FloatField()
+    width = models.FloatField()
+    height = models.FloatField()
+    special = models.CharField(max_length=20, choices=SPECIAL_CHOICES, blank=True)
+    order = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} ({self.room_name or self.room_number})"
+
+    class Meta:
+        ordering = ["layout", "order"]
+        unique_together = ["layout", "key"]
+        verbose_name = "Layout shape"
+        verbose_name_plural = "Layout shapes"
+
+
+class CacheVersion(models.Model):
+    """
+    Version number of a cached location read model (see buildings.caching)
+
+    Kept in the database so every worker process agrees on it; only the
+    payloads, stored under a key that includes the version, are cached in
+    process.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
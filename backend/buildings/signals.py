@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from maintenance.models import MaintenanceRequest
+from . import caching
+from .models import Building, Floor, Room
+
+
+# =============================================================================
+# BUILDING ISSUES CACHE - drop it after any change to requests or buildings
+# =============================================================================
+@receiver(post_save, sender=MaintenanceRequest)
+@receiver(post_delete, sender=MaintenanceRequest)
+@receiver(post_save, sender=Building)
+@receiver(post_delete, sender=Building)
+def invalidate_building_issues(sender, **kwargs):
+    """Invalidate after commit so no reader can re-cache the old state"""
+    transaction.on_commit(caching.invalidate_building_issues)
+
+
+# =============================================================================
+# LOCATION TREE - new version after any building, floor or room change
+# =============================================================================
+@receiver(post_save, sender=Building)
+@receiver(post_delete, sender=Building)
+@receiver(post_save, sender=Floor)
+@receiver(post_delete, sender=Floor)
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def bump_location_tree_version(sender, **kwargs):
+    transaction.on_commit(caching.bump_tree_version)
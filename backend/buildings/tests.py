@@ -1,3 +1,367 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from maintenance.models import MaintenanceRequest
+from . import caching
+from .models import Building, Floor, FloorLayout, LayoutShape, Room
+
+
+class FloorHeatmapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="x")
+        building = Building.objects.create(name="Annex")
+        cls.floor = Floor.objects.create(building=building, number=2, label="2nd Floor")
+        other_floor = Floor.objects.create(building=building, number=3, label="3rd Floor")
+        rooms = {
+            name: Room.objects.create(building=building, floor=cls.floor, name=name)
+            for name in ("A1", "A2", "A3", "A4")
+        }
+        elsewhere = Room.objects.create(building=building, floor=other_floor, name="B1")
+
+        def add(room, status):
+            MaintenanceRequest.objects.create(
+                description="x", role="staff", status=status,
+                building=building, floor=room.floor, room=room,
+            )
+
+        add(rooms["A1"], "pending")
+        add(rooms["A1"], "completed")
+        add(rooms["A2"], "in_progress")
+        add(rooms["A2"], "approved")
+        add(rooms["A3"], "completed")
+        add(rooms["A3"], "approved")
+        add(elsewhere, "pending")
+
+    def test_room_statuses(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(2):
+            response = client.get(f"/api/location/floors/{self.floor.id}/heatmap/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["floor"]["label"], "2nd Floor")
+
+        rooms = {room["name"]: room for room in response.data["rooms"]}
+        self.assertEqual(
+            {name: (room["status"], room["total"]) for name, room in rooms.items()},
+            {
+                "A1": ("pending", 2),
+                "A2": ("in_progress", 1),
+                "A3": ("completed", 1),
+                "A4": ("no_request", 0),
+            },
+        )
+        self.assertEqual(rooms["A1"]["pending"], 1)
+        self.assertEqual(rooms["A1"]["completed"], 1)
+
+    def test_unknown_floor(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get("/api/location/floors/999/heatmap/")
+        self.assertEqual(response.status_code, 404)
+
+
+class BuildingIssuesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="x")
+        cls.annex = Building.objects.create(name="Annex", total_floors=3)
+        cls.quiet = Building.objects.create(name="Quiet Hall")
+        for status in ("pending", "pending", "in_progress", "completed", "rejected"):
+            MaintenanceRequest.objects.create(
+                description="x", role="staff", status=status, building=cls.annex
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def issues(self):
+        response = self.client.get("/api/location/buildings/issues/")
+        self.assertEqual(response.status_code, 200)
+        return {building["name"]: building for building in response.data}
+
+    def test_counts_only_open_requests(self):
+        issues = self.issues()
+        self.assertEqual(issues["Annex"]["issue_count"], 3)
+        self.assertEqual(
+            issues["Annex"]["by_status"], {"pending": 2, "approved": 0, "in_progress": 1}
+        )
+        self.assertTrue(issues["Annex"]["has_issue"])
+        self.assertFalse(issues["Quiet Hall"]["has_issue"])
+
+    def test_cached_until_a_request_changes(self):
+        self.issues()
+        # Only the shared version is read
+        with self.assertNumQueries(1):
+            self.issues()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MaintenanceRequest.objects.create(
+                description="y", role="staff", building=self.quiet
+            )
+        self.assertEqual(self.issues()["Quiet Hall"]["issue_count"], 1)
+
+    def test_status_change_invalidates(self):
+        self.assertEqual(self.issues()["Annex"]["issue_count"], 3)
+        request = MaintenanceRequest.objects.filter(building=self.annex, status="pending").first()
+        with self.captureOnCommitCallbacks(execute=True):
+            request.status = "completed"
+            request.save()
+        self.assertEqual(self.issues()["Annex"]["by_status"]["pending"], 1)
+
+    def test_delete_invalidates(self):
+        self.assertEqual(self.issues()["Annex"]["issue_count"], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            MaintenanceRequest.objects.filter(building=self.annex, status="in_progress").get().delete()
+        self.assertEqual(self.issues()["Annex"]["issue_count"], 2)
+
+    def test_invalidation_reaches_other_processes(self):
+        self.issues()
+        # Another worker saved a request and bumped the shared version; none
+        # of this process's cache entries were touched
+        MaintenanceRequest.objects.create(description="y", role="staff", building=self.quiet)
+        with mock.patch.object(caching, "cache"):
+            caching.invalidate_building_issues()
+        self.assertEqual(self.issues()["Quiet Hall"]["issue_count"], 1)
+
+
+class LocationTreeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="x")
+        cls.annex = Building.objects.create(name="Annex")
+        cls.grounds = Building.objects.create(name="Grounds", has_floors=False)
+        cls.floor = Floor.objects.create(building=cls.annex, number=1, label="Ground Floor")
+        Room.objects.create(building=cls.annex, floor=cls.floor, name="A1")
+        Room.objects.create(building=cls.grounds, name="Field")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_tree(self, **headers):
+        return self.client.get("/api/location/tree/", headers=headers)
+
+    def test_nested_tree(self):
+        response = self.get_tree()
+        self.assertEqual(response.status_code, 200)
+        tree = {building["name"]: building for building in response.data}
+        self.assertEqual(tree["Annex"]["floors"][0]["rooms"][0]["name"], "A1")
+        self.assertEqual(tree["Grounds"]["floors"], [])
+        self.assertEqual(tree["Grounds"]["rooms"][0]["name"], "Field")
+
+    def test_etag_revalidation(self):
+        etag = self.get_tree()["ETag"]
+
+        # Only the shared version is read
+        with self.assertNumQueries(1):
+            response = self.get_tree(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.create(building=self.annex, floor=self.floor, name="A2")
+        response = self.get_tree(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data[0]["floors"][0]["rooms"]), 2)
+
+    def test_version_is_shared_by_processes(self):
+        etag = self.get_tree()["ETag"]
+        # Another worker added a room and bumped the version in the database
+        Room.objects.create(building=self.annex, floor=self.floor, name="A2")
+        with mock.patch.object(caching, "cache"):
+            caching.bump_tree_version()
+
+        response = self.get_tree(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data[0]["floors"][0]["rooms"]), 2)
+
+
+
+class RoomValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.annex = Building.objects.create(name="Annex")
+        cls.grounds = Building.objects.create(name="Grounds", has_floors=False)
+        cls.floor = Floor.objects.create(building=cls.annex, number=1, label="Ground Floor")
+        cls.other_floor = Floor.objects.create(
+            building=Building.objects.create(name="Other"), number=1, label="Ground Floor"
+        )
+
+    def test_save_with_related_objects_only_inserts(self):
+        with self.assertNumQueries(1):
+            Room(building=self.annex, floor=self.floor, name="A1").save()
+
+    def test_save_from_ids_costs_one_lookup(self):
+        with self.assertNumQueries(2):
+            Room(building_id=self.annex.id, floor_id=self.floor.id, name="A2").save()
+        with self.assertNumQueries(2):
+            Room(building_id=self.grounds.id, name="Field").save()
+
+    def test_invalid_rooms(self):
+        for room in (
+            Room(building_id=self.annex.id, floor_id=self.other_floor.id, name="X"),
+            Room(building_id=self.annex.id, name="X"),
+            Room(building=self.grounds, floor=self.floor, name="X"),
+        ):
+            with self.assertRaises(ValidationError):
+                room.save()
+        self.assertFalse(Room.objects.filter(name="X").exists())
+
+
+class LocationImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.annex = Building.objects.create(name="Annex")
+        cls.grounds = Building.objects.create(name="Grounds", has_floors=False)
+        floor = Floor.objects.create(building=cls.annex, number=1, label="Ground Floor")
+        Room.objects.create(building=cls.annex, floor=floor, name="A1")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_csv_import_in_constant_queries(self):
+        lines = ["building,floor,floor_label,room,room_type", "Annex,1,,A1,"]
+        lines += [f"Annex,{n},Floor {n},R{n}-{i},classroom" for n in (2, 3) for i in range(200)]
+        lines += ["Grounds,,,Field,other"]
+        upload = SimpleUploadedFile("rooms.csv", "\n".join(lines).encode(), content_type="text/csv")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post("/api/location/import/", {"file": upload})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            (response.data["floors_created"], response.data["rooms_created"], response.data["rooms_skipped"]),
+            (2, 401, 1),
+        )
+        self.assertLess(len(context), 20)
+        self.assertEqual(Room.objects.filter(floor__number=3).count(), 200)
+        self.assertEqual(Room.objects.get(name="Field").floor, None)
+
+    def test_invalid_batch_writes_nothing(self):
+        rows = [
+            {"building": "Annex", "floor": 2, "room": "B1"},
+            {"building": "Nowhere", "floor": 1, "room": "X"},
+            {"building": "Annex", "room": "No floor"},
+            {"building": "Grounds", "floor": 1, "room": "Shed"},
+            {"building": "Annex", "floor": 2, "room": "B2", "room_type": "ballroom"},
+        ]
+        response = self.client.post("/api/location/import/", rows, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(response.data["errors"]), [2, 3, 4, 5])
+        self.assertFalse(Room.objects.filter(name="B1").exists())
+        self.assertFalse(Floor.objects.filter(number=2).exists())
+
+    def test_dry_run(self):
+        response = self.client.post(
+            "/api/location/import/?dry_run=true",
+            {"rows": [{"building": "Annex", "floor": 5, "floor_label": "Roof", "room": "Deck"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rooms_created"], 1)
+        self.assertFalse(Floor.objects.filter(number=5).exists())
+
+
+class FloorLayoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        building = Building.objects.create(name="New Building")
+        cls.floor = Floor.objects.create(building=building, number=1, label="Ground Floor")
+        cls.nb1 = Room.objects.create(building=building, floor=cls.floor, name="NB1")
+        cls.lab = Room.objects.create(building=building, floor=cls.floor, name="Computer Lab NB2")
+        MaintenanceRequest.objects.create(
+            description="x", role="staff", status="pending",
+            building=building, floor=cls.floor, room=cls.nb1,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def layouts(self, **extra):
+        rooms = [
+            {"id": "NB1", "room_number": "NB1", "room_name": "Room NB1", "x": 0, "y": 0, "width": 10, "height": 10},
+            {"id": "NB2", "room_number": "NB2", "room_name": "Room NB2", "x": 20, "y": 0, "width": 10, "height": 10},
+            {"id": "HALL", "room_number": "NB1", "room_name": "Hallway", "x": 0, "y": 20,
+             "width": 30, "height": 5, "special": "hallway"},
+            {"id": "CR", "room_number": "CR M", "room_name": "Male CR", "x": 40, "y": 0, "width": 5, "height": 5},
+        ]
+        layout = {"building": "New Building", "floor": "Ground Floor",
+                  "canvas_width": 900, "canvas_height": 400, "rooms": rooms, **extra}
+        return {"layouts": [layout]}
+
+    def test_rooms_are_matched_at_import(self):
+        response = self.client.post("/api/location/layouts/import/", self.layouts(), format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data, {"floors": 1, "shapes": 4, "matched": 2})
+
+        matched = dict(LayoutShape.objects.values_list("key", "room_id"))
+        self.assertEqual(matched, {"NB1": self.nb1.id, "NB2": self.lab.id, "HALL": None, "CR": None})
+
+    def test_reimport_replaces_the_plan(self):
+        self.client.post("/api/location/layouts/import/", self.layouts(), format="json")
+        data = self.layouts(floor="1", canvas_width=1000)
+        data["layouts"][0]["rooms"] = data["layouts"][0]["rooms"][:1]
+        response = self.client.post("/api/location/layouts/import/", data, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(FloorLayout.objects.get().canvas_width, 1000)
+        self.assertEqual(LayoutShape.objects.count(), 1)
+
+    def test_invalid_file_writes_nothing(self):
+        data = self.layouts()
+        data["layouts"][0]["rooms"][1]["x"] = "left"
+        data["layouts"].append({"building": "New Building", "floor": "Roof", "rooms": []})
+        response = self.client.post("/api/location/layouts/import/", data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(response.data["errors"]), [1, 2])
+        self.assertFalse(FloorLayout.objects.exists())
+
+    def test_floor_payload_joins_status(self):
+        self.client.post("/api/location/layouts/import/", self.layouts(), format="json")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/location/floors/{self.floor.id}/layout/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(context), 3)
+        self.assertEqual((response.data["canvas_width"], response.data["canvas_height"]), (900, 400))
+        rooms = {room["id"]: room for room in response.data["rooms"]}
+        self.assertEqual(
+            (rooms["NB1"]["room_id"], rooms["NB1"]["status"], rooms["NB1"]["request_count"]),
+            (self.nb1.id, "pending", 1),
+        )
+        self.assertEqual(rooms["NB2"]["room_name"], "Computer Lab NB2")
+        self.assertEqual((rooms["CR"]["room_id"], rooms["CR"]["status"]), (None, "no_request"))
+        self.assertEqual(rooms["HALL"]["special"], "hallway")
+
+    def test_floor_without_layout(self):
+        response = self.client.get(f"/api/location/floors/{self.floor.id}/layout/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_round_trip(self):
+        data = self.layouts()
+        self.client.post("/api/location/layouts/import/", data, format="json")
+        response = self.client.get("/api/location/layouts/export/")
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        exported = response.data["layouts"][0]
+        self.assertEqual(exported["canvas_width"], 900)
+        self.assertEqual([room["id"] for room in exported["rooms"]], ["NB1", "NB2", "HALL", "CR"])
+        self.assertEqual(exported["rooms"][2]["special"], "hallway")
+        self.assertEqual(exported["rooms"][0]["special"], None)
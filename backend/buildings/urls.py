@@ -1,15 +1,29 @@
 from django.urls import path
 from .views import (
+    BuildingIssuesViewSet,
     BuildingListCreateView,
     BuildingDetailView,
     FloorListView,
     RoomListView,
+    FloorHeatmapView,
+    LocationTreeView,
+    LocationImportView,
+    FloorLayoutView,
+    LayoutImportView,
+    LayoutExportView,
 )
 
 urlpatterns = [
+    path("tree/", LocationTreeView.as_view()),
+    path("import/", LocationImportView.as_view()),
+    path("layouts/import/", LayoutImportView.as_view()),
+    path("layouts/export/", LayoutExportView.as_view()),
     path("buildings/", BuildingListCreateView.as_view()),
     path("buildings/<int:pk>/", BuildingDetailView.as_view()),
+    path("buildings/issues/", BuildingIssuesViewSet.as_view({"get": "list"})),
     path("buildings/<int:building_id>/floors/", FloorListView.as_view()),
     path("buildings/<int:building_id>/rooms/", RoomListView.as_view()),
     path("floors/<int:floor_id>/rooms/", RoomListView.as_view()),
+    path("floors/<int:floor_id>/heatmap/", FloorHeatmapView.as_view()),
+    path("floors/<int:floor_id>/layout/", FloorLayoutView.as_view()),
 ]   
\ No newline at end of file
@@ -1,32 +1,31 @@
+import json
+
 from rest_framework import viewsets
 from rest_framework.response import Response
-from django.db.models import Count
+from rest_framework.views import APIView
 from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.utils.http import parse_etags
+from .caching import get_building_issues, get_location_tree
+from .heatmap import floor_room_statuses
+from .importer import LocationImportError, import_locations, parse_csv
+from .layouts import export_layouts, floor_layout_payload, import_layouts
 from .models import Building, Floor, Room
 from .serializers import BuildingSerializer, FloorSerializer, RoomSerializer
 
 
 class BuildingIssuesViewSet(viewsets.ViewSet):
     """
-    Returns buildings with an annotation of whether they have issues.
+    Returns buildings with their open maintenance requests by status.
+
+    Served from a cache that MaintenanceRequest and Building saves/deletes
+    invalidate (see buildings.caching / buildings.signals).
     """
+    permission_classes = [IsAuthenticated]
 
     def list(self, request):
-        buildings = Building.objects.annotate(
-            issue_count=Count("maintenancerequest")
-        ).values(
-            "id",
-            "name",
-            "issue_count",
-            "total_floors"
-        )
-
-        # Convert issue_count into a boolean for easier frontend logic
-        for b in buildings:
-            b["has_issue"] = b["issue_count"] > 0
-
-        return Response(buildings)
+        return Response(get_building_issues())
 
 class BuildingListCreateView(generics.ListCreateAPIView):
     queryset = Building.objects.all()
@@ -59,4 +58,152 @@ class RoomListView(generics.ListAPIView):
 
         if floor_id is None:
             return Room.objects.filter(building_id=building_id)
-        return Room.objects.filter(floor_id=floor_id)
\ No newline at end of file
+        return Room.objects.filter(floor_id=floor_id)
+
+
+class FloorHeatmapView(APIView):
+    """
+    Per-room request status of one floor, aggregated in a single query
+
+    GET /api/location/floors/<floor_id>/heatmap/
+    Approved requests are left out, as on the floor plan.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, floor_id):
+        floor = (
+            Floor.objects.filter(id=floor_id)
+            .values("id", "number", "label", "building_id", "building__name")
+            .first()
+        )
+        if floor is None:
+            return Response({"error": "Floor not found"}, status=404)
+
+        results = floor_room_statuses(floor_id)
+
+        return Response({
+            "floor": {
+                "id": floor["id"],
+                "number": floor["number"],
+                "label": floor["label"],
+                "building": {"id": floor["building_id"], "name": floor["building__name"]},
+            },
+            "rooms": results,
+        })
+
+
+class LocationTreeView(APIView):
+    """
+    The whole campus as one nested tree: buildings > floors > rooms
+
+    GET /api/location/tree/
+    Served from the cache and validated with an ETag: clients that send the
+    last ETag in If-None-Match get an empty 304 until a building, floor or
+    room changes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        etag, tree = get_location_tree()
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in parse_etags(if_none_match):
+            response = Response(status=304)
+        else:
+            response = Response(tree)
+        response["ETag"] = etag
+        # Cacheable by the browser, but always revalidated
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class LocationImportView(APIView):
+    """
+    Bulk-create floors and rooms from CSV or JSON (see buildings.importer)
+
+    POST /api/location/import/[?dry_run=true]
+      - multipart with a "file" (.csv, or .json holding a list of rows)
+      - or a JSON body: a list of rows, or {"rows": [...]}
+    Responds 400 with {"errors": {row number: message}} and writes nothing
+    if any row is invalid.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request):
+        try:
+            rows = self.get_rows(request)
+            dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+            summary = import_locations(rows, dry_run=dry_run)
+        except LocationImportError as exc:
+            return Response({"errors": exc.errors}, status=400)
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({"error": f"Could not read the import: {exc}"}, status=400)
+
+        return Response({**summary, "dry_run": dry_run}, status=200 if dry_run else 201)
+
+    def get_rows(self, request):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            text = upload.read().decode("utf-8-sig")
+            rows = json.loads(text) if upload.name.lower().endswith(".json") else parse_csv(text)
+        else:
+            rows = request.data.get("rows") if isinstance(request.data, dict) else request.data
+
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("expected a list of row objects")
+        return rows
+
+
+class FloorLayoutView(APIView):
+    """
+    The stored plan of a floor, joined with each room's request status
+
+    GET /api/location/floors/<floor_id>/layout/
+    Responds 404 when no plan was imported for the floor; the floor plan
+    page then falls back to its built-in layouts.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, floor_id):
+        payload = floor_layout_payload(floor_id)
+        if payload is None:
+            return Response({"error": "No layout for this floor"}, status=404)
+        return Response(payload)
+
+
+class LayoutImportView(APIView):
+    """
+    Store floor plans from a JSON file or body (see buildings.layouts)
+
+    POST /api/location/layouts/import/
+      - multipart with a "file" holding {"layouts": [...]}
+      - or that object as the JSON body
+    Responds 400 with {"errors": {layout number: message}} and writes
+    nothing if any layout is invalid.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        try:
+            data = json.loads(upload.read().decode("utf-8-sig")) if upload is not None else request.data
+            summary = import_layouts(data)
+        except LocationImportError as exc:
+            return Response({"errors": exc.errors}, status=400)
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({"error": f"Could not read the layouts: {exc}"}, status=400)
+
+        return Response(summary, status=201)
+
+
+class LayoutExportView(APIView):
+    """
+    GET /api/location/layouts/export/[?building=<name>]
+    The stored plans in the format LayoutImportView accepts
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(export_layouts(request.query_params.get("building")))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_system', '0003_alter_maintenanceschedule_assigned_staff'),
+        ('maintenance', '0018_maintenance_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['schedule_date', 'id'], name='cal_sched_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceschedule',
+            index=models.Index(fields=['assigned_staff', 'schedule_date', 'id'], name='cal_sched_staff_date_idx'),
+        ),
+    ]
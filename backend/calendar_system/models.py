@@ -23,4 +23,12 @@ class MaintenanceSchedule(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Schedule for Request #{self.request.id} on {self.schedule_date}"
\ No newline at end of file
+        return f"Schedule for Request #{self.request.id} on {self.schedule_date}"
+
+    class Meta:
+        indexes = [
+            # Calendar ranges (start <= schedule_date <= end), in date order
+            models.Index(fields=["schedule_date", "id"], name="cal_sched_date_idx"),
+            # The same, for one staff member's calendar
+            models.Index(fields=["assigned_staff", "schedule_date", "id"], name="cal_sched_staff_date_idx"),
+        ]
\ No newline at end of file
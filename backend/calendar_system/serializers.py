@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from .models import MaintenanceSchedule
-from maintenance.serializers import MaintenanceRequestSerializer
+from maintenance.serializers import (
+    MaintenanceRequestSerializer,
+    USER_VALUE_FIELDS,
+    format_datetime,
+    request_row_to_dict,
+    request_value_fields,
+)
 from accounts.serializers import UserSerializer
 from accounts.models import User
 
@@ -33,3 +39,79 @@ class MaintenanceScheduleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at"]
 
+
+
+# Fast read-only path: MaintenanceScheduleSerializer output built from .values() rows
+SCHEDULE_VALUE_FIELDS = (
+    'id', 'request_id', 'schedule_date', 'estimated_duration', 'created_at',
+    'assigned_staff_id',
+    *(f'assigned_staff__{name}' for name in USER_VALUE_FIELDS[1:]),
+    *request_value_fields('request__'),
+)
+
+
+def schedule_row_to_dict(row, request=None):
+    """Turn one .values(*SCHEDULE_VALUE_FIELDS) row into MaintenanceScheduleSerializer output"""
+    staff = None
+    if row['assigned_staff_id'] is not None:
+        staff = {'id': row['assigned_staff_id']}
+        for name in USER_VALUE_FIELDS[1:]:
+            staff[name] = row[f'assigned_staff__{name}']
+
+    return {
+        'id': row['id'],
+        'request': row['request_id'],
+        'request_details': request_row_to_dict(row, request, prefix='request__'),
+        'schedule_date': row['schedule_date'].isoformat(),
+        'estimated_duration': row['estimated_duration'],
+        'assigned_staff': row['assigned_staff_id'],
+        'assigned_staff_details': staff,
+        'created_at': format_datetime(row['created_at']),
+    }
+
+
+# Compact calendar events (?compact=true): what a calendar cell shows, with
+# the full schedule fetched on demand from GET /api/calendar/schedule/<request id>/
+EVENT_TITLE_LENGTH = 60
+
+_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+EVENT_VALUE_FIELDS = (
+    'id', 'request_id', 'schedule_date',
+    'request__description', 'request__status',
+    'request__building__name', 'request__floor__label', 'request__room__name',
+    *(f'assigned_staff__{name}' for name in _NAME_FIELDS),
+    *(f'request__assigned_to__{name}' for name in _NAME_FIELDS),
+)
+
+
+def _display_name(row, prefix):
+    if row[prefix + 'username'] is None:
+        return None
+    full_name = f"{row[prefix + 'first_name']} {row[prefix + 'last_name']}".strip()
+    return full_name or row[prefix + 'username']
+
+
+def event_row_to_dict(row):
+    """Turn one .values(*EVENT_VALUE_FIELDS) row into a compact calendar event"""
+    title = row['request__description'] or f"Request #{row['request_id']}"
+    if len(title) > EVENT_TITLE_LENGTH:
+        title = title[:EVENT_TITLE_LENGTH].rstrip() + '…'
+
+    location = [row['request__building__name'], row['request__floor__label']]
+    if row['request__room__name']:
+        location.append(f"Room {row['request__room__name']}")
+
+    return {
+        'id': row['id'],
+        'request': row['request_id'],
+        'date': row['schedule_date'].isoformat(),
+        'title': title,
+        'status': row['request__status'],
+        'location': ', '.join(part for part in location if part),
+        # The scheduled staff member, else whoever claimed the request
+        'assignee': (
+            _display_name(row, 'assigned_staff__')
+            or _display_name(row, 'request__assigned_to__')
+        ),
+    }
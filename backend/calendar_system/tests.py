@@ -1,3 +1,187 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from buildings.models import Building, Floor, Room
+from maintenance.models import MaintenanceRequest
+from .models import MaintenanceSchedule
+from .serializers import (
+    MaintenanceScheduleSerializer,
+    SCHEDULE_VALUE_FIELDS,
+    schedule_row_to_dict,
+)
+
+
+class FastScheduleSerializationTests(TestCase):
+    """The .values() calendar path must render exactly what the serializer does"""
+
+    def test_rows_match_serializer(self):
+        staff = User.objects.create_user("tech", password="x", first_name="Ada")
+        building = Building.objects.create(name="Main")
+        for index, assigned in enumerate((staff, None)):
+            request = MaintenanceRequest.objects.create(
+                description=f"Task {index}", role="staff", building=building, assigned_to=assigned
+            )
+            MaintenanceSchedule.objects.create(
+                request=request,
+                schedule_date=date(2025, 3, 10 + index),
+                estimated_duration="2 hours",
+                assigned_staff=assigned,
+            )
+
+        schedules = MaintenanceSchedule.objects.order_by("id")
+        expected = MaintenanceScheduleSerializer(schedules, many=True).data
+        actual = [schedule_row_to_dict(row) for row in schedules.values(*SCHEDULE_VALUE_FIELDS)]
+
+        self.assertEqual(actual, [dict(item) for item in expected])
+
+
+class CalendarRangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="x")
+        cls.staff = User.objects.create_user("tech", password="x")
+        building = Building.objects.create(name="Main")
+        first = date(2025, 1, 1)
+        for index in range(120):
+            request = MaintenanceRequest.objects.create(
+                description=f"Task {index}",
+                role="staff",
+                building=building,
+                status="for_approval" if index == 45 else "pending",
+            )
+            MaintenanceSchedule.objects.create(
+                request=request,
+                schedule_date=first + timedelta(days=index),
+                assigned_staff=cls.staff if index % 2 else None,
+            )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(context), 1)
+        return response, context.captured_queries[0]["sql"]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return cursor.fetchall()
+
+    def test_range_is_inclusive_and_ordered(self):
+        response, sql = self.get("/api/calendar/calendar/range/?start=2025-02-10&end=2025-02-16")
+        dates = [item["schedule_date"] for item in response.data]
+        # 2025-02-15 belongs to a request awaiting approval
+        self.assertEqual(dates, ["2025-02-10", "2025-02-11", "2025-02-12", "2025-02-13", "2025-02-14", "2025-02-16"])
+
+        # The captured SQL has its parameters inlined, so it can be EXPLAINed as is
+        plan = " ".join(str(row) for row in self.explain(sql))
+        self.assertIn("cal_sched_date_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_staff_range(self):
+        response, sql = self.get(
+            f"/api/calendar/calendar/range/?start=2025-01-01&end=2025-01-10&assigned_staff={self.staff.id}"
+        )
+        self.assertEqual([item["schedule_date"][-2:] for item in response.data], ["02", "04", "06", "08", "10"])
+        self.assertIn("cal_sched_staff_date_idx", " ".join(str(row) for row in self.explain(sql)))
+
+    def test_month_view_uses_the_range(self):
+        response, sql = self.get("/api/calendar/calendar/month/?year=2025&month=2")
+        self.assertEqual(len(response.data), 27)
+        self.assertEqual(response.data[0]["schedule_date"], "2025-02-01")
+        self.assertIn("cal_sched_date_idx", " ".join(str(row) for row in self.explain(sql)))
+
+    def test_invalid_ranges(self):
+        for query in (
+            "start=2025-01-01",
+            "start=2025-02-01&end=2025-01-01",
+            "start=2025-01-01&end=2027-01-01",
+            "start=2025-13-01&end=2025-13-02",
+            "start=2025-01-01&end=2025-01-02&assigned_staff=me",
+        ):
+            response = self.client.get(f"/api/calendar/calendar/range/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+        response = self.client.get("/api/calendar/calendar/month/?year=2025&month=13")
+        self.assertEqual(response.status_code, 400)
+
+
+class CalendarEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("viewer", password="x")
+        staff = User.objects.create_user("tech", password="x", first_name="Ada", last_name="Lovelace")
+        claimer = User.objects.create_user("claimer", password="x")
+        building = Building.objects.create(name="Annex")
+        floor = Floor.objects.create(building=building, number=2, label="2nd Floor")
+        room = Room.objects.create(building=building, floor=floor, name="A201")
+        cls.leak = MaintenanceRequest.objects.create(
+            description="Water is leaking from the ceiling above the projector " * 3,
+            role="staff", status="in_progress",
+            building=building, floor=floor, room=room, assigned_to=claimer,
+        )
+        fan = MaintenanceRequest.objects.create(
+            description="Broken fan", role="staff", building=building, assigned_to=claimer,
+        )
+        MaintenanceSchedule.objects.create(request=cls.leak, schedule_date=date(2025, 3, 3), assigned_staff=staff)
+        MaintenanceSchedule.objects.create(request=fan, schedule_date=date(2025, 3, 4))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_compact_events(self):
+        url = "/api/calendar/calendar/range/?start=2025-03-01&end=2025-03-31"
+        full = self.client.get(url)
+        compact = self.client.get(url + "&compact=true")
+
+        self.assertEqual(compact.status_code, 200)
+        leak, fan = compact.data
+        self.assertEqual(
+            {key: leak[key] for key in ("request", "date", "status", "location", "assignee")},
+            {
+                "request": self.leak.id,
+                "date": "2025-03-03",
+                "status": "in_progress",
+                "location": "Annex, 2nd Floor, Room A201",
+                "assignee": "Ada Lovelace",
+            },
+        )
+        self.assertTrue(leak["title"].startswith("Water is leaking") and leak["title"].endswith("…"))
+        self.assertEqual((fan["title"], fan["location"], fan["assignee"]), ("Broken fan", "Annex", "claimer"))
+        self.assertLess(len(compact.content) * 3, len(full.content))
+
+    def test_month_and_all_views_are_compact_on_request(self):
+        for url in ("/api/calendar/calendar/month/?year=2025&month=3&compact=1", "/api/calendar/calendar/?compact=true"):
+            response = self.client.get(url)
+            self.assertEqual([event["date"] for event in response.data], ["2025-03-03", "2025-03-04"])
+            self.assertNotIn("request_details", response.data[0])
+
+    def test_all_view_is_compact_by_default(self):
+        response = self.client.get("/api/calendar/calendar/")
+        self.assertEqual(response.data[0]["request"], self.leak.id)
+        self.assertNotIn("request_details", response.data[0])
+
+        full = self.client.get("/api/calendar/calendar/?compact=false")
+        self.assertEqual(full.data[0]["request_details"]["id"], self.leak.id)
+
+    def test_detail_on_demand(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/calendar/schedule/{self.leak.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context), 1)
+        self.assertEqual(response.data["request_details"]["room"]["name"], "A201")
+        self.assertEqual(response.data["assigned_staff_details"]["username"], "tech")
 
-# Create your tests here.
+        missing = self.client.get("/api/calendar/schedule/999999/")
+        self.assertEqual(missing.status_code, 404)
@@ -1,16 +1,42 @@
 # calendar_system/views.py - UPDATED VERSION
+from calendar import monthrange
+from datetime import date
+
+from django.utils.dateparse import parse_date
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import MaintenanceSchedule
-from .serializers import MaintenanceScheduleSerializer
+from .serializers import (
+    EVENT_VALUE_FIELDS,
+    MaintenanceScheduleSerializer,
+    SCHEDULE_VALUE_FIELDS,
+    event_row_to_dict,
+    schedule_row_to_dict,
+)
 from maintenance.models import MaintenanceRequest
 
 
 class SetScheduleView(APIView):
-    """Create or update a schedule for a maintenance request"""
+    """
+    Create or update a schedule for a maintenance request (POST), or read
+    it in full (GET) - the detail behind a compact calendar event
+    """
     permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request, pk):
+        schedule = (
+            MaintenanceSchedule.objects.select_related(
+                "request__building", "request__floor", "request__room",
+                "request__assigned_to", "assigned_staff",
+            )
+            .filter(request_id=pk)
+            .first()
+        )
+        if schedule is None:
+            return Response({"error": "Schedule not found"}, status=404)
+        return Response(MaintenanceScheduleSerializer(schedule).data)
+
     def post(self, request, pk):
         # Get the maintenance request
         try:
@@ -47,69 +73,99 @@ class SetScheduleView(APIView):
         )
 
 
-class CalendarMonthView(APIView):
-    """Get all schedules for a specific month"""
+def scheduled_between(start, end, staff_id=None):
+    """
+    Schedules dated start..end (inclusive), optionally of one staff member
+
+    A plain range on schedule_date, so it is served by cal_sched_date_idx
+    (or cal_sched_staff_date_idx) in date order; ``schedule_date__year`` /
+    ``__month`` lookups cannot use either index on SQLite.
+    """
+    schedules = MaintenanceSchedule.objects.filter(
+        schedule_date__gte=start, schedule_date__lte=end
+    )
+    if staff_id is not None:
+        schedules = schedules.filter(assigned_staff_id=staff_id)
+    return schedules.exclude(request__status="for_approval").order_by("schedule_date", "id")
+
+
+def schedule_rows(schedules, request, compact=False):
+    """
+    Evaluate ``schedules`` once into response dicts
+
+    Compact calendar events with ?compact=true (or by default when
+    ``compact`` is set, unless ?compact=false), otherwise the full
+    MaintenanceScheduleSerializer output (built from .values() rows).
+    """
+    value = request.query_params.get("compact", "").lower()
+    if value:
+        compact = value in ("1", "true", "yes")
+    if compact:
+        return [event_row_to_dict(row) for row in schedules.values(*EVENT_VALUE_FIELDS)]
+    return [schedule_row_to_dict(row) for row in schedules.values(*SCHEDULE_VALUE_FIELDS)]
+
+
+class CalendarRangeView(APIView):
+    """
+    Schedules between two dates, for week, month and agenda views
+
+    GET /api/calendar/calendar/range/?start=YYYY-MM-DD&end=YYYY-MM-DD
+    ``end`` is inclusive and at most MAX_RANGE_DAYS after ``start``;
+    ?assigned_staff=<user id> narrows the range to one staff member and
+    ?compact=true returns calendar events instead of full schedules.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    MAX_RANGE_DAYS = 366
 
     def get(self, request):
-        year = request.query_params.get("year")
-        month = request.query_params.get("month")
+        try:
+            start = parse_date(request.query_params.get("start") or "")
+            end = parse_date(request.query_params.get("end") or "")
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return Response({"error": "start and end (YYYY-MM-DD) required"}, status=400)
+        if end < start or (end - start).days > self.MAX_RANGE_DAYS:
+            return Response(
+                {"error": f"end must be within {self.MAX_RANGE_DAYS} days after start"}, status=400
+            )
 
-        # ✅ DEBUG: Print what we received
-        print(f"📅 CalendarMonthView called with year={year}, month={month}")
+        staff_id = request.query_params.get("assigned_staff")
+        if staff_id is not None and not staff_id.isdigit():
+            return Response({"error": "assigned_staff must be a user id"}, status=400)
 
-        if not year or not month:
-            return Response({"error": "year and month required"}, status=400)
+        schedules = scheduled_between(start, end, int(staff_id) if staff_id else None)
+        return Response(schedule_rows(schedules, request))
 
-        # ✅ CRITICAL FIX: Add select_related and prefetch_related
-        # This fetches all nested data in ONE query instead of N+1 queries
-        schedules = MaintenanceSchedule.objects.filter(
-            schedule_date__year=year, 
-            schedule_date__month=month
-        ).select_related(
-            "request",  # Fetch the maintenance request
-            "request__building",  # Fetch the building
-            "request__floor",  # Fetch the floor
-            "request__room",  # Fetch the room
-            "request__assigned_to",  # Fetch assigned user
-            "assigned_staff"  # Fetch schedule assigned staff
-        ).exclude(
-            request__status='for_approval'  # ✅ Exclude for_approval at DB level
-        )
 
-        # ✅ DEBUG: Print query results
-        print(f"📊 Found {schedules.count()} schedules for {year}-{month}")
-        for schedule in schedules:
-            print(f"  - Schedule #{schedule.id}: {schedule.schedule_date}, Request: #{schedule.request.id}, Status: {schedule.request.status}")
+class CalendarMonthView(APIView):
+    """Get all schedules for a specific month"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            year = int(request.query_params.get("year"))
+            month = int(request.query_params.get("month"))
+            start = date(year, month, 1)
+        except (TypeError, ValueError):
+            return Response({"error": "year and month required"}, status=400)
 
-        serializer = MaintenanceScheduleSerializer(schedules, many=True)
-        
-        # ✅ DEBUG: Print serialized data
-        print(f"📤 Returning {len(serializer.data)} schedules")
-        
-        return Response(serializer.data)
+        end = start.replace(day=monthrange(year, month)[1])
+        return Response(schedule_rows(scheduled_between(start, end), request))
 
 
-# ✅ BONUS: Add this view to get ALL schedules (for debugging/fallback)
 class CalendarAllView(APIView):
-    """Get all schedules (for debugging or if month filter doesn't work)"""
+    """
+    Get all schedules as compact calendar events (prefer CalendarRangeView
+    for anything date-bound)
+
+    The full schedule of one event is GET /api/calendar/schedule/<request>/;
+    ?compact=false returns every schedule in full.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        print("📅 CalendarAllView called - fetching ALL schedules")
-        
-        schedules = MaintenanceSchedule.objects.all().select_related(
-            "request",
-            "request__building",
-            "request__floor",
-            "request__room",
-            "request__assigned_to",
-            "assigned_staff"
-        ).exclude(
-            request__status='for_approval'
-        )
-
-        print(f"📊 Total schedules: {schedules.count()}")
-        
-        serializer = MaintenanceScheduleSerializer(schedules, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        schedules = MaintenanceSchedule.objects.exclude(
+            request__status="for_approval"
+        ).order_by("schedule_date", "id")
+        return Response(schedule_rows(schedules, request, compact=True))
@@ -1,5 +1,32 @@
 from django.contrib import admin 
-from .models import MaintenanceRequest
+from .models import MaintenanceRequest, MaintenanceDailyStats, MaintenanceStatusEvent
 
 # Register your models here.
-admin.site.register(MaintenanceRequest)
\ No newline at end of file
+admin.site.register(MaintenanceRequest)
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Browse-only admin for rows the application writes itself"""
+
+    def get_readonly_fields(self, request, obj=None):
+        return [field.name for field in self.model._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MaintenanceDailyStats)
+class MaintenanceDailyStatsAdmin(ReadOnlyAdmin):
+    # Derived from the requests; rebuild with manage.py rebuild_maintenance_stats
+    list_display = ["date", "building", "floor", "status", "assigned_to", "created_count", "completed_count"]
+    list_select_related = ["building", "floor", "assigned_to"]
+
+
+@admin.register(MaintenanceStatusEvent)
+class MaintenanceStatusEventAdmin(ReadOnlyAdmin):
+    # Append-only: MaintenanceStatusEvent.save() refuses updates
+    list_display = ["request_id", "from_status", "to_status", "actor", "timestamp"]
+    list_select_related = ["actor"]
@@ -0,0 +1,158 @@
+# maintenance/analytics.py
+"""
+Server-side aggregation for the analytics dashboard.
+
+Every figure is produced by a grouped query so the cost of building the
+payload depends on the number of days/locations reported, not on the
+number of maintenance requests stored.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
+
+from .models import MaintenanceRequest, MaintenanceStatusEvent
+from .rollups import daily_trends
+
+TREND_DAYS = 30
+TOP_N = 10
+
+
+def _hours(duration):
+    """Convert an aggregated timedelta to hours rounded to one decimal."""
+    if duration is None:
+        return 0
+    return round(duration.total_seconds() / 3600, 1)
+
+
+def status_counts(queryset):
+    """Count requests per status in a single conditional aggregate."""
+    return queryset.aggregate(
+        total=Count("id"),
+        pending=Count("id", filter=Q(status="pending")),
+        approved=Count("id", filter=Q(status="approved")),
+        rejected=Count("id", filter=Q(status="rejected")),
+        in_progress=Count("id", filter=Q(status="in_progress")),
+        completed=Count("id", filter=Q(status="completed")),
+    )
+
+
+def sla_metrics(start, end):
+    """
+    Average hours from creation to approval, claim (in progress) and
+    completion for transitions logged in ``[start, end)``.
+
+    Reads ``MaintenanceStatusEvent`` with one range query on the
+    (to_status, timestamp) index.
+    """
+    elapsed = ExpressionWrapper(
+        F("timestamp") - F("request__created_at"), output_field=DurationField()
+    )
+    result = MaintenanceStatusEvent.objects.filter(
+        timestamp__gte=start, timestamp__lt=end
+    ).aggregate(
+        time_to_approve=Avg(elapsed, filter=Q(to_status="approved")),
+        time_to_claim=Avg(elapsed, filter=Q(to_status="in_progress")),
+        time_to_complete=Avg(elapsed, filter=Q(to_status="completed")),
+        approved=Count("id", filter=Q(to_status="approved")),
+        claimed=Count("id", filter=Q(to_status="in_progress")),
+        completed=Count("id", filter=Q(to_status="completed")),
+    )
+    return {
+        "time_to_approve": _hours(result["time_to_approve"]),
+        "time_to_claim": _hours(result["time_to_claim"]),
+        "time_to_complete": _hours(result["time_to_complete"]),
+        "approved": result["approved"],
+        "claimed": result["claimed"],
+        "completed": result["completed"],
+    }
+
+
+def location_stats(queryset, limit=TOP_N):
+    """Busiest building/floor combinations."""
+    rows = (
+        queryset.values("building__name", "floor__number")
+        .annotate(count=Count("id"))
+        .order_by("-count")[:limit]
+    )
+    return [
+        {
+            "location": f"{row['building__name'] or 'Unknown Building'} - "
+            f"Floor {row['floor__number'] or 'N/A'}",
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def user_engagement(queryset, since, limit=TOP_N):
+    """Requesters with the most submissions since ``since``."""
+    rows = (
+        queryset.filter(created_at__gte=since)
+        .values("requester_name")
+        .annotate(count=Count("id"))
+        .order_by("-count")[:limit]
+    )
+    return [
+        {"user": row["requester_name"] or "Anonymous", "count": row["count"]}
+        for row in rows
+    ]
+
+
+def trends(days=TREND_DAYS, now=None):
+    """
+    Daily created/completed series for the last ``days`` days, read from
+    the ``MaintenanceDailyStats`` rollup rather than the request table.
+    """
+    now = now or timezone.now()
+    since = timezone.localdate(now) - timedelta(days=days - 1)
+    series = daily_trends(since, days)
+    return (
+        [{"date": row["date"], "requests": row["requests"]} for row in series],
+        [{"date": row["date"], "completed": row["completed"]} for row in series],
+    )
+
+
+def build_dashboard(now=None):
+    """Assemble the complete analytics payload for the dashboard."""
+    queryset = MaintenanceRequest.objects.all()
+    now = now or timezone.now()
+
+    last_7_days = now - timedelta(days=7)
+    last_30_days = now - timedelta(days=30)
+
+    counts = status_counts(queryset)
+    recent = queryset.aggregate(
+        last_7_days=Count("id", filter=Q(created_at__gte=last_7_days)),
+        last_30_days=Count("id", filter=Q(created_at__gte=last_30_days)),
+    )
+    sla_7_days = sla_metrics(last_7_days, now)
+    sla_30_days = sla_metrics(last_30_days, now)
+    request_series, completion_series = trends(now=now)
+
+    completion_rate = 0
+    if counts["total"]:
+        completion_rate = round(counts["completed"] / counts["total"] * 100, 1)
+
+    return {
+        "avg_response_time": sla_30_days["time_to_claim"],
+        "avg_completion_time": sla_30_days["time_to_complete"],
+        "total_requests": counts["total"],
+        "status_counts": {
+            key: value for key, value in counts.items() if key != "total"
+        },
+        "request_trends": request_series,
+        "completion_trends": completion_series,
+        "location_stats": location_stats(queryset),
+        "user_engagement": user_engagement(queryset, last_30_days),
+        "recent_metrics": {
+            "last_7_days": recent["last_7_days"],
+            "last_30_days": recent["last_30_days"],
+            "completion_rate": completion_rate,
+        },
+        "sla": {
+            "last_7_days": sla_7_days,
+            "last_30_days": sla_30_days,
+        },
+    }
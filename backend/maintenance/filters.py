@@ -0,0 +1,61 @@
+# maintenance/filters.py
+import django_filters
+from django.db.models import Q
+
+from .models import MaintenanceRequest
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Comma separated values: ?status=pending,approved"""
+
+
+class MaintenanceRequestFilterSet(django_filters.FilterSet):
+    """
+    Query parameters of the maintenance request listings
+
+    ?status=pending,approved        status in the set
+    ?exclude_status=approved        status not in the set
+    ?role=staff,instructor          role in the set
+    ?building= / ?floor= / ?room=   location ids
+    ?assigned_to=<id> | none        assignee, or unclaimed requests
+    ?created_after= / ?created_before=   creation date range (YYYY-MM-DD)
+    ?updated_after= / ?updated_before=   last update date range (YYYY-MM-DD)
+    ?search=leak                    description, requester, building or room name
+
+    Every location, status and assignee filter is matched by one of the
+    (<column>, -created_at, -id) indexes on MaintenanceRequest, so a filtered
+    page is read in listing order without a sort.
+    """
+
+    status = CharInFilter(field_name="status", lookup_expr="in")
+    exclude_status = CharInFilter(field_name="status", lookup_expr="in", exclude=True)
+    role = CharInFilter(field_name="role", lookup_expr="in")
+    building = django_filters.NumberFilter(field_name="building_id")
+    floor = django_filters.NumberFilter(field_name="floor_id")
+    room = django_filters.NumberFilter(field_name="room_id")
+    assigned_to = django_filters.CharFilter(method="filter_assigned_to")
+    created = django_filters.DateFromToRangeFilter(field_name="created_at")
+    updated = django_filters.DateFromToRangeFilter(field_name="updated_at")
+    search = django_filters.CharFilter(method="filter_search")
+
+    class Meta:
+        model = MaintenanceRequest
+        fields = []
+
+    def filter_assigned_to(self, queryset, name, value):
+        if value.lower() == "none":
+            return queryset.filter(assigned_to__isnull=True)
+        if not value.isdigit():
+            return queryset.none()
+        return queryset.filter(assigned_to_id=int(value))
+
+    def filter_search(self, queryset, name, value):
+        terms = value.split()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(description__icontains=term)
+                | Q(requester_name__icontains=term)
+                | Q(building__name__icontains=term)
+                | Q(room__name__icontains=term)
+            )
+        return queryset
@@ -0,0 +1,102 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from buildings.models import Building, Floor, Room
+from maintenance.models import MaintenanceRequest
+from maintenance.serializers import (
+    MaintenanceRequestSerializer,
+    REQUEST_VALUE_FIELDS,
+    serialize_request_rows,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare MaintenanceRequestSerializer(many=True) with the .values() fast "
+        "path on generated rows (everything is rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Number of maintenance requests to generate (default: 1000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per implementation; the best run is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["rows"])
+                results = self._measure(options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        serializer_time, fast_time = results
+        self.stdout.write(f"Rows:                              {options['rows']}")
+        self.stdout.write(f"MaintenanceRequestSerializer:      {serializer_time * 1000:.1f} ms")
+        self.stdout.write(f".values() fast path:               {fast_time * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Speed-up: {serializer_time / fast_time:.1f}x"))
+
+    def _seed(self, rows):
+        staff = [
+            User.objects.create_user(f"bench_staff_{i}", first_name="Bench", last_name=str(i))
+            for i in range(5)
+        ]
+        building = Building.objects.create(name="Benchmark Hall")
+        floors = [Floor.objects.create(building=building, number=n, label=f"B{n}") for n in range(1, 4)]
+        rooms = [
+            Room.objects.create(building=building, floor=floor, name=f"B{floor.number}-{i}")
+            for floor in floors
+            for i in range(10)
+        ]
+        MaintenanceRequest.objects.bulk_create(
+            MaintenanceRequest(
+                description=f"Benchmark request {i}",
+                role="staff",
+                requester_name="bench",
+                building=building,
+                floor=rooms[i % len(rooms)].floor,
+                room=rooms[i % len(rooms)],
+                assigned_to=staff[i % len(staff)] if i % 3 else None,
+                issue_photo="issue_photos/bench.jpg" if i % 2 else "",
+            )
+            for i in range(rows)
+        )
+
+    def _measure(self, repeat):
+        queryset = MaintenanceRequest.objects.for_listing().order_by("-created_at")
+
+        def with_serializer():
+            return MaintenanceRequestSerializer(queryset.all(), many=True).data
+
+        def with_values():
+            return serialize_request_rows(queryset.values(*REQUEST_VALUE_FIELDS))
+
+        if with_serializer() != with_values():
+            self.stderr.write(self.style.WARNING("Fast path output differs from the serializer"))
+
+        return best_of(with_serializer, repeat), best_of(with_values, repeat)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
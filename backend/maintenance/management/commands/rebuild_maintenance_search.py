@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from maintenance import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of maintenance requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of requests indexed per query (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write("Full-text index is only used on SQLite; nothing to rebuild")
+            return
+        count = search.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} maintenance requests"))
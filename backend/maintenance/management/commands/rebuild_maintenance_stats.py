@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from maintenance import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MaintenanceDailyStats rollup from all maintenance requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rollup rows inserted per query (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        count = rollups.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily rollup rows"))
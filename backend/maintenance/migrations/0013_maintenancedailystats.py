@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0003_alter_building_options_alter_floor_options_and_more'),
+        ('maintenance', '0012_alter_maintenancerequest_assigned_to_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenanceDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=20)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_daily_stats', to=settings.AUTH_USER_MODEL)),
+                ('building', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='buildings.building')),
+                ('floor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='buildings.floor')),
+            ],
+            options={
+                'verbose_name': 'Maintenance daily stats',
+                'verbose_name_plural': 'Maintenance daily stats',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date', 'building', 'floor', 'status', 'assigned_to'], name='maintenance_date_18abfc_idx')],
+            },
+        ),
+    ]
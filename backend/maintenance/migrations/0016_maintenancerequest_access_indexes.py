@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:47
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0003_alter_building_options_alter_floor_options_and_more'),
+        ('maintenance', '0015_maintenancerequest_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='maint_req_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['building', '-created_at', '-id'], name='maint_req_bldg_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['floor', '-created_at', '-id'], name='maint_req_floor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['room', '-created_at', '-id'], name='maint_req_room_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['assigned_to', '-created_at', '-id'], name='maint_req_assignee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', True)), fields=['building', '-created_at', '-id'], name='maint_req_unassigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(django.db.models.functions.comparison.Collate('requester_name', 'NOCASE'), name='maint_req_requester_ci_idx'),
+        ),
+    ]
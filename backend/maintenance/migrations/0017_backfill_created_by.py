@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:47
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 500
+
+
+def _owner_keys(User):
+    """
+    Map the names the frontend submits as requester_name (the username, or
+    "first last" when both are set) to user ids. Names shared by several
+    users are ambiguous and left unmapped.
+    """
+    by_username, by_full_name = {}, {}
+    for user_id, username, first_name, last_name in User.objects.values_list(
+        "id", "username", "first_name", "last_name"
+    ):
+        by_username.setdefault(username.strip().lower(), set()).add(user_id)
+        if first_name and last_name:
+            full_name = f"{first_name} {last_name}".strip().lower()
+            by_full_name.setdefault(full_name, set()).add(user_id)
+
+    owners = {}
+    for mapping in (by_full_name, by_username):  # usernames take precedence
+        for key, user_ids in mapping.items():
+            owners[key] = next(iter(user_ids)) if len(user_ids) == 1 else None
+    return owners
+
+
+def backfill_created_by(apps, schema_editor):
+    """Set created_by from requester_name in batches of BATCH_SIZE rows"""
+    MaintenanceRequest = apps.get_model("maintenance", "MaintenanceRequest")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    owners = _owner_keys(User)
+
+    pending = MaintenanceRequest.objects.filter(
+        created_by__isnull=True, requester_name__isnull=False
+    ).order_by("pk")
+    last_pk = 0
+    while True:
+        rows = list(pending.filter(pk__gt=last_pk).values_list("pk", "requester_name")[:BATCH_SIZE])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+
+        updates = []
+        for pk, requester_name in rows:
+            owner_id = owners.get(requester_name.strip().lower())
+            if owner_id is not None:
+                updates.append(MaintenanceRequest(pk=pk, created_by_id=owner_id))
+        if updates:
+            with transaction.atomic():
+                MaintenanceRequest.objects.bulk_update(updates, ["created_by"])
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so large tables are not locked for the
+    # whole backfill; re-running only touches rows still missing an owner.
+    atomic = False
+
+    dependencies = [
+        ('buildings', '0003_alter_building_options_alter_floor_options_and_more'),
+        ('maintenance', '0016_maintenancerequest_access_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='maintenancerequest',
+            name='maint_req_requester_ci_idx',
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='maint_req_owner_created_idx'),
+        ),
+        migrations.RunPython(backfill_created_by, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:25
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_completed_at(apps, schema_editor):
+    """
+    Completion time of completed requests: their last logged transition to
+    "completed", or updated_at for requests completed before the status log
+    """
+    MaintenanceRequest = apps.get_model("maintenance", "MaintenanceRequest")
+    MaintenanceStatusEvent = apps.get_model("maintenance", "MaintenanceStatusEvent")
+    completed = (
+        MaintenanceStatusEvent.objects.filter(request=OuterRef("pk"), to_status="completed")
+        .order_by("-timestamp")
+        .values("timestamp")[:1]
+    )
+    MaintenanceRequest.objects.filter(status="completed").update(
+        completed_at=Coalesce(Subquery(completed), F("updated_at"))
+    )
+
+
+def rebuild_daily_stats(apps, schema_editor):
+    """
+    Recompute the rollup: completions move to their completed_at day, any
+    duplicate buckets are merged before the unique constraint is added and
+    requests created before the rollup existed are counted
+    """
+    from maintenance import rollups
+
+    rollups.rebuild(
+        request_model=apps.get_model("maintenance", "MaintenanceRequest"),
+        stats_model=apps.get_model("maintenance", "MaintenanceDailyStats"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buildings', '0003_alter_building_options_alter_floor_options_and_more'),
+        ('maintenance', '0018_maintenance_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the request was completed (set by save(), unlike updated_at it does not move on later edits)', null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_daily_stats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='maintenancedailystats',
+            constraint=models.UniqueConstraint(models.F('date'), django.db.models.functions.comparison.Coalesce('building', 0, output_field=models.IntegerField()), django.db.models.functions.comparison.Coalesce('floor', 0, output_field=models.IntegerField()), models.F('status'), django.db.models.functions.comparison.Coalesce('assigned_to', 0, output_field=models.IntegerField()), name='maint_daily_stats_bucket_uniq'),
+        ),
+    ]
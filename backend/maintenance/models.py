@@ -1,8 +1,20 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from accounts.models import User
 from buildings.models import Building, Floor, Room
 
 
+class MaintenanceRequestQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Eager-load every relation MaintenanceRequestSerializer renders
+        (building, floor, room and the assignee details) so a page of
+        requests costs a constant number of queries instead of 4 per row.
+        """
+        return self.select_related("building", "floor", "room", "assigned_to")
+
+
 class MaintenanceRequest(models.Model):
     ROLE_CHOICES = [
         ("instructor", "Instructor"),
@@ -63,6 +75,12 @@ class MaintenanceRequest(models.Model):
     completion_photo = models.ImageField(
         upload_to="completed_photos/", null=True, blank=True
     )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the request was completed (set by save(), unlike updated_at it does not move on later edits)",
+    )
 
     requester_name = models.CharField(
         max_length=255,
@@ -74,9 +92,103 @@ class MaintenanceRequest(models.Model):
     # ✅ NEW: Optional rejection reason
     rejection_reason = models.TextField(null=True, blank=True)
 
+    objects = MaintenanceRequestQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of listings (MaintenanceCursorPagination)
+            models.Index(fields=["-created_at", "-id"], name="maint_req_created_id_idx"),
+            # Listing filters, each already in listing order
+            models.Index(fields=["status", "-created_at", "-id"], name="maint_req_status_created_idx"),
+            models.Index(fields=["building", "-created_at", "-id"], name="maint_req_bldg_created_idx"),
+            models.Index(fields=["floor", "-created_at", "-id"], name="maint_req_floor_created_idx"),
+            models.Index(fields=["room", "-created_at", "-id"], name="maint_req_room_created_idx"),
+            models.Index(fields=["assigned_to", "-created_at", "-id"], name="maint_req_assignee_created_idx"),
+            # Unclaimed tickets per building, newest first. The condition is an
+            # IS NULL test so SQLite can match it against parameterised queries.
+            models.Index(
+                fields=["building", "-created_at", "-id"],
+                condition=models.Q(assigned_to__isnull=True),
+                name="maint_req_unassigned_idx",
+            ),
+            # "My requests" (ListUserRequestsView)
+            models.Index(fields=["created_by", "-created_at", "-id"], name="maint_req_owner_created_idx"),
+        ]
+
+    # Fields snapshotted when the row is loaded so post_save handlers can see
+    # what changed without another SELECT (see get_original_values()): the
+    # rollup keys, and the texts in the search index.
+    TRACKED_FIELDS = (
+        "status",
+        "assigned_to_id",
+        "building_id",
+        "floor_id",
+        "created_at",
+        "updated_at",
+        "completed_at",
+        "description",
+        "completion_notes",
+        "rejection_reason",
+    )
+
     def __str__(self):
         return f"{self.description[:30]}... ({self.status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in cls.TRACKED_FIELDS and value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.status == "completed":
+            if self.completed_at is None:
+                self.completed_at = timezone.now()
+        else:
+            self.completed_at = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+        # The saved state is the new baseline for the next change detection
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # The reloaded values are the new baseline (deferred fields load here too)
+        if fields is None:
+            refreshed = set(self.TRACKED_FIELDS) - self.get_deferred_fields()
+        else:
+            attnames = {field.name: field.attname for field in self._meta.concrete_fields}
+            refreshed = {attnames.get(name, name) for name in fields}
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for name in refreshed.intersection(self.TRACKED_FIELDS):
+            loaded[name] = getattr(self, name)
+
+    def get_original_values(self):
+        """
+        Return the tracked fields as they were when this row was loaded or
+        last saved, or None for a request that is not in the database yet.
+
+        Only falls back to a query (for the missing fields, once) when the
+        instance was not loaded through the ORM or some tracked fields were
+        deferred.
+        """
+        if self.pk is None:
+            return None
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        missing = [name for name in self.TRACKED_FIELDS if name not in loaded]
+        if missing:
+            values = type(self).objects.filter(pk=self.pk).values(*missing).first()
+            if values is None:
+                return None
+            loaded.update(values)
+        return loaded
+
 class Meta:
     ordering = ['-created_at']
 
@@ -93,4 +205,115 @@ def get_status_display(self):
         'completed': 'Completed',
         'rejected': 'Rejected',
     }
-    return status_map.get(self.status, self.status.title())
\ No newline at end of file
+    return status_map.get(self.status, self.status.title())
+
+class MaintenanceDailyStats(models.Model):
+    """
+    Daily rollup of maintenance requests.
+
+    Each request counts once in ``created_count`` of the bucket for the day
+    it was created (with its current building, floor, status and assignee)
+    and, once completed, once in ``completed_count`` of the bucket for the
+    day of its ``completed_at``. Kept up to date by ``maintenance.signals`` and
+    rebuilt from scratch by ``manage.py rebuild_maintenance_stats``.
+
+    Deleting a building, floor or user nulls that key on its requests, so
+    ``maintenance.signals`` merges the buckets keyed on it into the matching
+    null-key buckets first (a plain SET_NULL would make them collide).
+    """
+
+    date = models.DateField()
+    # DO_NOTHING: rows are merged away by a pre_delete handler (see above)
+    building = models.ForeignKey(Building, on_delete=models.DO_NOTHING, null=True, blank=True)
+    floor = models.ForeignKey(Floor, on_delete=models.DO_NOTHING, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=MaintenanceRequest.STATUS_CHOICES)
+    assigned_to = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="maintenance_daily_stats",
+    )
+
+    created_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name = "Maintenance daily stats"
+        verbose_name_plural = "Maintenance daily stats"
+        indexes = [
+            models.Index(fields=["date", "building", "floor", "status", "assigned_to"]),
+        ]
+        constraints = [
+            # One row per bucket. NULLs are distinct in a unique index, so the
+            # nullable keys are compared through COALESCE.
+            models.UniqueConstraint(
+                "date",
+                Coalesce("building", 0, output_field=models.IntegerField()),
+                Coalesce("floor", 0, output_field=models.IntegerField()),
+                "status",
+                Coalesce("assigned_to", 0, output_field=models.IntegerField()),
+                name="maint_daily_stats_bucket_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.status}: +{self.created_count} / ✓{self.completed_count}"
+
+
+class MaintenanceStatusEvent(models.Model):
+    """
+    Append-only log of status transitions of a maintenance request.
+
+    Used for SLA metrics (time to approve/claim/complete) instead of
+    ``updated_at``, which moves on every edit of the request.
+    """
+
+    request = models.ForeignKey(
+        MaintenanceRequest,
+        on_delete=models.CASCADE,
+        related_name="status_events",
+    )
+    from_status = models.CharField(
+        max_length=20, choices=MaintenanceRequest.STATUS_CHOICES, blank=True, null=True
+    )
+    to_status = models.CharField(max_length=20, choices=MaintenanceRequest.STATUS_CHOICES)
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="maintenance_status_events",
+        help_text="User who made the transition",
+    )
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["timestamp"]
+        indexes = [
+            models.Index(fields=["request", "timestamp"]),
+            models.Index(fields=["to_status", "timestamp"]),
+        ]
+
+    def __str__(self):
+        return f"Request #{self.request_id}: {self.from_status} → {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        if self.pk:
+            raise ValueError("Status events are append-only and cannot be modified")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def record(cls, maintenance, from_status, actor=None):
+        """Log a transition if the request's status actually changed"""
+        if from_status == maintenance.status:
+            return None
+        if actor is not None and not actor.is_authenticated:
+            actor = None
+        return cls.objects.create(
+            request=maintenance,
+            from_status=from_status,
+            to_status=maintenance.status,
+            actor=actor,
+        )
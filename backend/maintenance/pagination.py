@@ -0,0 +1,53 @@
+import hashlib
+
+from django.core.cache import cache
+from rest_framework.pagination import CursorPagination
+
+
+class MaintenanceCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first
+
+    Pages are fetched with ``WHERE created_at < <cursor>`` on the
+    ``maint_req_created_id_idx`` index instead of COUNT(*) + OFFSET, so deep
+    pages cost the same as the first one.
+
+    The total is opt-in (``?count=true``) and served from a short-lived cache
+    entry per filtered queryset, so it is an estimate that may lag behind by
+    up to ``count_cache_timeout`` seconds.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("-created_at", "-id")
+    count_query_param = "count"
+    count_cache_timeout = 60
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes"):
+            self.count = self.get_count_estimate(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_estimate(self, queryset):
+        """COUNT(*) of the filtered queryset, cached per distinct query"""
+        queryset = queryset.order_by()
+        sql = str(queryset.values("pk").query)
+        key = "maintenance:count:" + hashlib.md5(sql.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count"] = {"type": "integer", "example": 123}
+        return schema
@@ -0,0 +1,176 @@
+# maintenance/rollups.py
+"""
+Incremental maintenance of the ``MaintenanceDailyStats`` rollup.
+
+A request is reduced to a small snapshot (the fields the rollup is keyed
+on). Saving or deleting a request turns the difference between the old and
+the new snapshot into +1/-1 adjustments of at most four rollup rows.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import MaintenanceDailyStats, MaintenanceRequest
+
+SNAPSHOT_FIELDS = MaintenanceRequest.TRACKED_FIELDS
+
+BUCKET_FIELDS = ("building_id", "floor_id", "status", "assigned_to_id")
+
+
+def snapshot(instance):
+    """Return the rollup-relevant values of a request instance."""
+    return {field: getattr(instance, field) for field in SNAPSHOT_FIELDS}
+
+
+def _day(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def contributions(values):
+    """
+    The rollup counters a request snapshot adds to, as a Counter of
+    ``(bucket_key, counter_field)``.
+    """
+    counter = Counter()
+    if not values or values.get("created_at") is None:
+        return counter
+
+    bucket = tuple(values[field] for field in BUCKET_FIELDS)
+    counter[((_day(values["created_at"]),) + bucket, "created_count")] += 1
+    if values["status"] == "completed" and values.get("completed_at") is not None:
+        counter[((_day(values["completed_at"]),) + bucket, "completed_count")] += 1
+    return counter
+
+
+def _adjust(key, field, delta):
+    date, building_id, floor_id, status, assigned_to_id = key
+    lookup = {
+        "date": date,
+        "building_id": building_id,
+        "floor_id": floor_id,
+        "status": status,
+        "assigned_to_id": assigned_to_id,
+    }
+    stats = MaintenanceDailyStats.objects.filter(**lookup)
+    if delta < 0:
+        # Clamped: a bucket that was never filled (rollup not rebuilt since
+        # the request was created) must not fail the request's save
+        stats.update(**{field: Greatest(F(field) + delta, 0)})
+        return
+    if stats.update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            MaintenanceDailyStats.objects.create(**lookup, **{field: delta})
+    except IntegrityError:
+        # A concurrent save created the bucket after our UPDATE missed it
+        stats.update(**{field: F(field) + delta})
+
+
+def apply_change(old_values, new_values):
+    """Move a request's contribution from its old buckets to its new ones."""
+    delta = Counter(contributions(new_values))
+    delta.subtract(contributions(old_values))
+    changes = [(key, count) for key, count in delta.items() if count]
+    if not changes:
+        return
+
+    with transaction.atomic():
+        for (bucket, field), count in changes:
+            _adjust(bucket, field, count)
+
+
+def detach(field, pk):
+    """
+    Merge the buckets keyed on a building, floor or user that is about to be
+    deleted into the buckets its requests fall into once the key is nulled
+
+    ``field`` is one of "building_id", "floor_id" and "assigned_to_id".
+    """
+    rows = MaintenanceDailyStats.objects.filter(**{field: pk})
+    merged = Counter()
+    with transaction.atomic():
+        for row in rows.values("date", *BUCKET_FIELDS, "created_count", "completed_count"):
+            row[field] = None
+            key = (row["date"],) + tuple(row[f] for f in BUCKET_FIELDS)
+            merged[(key, "created_count")] += row["created_count"]
+            merged[(key, "completed_count")] += row["completed_count"]
+        rows.delete()
+        for (bucket, counter_field), count in merged.items():
+            if count:
+                _adjust(bucket, counter_field, count)
+
+
+def rebuild(batch_size=1000, request_model=MaintenanceRequest, stats_model=MaintenanceDailyStats):
+    """
+    Recompute the whole rollup from ``MaintenanceRequest``.
+
+    Migrations pass their historical models as ``request_model`` and
+    ``stats_model``.
+    """
+    rows = {}
+
+    def accumulate(queryset, field):
+        for row in queryset:
+            key = (row["day"],) + tuple(row[f] for f in BUCKET_FIELDS)
+            stats = rows.setdefault(key, {"created_count": 0, "completed_count": 0})
+            stats[field] += row["count"]
+
+    accumulate(
+        request_model.objects.annotate(day=TruncDate("created_at"))
+        .values("day", *BUCKET_FIELDS)
+        .annotate(count=Count("id"))
+        .order_by(),
+        "created_count",
+    )
+    accumulate(
+        request_model.objects.filter(status="completed", completed_at__isnull=False)
+        .annotate(day=TruncDate("completed_at"))
+        .values("day", *BUCKET_FIELDS)
+        .annotate(count=Count("id"))
+        .order_by(),
+        "completed_count",
+    )
+
+    objects = [
+        stats_model(
+            date=key[0],
+            building_id=key[1],
+            floor_id=key[2],
+            status=key[3],
+            assigned_to_id=key[4],
+            **stats,
+        )
+        for key, stats in rows.items()
+    ]
+    with transaction.atomic():
+        stats_model.objects.all().delete()
+        stats_model.objects.bulk_create(objects, batch_size=batch_size)
+    return len(objects)
+
+
+def daily_trends(since, days):
+    """Created and completed counts per day, read from the rollup."""
+    rows = (
+        MaintenanceDailyStats.objects.filter(date__gte=since, date__lt=since + timedelta(days=days))
+        .values("date")
+        .annotate(requests=Sum("created_count"), completed=Sum("completed_count"))
+        .order_by("date")
+    )
+    by_day = {row["date"]: row for row in rows}
+
+    series = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        row = by_day.get(day, {})
+        series.append({
+            "date": day.isoformat(),
+            "requests": row.get("requests") or 0,
+            "completed": row.get("completed") or 0,
+        })
+    return series
@@ -0,0 +1,169 @@
+# maintenance/search.py
+"""
+Full-text search over maintenance request texts.
+
+On SQLite the searchable columns are mirrored into the FTS5 table
+``maintenance_request_fts`` (rowid = request id), kept in sync by
+``maintenance.signals`` and rebuilt by ``manage.py rebuild_maintenance_search``.
+Queries are ranked with bm25 and return a highlighted snippet, both computed
+inside the index so a search costs the same at 1k or 500k tickets.
+
+Other database backends have no FTS table; ``search()`` then falls back to
+``icontains`` matching without ranking.
+"""
+
+import html
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import MaintenanceRequest
+
+FTS_TABLE = "maintenance_request_fts"
+SEARCH_FIELDS = ("description", "completion_notes", "rejection_reason")
+
+SNIPPET_TOKENS = 12
+# Control characters mark the match inside the snippet so the text around it
+# can be HTML-escaped before the markers become <mark> tags
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+def is_available():
+    """Whether the database has the FTS5 index (created by migration 0018 on SQLite)"""
+    return connection.vendor == "sqlite"
+
+
+def create_index(schema_editor):
+    """Create the FTS table (SQLite only) and index every existing request"""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    columns = ", ".join(SEARCH_FIELDS)
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5({columns}, tokenize='porter unicode61')"
+    )
+    values = ", ".join(f"COALESCE({field}, '')" for field in SEARCH_FIELDS)
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+        f"SELECT id, {values} FROM maintenance_maintenancerequest"
+    )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def _row(values):
+    return [values[field] or "" for field in SEARCH_FIELDS]
+
+
+def index_request(instance):
+    """Insert or refresh the index entry of one request"""
+    if not is_available():
+        return
+    columns = ", ".join(SEARCH_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [instance.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES (%s, %s, %s, %s)",
+            [instance.pk, *_row({field: getattr(instance, field) for field in SEARCH_FIELDS})],
+        )
+
+
+def remove_request(pk):
+    """Drop a deleted request from the index"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild(batch_size=1000):
+    """Re-index every request (after bulk imports or queryset.update())"""
+    if not is_available():
+        return 0
+    columns = ", ".join(SEARCH_FIELDS)
+    insert = f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES (%s, %s, %s, %s)"
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        rows = MaintenanceRequest.objects.order_by("pk").values("pk", *SEARCH_FIELDS)
+        batch = []
+        for values in rows.iterator(chunk_size=batch_size):
+            batch.append([values["pk"], *_row(values)])
+            if len(batch) >= batch_size:
+                cursor.executemany(insert, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert, batch)
+            count += len(batch)
+    return count
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Words are quoted so FTS5 operators in user input are taken literally.
+    """
+    terms = []
+    for word in text.split():
+        word = word.replace('"', '""')
+        terms.append(f'"{word}"*')
+    return " ".join(terms)
+
+
+def _highlight(snippet):
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+def search(text, limit=20, offset=0):
+    """
+    Return ``(total, hits)`` for a free-text query, best matches first
+
+    Each hit is a dict with ``id``, ``rank`` (bm25, lower is better) and an
+    HTML-safe ``snippet`` with the matched words wrapped in <mark>.
+    """
+    match = build_match_query(text)
+    if not match:
+        return 0, []
+    if not is_available():
+        return _search_fallback(text, limit, offset)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}), "
+            f"snippet({FTS_TABLE}, -1, %s, %s, '…', %s) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT %s OFFSET %s",
+            [_MARK_START, _MARK_END, SNIPPET_TOKENS, match, limit, offset],
+        )
+        hits = [
+            {"id": pk, "rank": rank, "snippet": _highlight(snippet)}
+            for pk, rank, snippet in cursor.fetchall()
+        ]
+    return total, hits
+
+
+def _search_fallback(text, limit, offset):
+    queryset = MaintenanceRequest.objects.all()
+    for word in text.split():
+        queryset = queryset.filter(
+            Q(description__icontains=word)
+            | Q(completion_notes__icontains=word)
+            | Q(rejection_reason__icontains=word)
+        )
+    queryset = queryset.order_by("-created_at", "-id")
+    total = queryset.count()
+    hits = [
+        {"id": values["pk"], "rank": None, "snippet": html.escape((values["description"] or "")[:120])}
+        for values in queryset.values("pk", "description")[offset:offset + limit]
+    ]
+    return total, hits
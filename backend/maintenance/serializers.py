@@ -1,3 +1,4 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import MaintenanceRequest
 from accounts.serializers import StaffProfileSerializer, UserSerializer
@@ -5,6 +6,40 @@ from accounts.models import User
 from buildings.serializers import BuildingSimpleSerializer, FloorSimpleSerializer, RoomSimpleSerializer 
 
 # maintenance/serializers.py
+def _csv_param(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients shape list responses with query parameters
+
+    ?fields=id,status,building  -> only these fields are rendered
+    ?expand=description         -> opt into the fields listed in
+                                   Meta.expandable_fields (left out by default)
+
+    Fields named in ?fields= count as expanded.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+
+        requested = set(_csv_param(request.query_params.get("fields")))
+        expanded = set(_csv_param(request.query_params.get("expand"))) | requested
+
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if name not in expanded:
+                self.fields.pop(name, None)
+
+        if requested:
+            for name in list(self.fields):
+                if name not in requested:
+                    self.fields.pop(name)
+
+
 class MaintenanceRequestSerializer(serializers.ModelSerializer):
     building = BuildingSimpleSerializer(read_only=True)
     floor = FloorSimpleSerializer(read_only=True)
@@ -22,11 +57,8 @@ class MaintenanceRequestSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True
     )
-    created_by = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
-        required=False,
-        allow_null=True
-    )
+    # Set from the authenticated submitter, never from the payload
+    created_by = serializers.PrimaryKeyRelatedField(read_only=True)
 
     issue_photo = serializers.ImageField(use_url=True, required=False)
     completion_photo = serializers.ImageField(use_url=True, required=False, allow_null=True)
@@ -74,3 +106,139 @@ class CompleteRequestSerializer(serializers.ModelSerializer):
         model = MaintenanceRequest
         fields = ["status", "completion_notes", "completion_photo", "assigned_to"]
 
+
+class MaintenanceRequestListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact read-only representation for table views
+
+    Renders the assignee once (as a name), a short description summary and
+    no image URLs unless asked for with ?expand= (see SparseFieldsetMixin).
+    """
+    SUMMARY_LENGTH = 120
+
+    building = BuildingSimpleSerializer(read_only=True)
+    floor = FloorSimpleSerializer(read_only=True)
+    room = RoomSimpleSerializer(read_only=True)
+    assigned_to_name = serializers.SerializerMethodField()
+    summary = serializers.SerializerMethodField()
+
+    # Expandable
+    assigned_to_details = UserSerializer(source='assigned_to', read_only=True)
+    issue_photo = serializers.ImageField(use_url=True, read_only=True)
+    completion_photo = serializers.ImageField(use_url=True, read_only=True)
+
+    class Meta:
+        model = MaintenanceRequest
+        fields = [
+            'id', 'building', 'floor', 'room',
+            'requester_name', 'role', 'status', 'created_at', 'updated_at',
+            'assigned_to', 'assigned_to_name', 'created_by', 'summary',
+            # expandable
+            'description', 'section', 'student_id', 'rejection_reason',
+            'assigned_to_details', 'completion_notes',
+            'issue_photo', 'completion_photo',
+        ]
+        expandable_fields = [
+            'description', 'section', 'student_id', 'rejection_reason',
+            'assigned_to_details', 'completion_notes',
+            'issue_photo', 'completion_photo',
+        ]
+        read_only_fields = fields
+
+    def get_assigned_to_name(self, obj):
+        if obj.assigned_to:
+            return obj.assigned_to.get_full_name() or obj.assigned_to.username
+        return None
+
+    def get_summary(self, obj):
+        description = obj.description or ''
+        if len(description) <= self.SUMMARY_LENGTH:
+            return description
+        return description[:self.SUMMARY_LENGTH].rstrip() + '…'
+
+
+# -----------------------------------------------------------------------------
+# Fast read-only path
+#
+# Builds the exact JSON of MaintenanceRequestSerializer from a .values()
+# queryset (one flat SELECT with joins) without instantiating model objects
+# or serializer fields per row. Used by the hot list endpoints.
+# -----------------------------------------------------------------------------
+_datetime_field = serializers.DateTimeField()
+
+USER_VALUE_FIELDS = ('id', 'username', 'first_name', 'last_name', 'email')
+
+REQUEST_VALUE_FIELDS = (
+    'id',
+    'building_id', 'building__name',
+    'floor_id', 'floor__number', 'floor__label',
+    'room_id', 'room__name',
+    'requester_name', 'role', 'section', 'student_id',
+    'description', 'issue_photo', 'rejection_reason',
+    'status', 'created_at', 'updated_at',
+    'assigned_to_id',
+    *(f'assigned_to__{name}' for name in USER_VALUE_FIELDS[1:]),
+    'created_by_id',
+    'completion_notes', 'completion_photo',
+)
+
+
+def format_datetime(value):
+    """Render a datetime exactly like serializers.DateTimeField"""
+    return _datetime_field.to_representation(value)
+
+
+def media_url(name, request=None):
+    """Render a stored file name exactly like serializers.ImageField(use_url=True)"""
+    if not name:
+        return None
+    url = default_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def request_value_fields(prefix=''):
+    """The .values() names needed by request_row_to_dict, optionally under a relation prefix"""
+    return [prefix + name for name in REQUEST_VALUE_FIELDS]
+
+
+def request_row_to_dict(row, request=None, prefix=''):
+    """Turn one .values() row into MaintenanceRequestSerializer output"""
+    v = (lambda name: row[prefix + name])
+
+    assigned_to = None
+    if v('assigned_to_id') is not None:
+        assigned_to = {'id': v('assigned_to_id')}
+        for name in USER_VALUE_FIELDS[1:]:
+            assigned_to[name] = v(f'assigned_to__{name}')
+
+    building_id, floor_id, room_id = v('building_id'), v('floor_id'), v('room_id')
+    return {
+        'id': v('id'),
+        'building': {'id': building_id, 'name': v('building__name')} if building_id is not None else None,
+        'floor': (
+            {'id': floor_id, 'number': v('floor__number'), 'label': v('floor__label')}
+            if floor_id is not None else None
+        ),
+        'room': {'id': room_id, 'name': v('room__name')} if room_id is not None else None,
+        'requester_name': v('requester_name'),
+        'role': v('role'),
+        'section': v('section'),
+        'student_id': v('student_id'),
+        'description': v('description'),
+        'issue_photo': media_url(v('issue_photo'), request),
+        'rejection_reason': v('rejection_reason'),
+        'status': v('status'),
+        'created_at': format_datetime(v('created_at')),
+        'updated_at': format_datetime(v('updated_at')),
+        'assigned_to': v('assigned_to_id'),
+        'assigned_to_details': assigned_to,
+        'assigned_to_details_maintenance': dict(assigned_to) if assigned_to else None,
+        'created_by': v('created_by_id'),
+        'completion_notes': v('completion_notes'),
+        'completion_photo': media_url(v('completion_photo'), request),
+    }
+
+
+def serialize_request_rows(rows, request=None):
+    """Serialize an iterable of .values(*REQUEST_VALUE_FIELDS) rows"""
+    return [request_row_to_dict(row, request) for row in rows]
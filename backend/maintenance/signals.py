@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from buildings.models import Building, Floor
+from . import rollups, search
+from .models import MaintenanceRequest
+
+
+# =============================================================================
+# DAILY ROLLUP - keep MaintenanceDailyStats in sync with every save/delete
+# =============================================================================
+@receiver(pre_save, sender=MaintenanceRequest)
+def store_original_values(sender, instance, **kwargs):
+    """Remember the rollup keys and searchable texts from before this save"""
+    instance._original_values = instance.get_original_values()
+
+
+@receiver(post_save, sender=MaintenanceRequest)
+def update_daily_stats(sender, instance, created, raw=False, **kwargs):
+    """Move the request's contribution to its new rollup buckets"""
+    if raw:
+        return
+    old_values = None if created else getattr(instance, "_original_values", None)
+    rollups.apply_change(old_values, rollups.snapshot(instance))
+
+
+@receiver(post_delete, sender=MaintenanceRequest)
+def remove_from_daily_stats(sender, instance, **kwargs):
+    """Drop a deleted request from the rollup"""
+    rollups.apply_change(rollups.snapshot(instance), None)
+
+
+@receiver(pre_delete, sender=Building)
+@receiver(pre_delete, sender=Floor)
+@receiver(pre_delete, sender=User)
+def detach_daily_stats(sender, instance, **kwargs):
+    """Fold the buckets keyed on a deleted building, floor or user into null-key ones"""
+    field = {Building: "building_id", Floor: "floor_id", User: "assigned_to_id"}[sender]
+    rollups.detach(field, instance.pk)
+
+
+# =============================================================================
+# FULL-TEXT SEARCH - mirror the searchable texts into the FTS index
+# =============================================================================
+@receiver(post_save, sender=MaintenanceRequest)
+def update_search_index(sender, instance, created, **kwargs):
+    """Re-index the request when its description, completion notes or rejection reason changed"""
+    old_values = None if created else getattr(instance, "_original_values", None)
+    if old_values is None or any(
+        old_values.get(field) != getattr(instance, field) for field in search.SEARCH_FIELDS
+    ):
+        search.index_request(instance)
+
+
+@receiver(post_delete, sender=MaintenanceRequest)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted request from the FTS index"""
+    search.remove_request(instance.pk)
@@ -1,3 +1,819 @@
+import unittest
+from collections import Counter
+from unittest import mock
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from buildings.models import Building, Floor, Room
+from . import analytics, rollups, search
+from .models import MaintenanceDailyStats, MaintenanceRequest, MaintenanceStatusEvent
+from .serializers import (
+    MaintenanceRequestSerializer,
+    REQUEST_VALUE_FIELDS,
+    serialize_request_rows,
+)
+from .views import ListRequestsView, ListUserRequestsView
+
+# Queries allowed for one listing page: the keyset page SELECT (no COUNT(*))
+LIST_QUERY_BUDGET = 1
+
+
+class ListingQueryBudgetTests(TestCase):
+    """Listing endpoints must not issue per-row queries (N+1)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.requester = User.objects.create_user("requester", password="x")
+        cls.staff = [User.objects.create_user(f"staff{i}", password="x") for i in range(3)]
+
+        building = Building.objects.create(name="Annex")
+        floors = [Floor.objects.create(building=building, number=n, label=f"Floor {n}") for n in (1, 2)]
+        rooms = [
+            Room.objects.create(building=building, floor=floor, name=f"Room {floor.number}{i}")
+            for floor in floors
+            for i in range(3)
+        ]
+        cls.building = building
+        cls.floors = floors
+        cls.rooms = rooms
+
+    def create_requests(self, count, owner=None):
+        for i in range(count):
+            room = self.rooms[i % len(self.rooms)]
+            MaintenanceRequest.objects.create(
+                description=f"Broken fixture {i}",
+                role="staff",
+                requester_name=self.requester.username,
+                building=self.building,
+                floor=room.floor,
+                room=room,
+                assigned_to=self.staff[i % len(self.staff)],
+                created_by=owner or self.requester,
+            )
+
+    def assertMaxQueries(self, budget, func):
+        with CaptureQueriesContext(connection) as context:
+            response = func()
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(context),
+            budget,
+            "Listing used %d queries (budget %d):\n%s"
+            % (len(context), budget, "\n".join(q["sql"] for q in context.captured_queries)),
+        )
+        return response
+
+    def list_requests(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        return self.assertMaxQueries(
+            LIST_QUERY_BUDGET, lambda: client.get("/api/maintenance/requests/")
+        )
+
+    def list_user_requests(self, user):
+        request = APIRequestFactory().get("/api/maintenance/requests/")
+        force_authenticate(request, user=user)
+        view = ListUserRequestsView.as_view()
+        return self.assertMaxQueries(
+            LIST_QUERY_BUDGET, lambda: view(request).render()
+        )
+
+    def test_list_requests_within_budget(self):
+        self.create_requests(25)
+        response = self.list_requests()
+        self.assertEqual(len(response.data["results"]), 25)
+        first = response.data["results"][0]
+        self.assertIsNotNone(first["room"])
+        self.assertIsNotNone(first["assigned_to_details"])
+
+    def test_list_requests_cost_does_not_grow_with_rows(self):
+        self.create_requests(3)
+        self.list_requests()
+        self.create_requests(30)
+        self.list_requests()
+
+    def test_list_user_requests_within_budget_for_admin(self):
+        self.create_requests(20)
+        self.create_requests(5, owner=self.admin)
+        response = self.list_user_requests(self.admin)
+        # "Mine" means mine for admins too
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_list_user_requests_within_budget_for_requester(self):
+        self.create_requests(20)
+        response = self.list_user_requests(self.requester)
+        self.assertEqual(len(response.data["results"]), 20)
+
+
+class FastSerializationTests(TestCase):
+    """The .values() list path must render exactly what the serializer does"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            "tech", password="x", first_name="Ada", last_name="Tech", email="t@example.com"
+        )
+        building = Building.objects.create(name="Main")
+        floor = Floor.objects.create(building=building, number=3, label="Third")
+        room = Room.objects.create(building=building, floor=floor, name="301")
+        MaintenanceRequest.objects.create(
+            description="Leaking pipe",
+            role="student",
+            requester_name="jane",
+            section="B",
+            student_id="2024-001",
+            building=building,
+            floor=floor,
+            room=room,
+            assigned_to=cls.staff,
+            status="completed",
+            completion_notes="Replaced seal",
+            issue_photo="issue_photos/pipe.jpg",
+        )
+        MaintenanceRequest.objects.create(
+            description="Flickering light", role="staff", building=building,
+        )
+
+    def test_rows_match_serializer(self):
+        request = APIRequestFactory().get("/api/maintenance/requests/")
+        queryset = MaintenanceRequest.objects.for_listing().order_by("id")
+
+        expected = MaintenanceRequestSerializer(
+            queryset, many=True, context={"request": request}
+        ).data
+        actual = serialize_request_rows(queryset.values(*REQUEST_VALUE_FIELDS), request)
+
+        self.assertEqual(actual, [dict(item) for item in expected])
+        self.assertEqual(list(actual[0]), list(expected[0]))
+
+    def test_rows_match_serializer_without_request(self):
+        queryset = MaintenanceRequest.objects.for_listing().order_by("id")
+
+        expected = MaintenanceRequestSerializer(queryset, many=True).data
+        actual = serialize_request_rows(queryset.values(*REQUEST_VALUE_FIELDS))
+
+        self.assertEqual(actual, [dict(item) for item in expected])
+
+
+
+class SparseFieldsetTests(TestCase):
+    """?compact=, ?fields= and ?expand= shape the listing"""
+
+    DEFAULT_COMPACT_FIELDS = {
+        "id", "building", "floor", "room", "requester_name", "role", "status",
+        "created_at", "updated_at", "assigned_to", "assigned_to_name", "created_by", "summary",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        staff = [
+            User.objects.create_user(f"staff{i}", password="x", first_name="Tech", last_name=str(i))
+            for i in range(3)
+        ]
+        building = Building.objects.create(name="Annex")
+        floor = Floor.objects.create(building=building, number=1, label="Ground")
+        room = Room.objects.create(building=building, floor=floor, name="101")
+        for i in range(12):
+            MaintenanceRequest.objects.create(
+                description="Leak " * 40, role="staff", building=building, floor=floor, room=room,
+                assigned_to=staff[i % 3],
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def rows(self, **params):
+        response = self.client.get("/api/maintenance/requests/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_full_representation_by_default(self):
+        row = self.rows()[0]
+        self.assertIn("assigned_to_details", row)
+        self.assertIn("description", row)
+        self.assertNotIn("summary", row)
+
+    def test_compact_leaves_out_expandable_fields(self):
+        row = self.rows(compact="true")[0]
+        self.assertEqual(set(row), self.DEFAULT_COMPACT_FIELDS)
+        self.assertEqual(row["assigned_to_name"], "Tech 2")  # newest first
+        self.assertTrue(row["summary"].endswith("…"))
+        self.assertLessEqual(len(row["summary"]), 121)
+
+    def test_expand(self):
+        row = self.rows(compact="true", expand="description,assigned_to_details")[0]
+        self.assertEqual(set(row), self.DEFAULT_COMPACT_FIELDS | {"description", "assigned_to_details"})
+
+    def test_fields(self):
+        self.assertEqual(set(self.rows(fields="id,status")[0]), {"id", "status"})
+
+    def test_fields_with_expandable_fields(self):
+        # Naming an expandable field in ?fields= expands it
+        row = self.rows(fields="id,description,issue_photo")[0]
+        self.assertEqual(set(row), {"id", "description", "issue_photo"})
+
+    def test_compact_query_count(self):
+        with self.assertNumQueries(LIST_QUERY_BUDGET):
+            self.rows(compact="true", expand="assigned_to_details")
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        building = Building.objects.create(name="Annex")
+        MaintenanceRequest.objects.bulk_create(
+            MaintenanceRequest(description=f"Request {i}", role="staff", building=building)
+            for i in range(7)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_pages_cover_every_request_once(self):
+        seen = []
+        url = "/api/maintenance/requests/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn("count", response.data)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), sorted(MaintenanceRequest.objects.values_list("id", flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_count_is_opt_in_and_cached(self):
+        response = self.client.get("/api/maintenance/requests/?page_size=3&count=true")
+        self.assertEqual(response.data["count"], 7)
+
+        MaintenanceRequest.objects.create(description="Late", role="staff")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/maintenance/requests/?page_size=3&count=true")
+        self.assertEqual(response.data["count"], 7)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in context.captured_queries))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "asserts SQLite query plans")
+class ListingIndexUsageTests(TestCase):
+    """EXPLAIN the SELECTs the listing views run and check the chosen index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.requester = User.objects.create_user("jane", password="x")
+        staff = [User.objects.create_user(f"tech{i}", password="x") for i in range(10)]
+        cls.staff = staff[0]
+        buildings = [Building.objects.create(name=f"Hall {i}") for i in range(4)]
+        floors = [Floor.objects.create(building=b, number=1, label="1") for b in buildings]
+        rooms = [Room.objects.create(building=f.building, floor=f, name="101") for f in floors]
+        cls.building, cls.floor, cls.room = buildings[0], floors[0], rooms[0]
+        MaintenanceRequest.objects.bulk_create(
+            MaintenanceRequest(
+                description=f"Request {i}",
+                role="staff",
+                requester_name="Jane" if i % 10 == 0 else f"user{i}",
+                status=("pending", "approved", "in_progress", "completed")[i % 4],
+                building=buildings[i % 4],
+                floor=floors[i % 4],
+                room=rooms[i % 4],
+                assigned_to=staff[i % 10] if i % 3 else None,
+                created_by=cls.requester if i % 10 == 0 else None,
+            )
+            for i in range(200)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def query_plan(self, view, user, params=""):
+        """The EXPLAIN QUERY PLAN of the listing SELECT issued by ``view``"""
+        statements = []
+
+        def capture(execute, sql, params_, many, context):
+            if sql.lstrip().upper().startswith("SELECT") and "maintenance_maintenancerequest" in sql:
+                statements.append((sql, params_))
+            return execute(sql, params_, many, context)
+
+        request = APIRequestFactory().get("/api/maintenance/requests/" + params)
+        force_authenticate(request, user=user)
+        with connection.execute_wrapper(capture):
+            response = view.as_view()(request).render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(statements), 1)
+
+        sql, sql_params = statements[0]
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, sql_params)
+            return " | ".join(row[-1] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(f"INDEX {index}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_unfiltered_listing(self):
+        plan = self.query_plan(ListRequestsView, self.admin)
+        self.assertUsesIndex(plan, "maint_req_created_id_idx")
+
+    def test_location_filters(self):
+        cases = [
+            (f"?building={self.building.id}", "maint_req_bldg_created_idx"),
+            (f"?floor={self.floor.id}", "maint_req_floor_created_idx"),
+            (f"?room={self.room.id}", "maint_req_room_created_idx"),
+        ]
+        for params, index in cases:
+            with self.subTest(params):
+                self.assertUsesIndex(self.query_plan(ListRequestsView, self.admin, params), index)
+
+    def test_status_filter(self):
+        plan = self.query_plan(ListRequestsView, self.admin, "?status=pending")
+        self.assertUsesIndex(plan, "maint_req_status_created_idx")
+
+    def test_unassigned_per_building(self):
+        plan = self.query_plan(
+            ListRequestsView, self.admin, f"?building={self.building.id}&assigned_to=none"
+        )
+        self.assertUsesIndex(plan, "maint_req_unassigned_idx")
+
+    def test_assignee_filter(self):
+        plan = self.query_plan(ListRequestsView, self.admin, f"?assigned_to={self.staff.id}")
+        self.assertUsesIndex(plan, "maint_req_assignee_created_idx")
+
+    def test_own_requests_by_owner(self):
+        plan = self.query_plan(ListUserRequestsView, self.requester)
+        self.assertUsesIndex(plan, "maint_req_owner_created_idx")
+
+
+class FilterSetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.staff = User.objects.create_user("tech", password="x")
+        hall = Building.objects.create(name="Science Hall")
+        annex = Building.objects.create(name="Annex")
+        cls.leak = MaintenanceRequest.objects.create(
+            description="Leaking sink", role="staff", requester_name="jane",
+            status="pending", building=hall,
+        )
+        cls.light = MaintenanceRequest.objects.create(
+            description="Broken light", role="instructor", requester_name="mark",
+            status="in_progress", building=annex, assigned_to=cls.staff,
+        )
+        cls.door = MaintenanceRequest.objects.create(
+            description="Door hinge", role="staff", requester_name="jane",
+            status="completed", building=annex, assigned_to=cls.staff,
+        )
+        MaintenanceRequest.objects.filter(pk=cls.door.pk).update(
+            created_at=timezone.make_aware(datetime(2024, 1, 15, 12))
+        )
+
+    def ids(self, params):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/maintenance/requests/", params)
+        self.assertEqual(response.status_code, 200)
+        return {item["id"] for item in response.data["results"]}
+
+    def test_status_sets(self):
+        self.assertEqual(self.ids({"status": "pending,completed"}), {self.leak.id, self.door.id})
+        self.assertEqual(self.ids({"exclude_status": "completed"}), {self.leak.id, self.light.id})
+
+    def test_role_and_location(self):
+        self.assertEqual(self.ids({"role": "instructor"}), {self.light.id})
+        self.assertEqual(self.ids({"building": self.leak.building_id}), {self.leak.id})
+
+    def test_assignee(self):
+        self.assertEqual(self.ids({"assigned_to": self.staff.id}), {self.light.id, self.door.id})
+        self.assertEqual(self.ids({"assigned_to": "none"}), {self.leak.id})
+
+    def test_created_range(self):
+        self.assertEqual(
+            self.ids({"created_after": "2024-01-01", "created_before": "2024-01-31"}),
+            {self.door.id},
+        )
+        self.assertEqual(self.ids({"created_after": "2024-02-01"}), {self.leak.id, self.light.id})
+
+    def test_search_matches_every_term(self):
+        self.assertEqual(self.ids({"search": "annex"}), {self.light.id, self.door.id})
+        self.assertEqual(self.ids({"search": "jane hinge"}), {self.door.id})
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "FTS5 index is SQLite only")
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.sink = MaintenanceRequest.objects.create(
+            description="Leaking sink in the staff kitchen", role="staff"
+        )
+        cls.pipe = MaintenanceRequest.objects.create(
+            description="Pipe burst", role="staff",
+            completion_notes="Replaced the leaking pipe and fixed another leak <b>",
+        )
+        MaintenanceRequest.objects.create(description="Projector broken", role="staff")
+
+    def search(self, q):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/maintenance/requests/search/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_ranked_results_with_snippets(self):
+        data = self.search("leak")
+        self.assertEqual(data["count"], 2)
+        self.assertEqual([item["id"] for item in data["results"]], [self.pipe.id, self.sink.id])
+        self.assertIn("<mark>leaking</mark>", data["results"][0]["snippet"])
+        self.assertIn("&lt;b&gt;", data["results"][0]["snippet"])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.sink.description = "Clogged drain"
+        self.sink.save()
+        self.assertEqual([item["id"] for item in self.search("leaking")["results"]], [self.pipe.id])
+        self.assertEqual(self.search("drain")["count"], 1)
+
+        self.pipe.delete()
+        self.assertEqual(self.search("leak")["count"], 0)
+
+    def test_only_text_changes_reindex(self):
+        def fts_statements(func):
+            with CaptureQueriesContext(connection) as context:
+                func()
+            return [q["sql"] for q in context.captured_queries if search.FTS_TABLE in q["sql"]]
+
+        request = MaintenanceRequest.objects.get(pk=self.sink.pk)
+        request.status = "in_progress"
+        request.assigned_to = self.admin
+        self.assertEqual(fts_statements(request.save), [])
+
+        request.completion_notes = "Unclogged"
+        self.assertEqual(len(fts_statements(request.save)), 2)
+        self.assertEqual(self.search("unclogged")["count"], 1)
+
+    def test_operators_in_input_are_literal(self):
+        self.assertEqual(self.search('sink OR "projector')["count"], 0)
+        self.assertEqual(self.search("NEAR(")["count"], 0)
+
+
+class AnalyticsEquivalenceTests(TestCase):
+    """The grouped aggregates must match a per-request computation in Python"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        annex = Building.objects.create(name="Annex")
+        grounds = Building.objects.create(name="Grounds", has_floors=False)
+        first = Floor.objects.create(building=annex, number=1, label="First")
+        second = Floor.objects.create(building=annex, number=2, label="Second")
+        statuses = ("pending", "approved", "in_progress", "completed", "rejected")
+        fixtures = (
+            # (building, floor, requester, days ago), with distinct group sizes
+            [(annex, first, "jane", days) for days in (0, 1, 2, 3, 8, 9, 31)]
+            + [(annex, second, "bob", days) for days in (0, 5, 40)]
+            + [(annex, second, "carl", days) for days in (15, 20, 29)]
+            + [(grounds, None, None, days) for days in (12, 45)]
+        )
+        for index, (building, floor, requester, days) in enumerate(fixtures):
+            request = MaintenanceRequest.objects.create(
+                description=f"Request {index}", role="staff", requester_name=requester,
+                building=building, floor=floor, status=statuses[index % len(statuses)],
+            )
+            MaintenanceRequest.objects.filter(pk=request.pk).update(
+                created_at=cls.now - timedelta(days=days, hours=1)
+            )
+        rollups.rebuild()
+
+    def test_dashboard_matches_python_computation(self):
+        requests = list(MaintenanceRequest.objects.select_related("building", "floor"))
+        since_7 = self.now - timedelta(days=7)
+        since_30 = self.now - timedelta(days=30)
+
+        statuses = Counter(request.status for request in requests)
+        locations = Counter(
+            f"{r.building.name if r.building else 'Unknown Building'} - "
+            f"Floor {r.floor.number if r.floor else 'N/A'}"
+            for r in requests
+        )
+        requesters = Counter(
+            r.requester_name or "Anonymous" for r in requests if r.created_at >= since_30
+        )
+        created_by_day = Counter(timezone.localdate(r.created_at).isoformat() for r in requests)
+
+        dashboard = analytics.build_dashboard(now=self.now)
+
+        self.assertEqual(dashboard["total_requests"], len(requests))
+        self.assertEqual(
+            dashboard["status_counts"],
+            {status: statuses[status] for status in dashboard["status_counts"]},
+        )
+        self.assertEqual(
+            dashboard["location_stats"],
+            [{"location": name, "count": count} for name, count in locations.most_common(10)],
+        )
+        self.assertEqual(
+            dashboard["user_engagement"],
+            [{"user": name, "count": count} for name, count in requesters.most_common(10)],
+        )
+        self.assertEqual(
+            dashboard["recent_metrics"],
+            {
+                "last_7_days": sum(r.created_at >= since_7 for r in requests),
+                "last_30_days": sum(r.created_at >= since_30 for r in requests),
+                "completion_rate": round(statuses["completed"] / len(requests) * 100, 1),
+            },
+        )
+        self.assertEqual(
+            dashboard["request_trends"],
+            [
+                {"date": row["date"], "requests": created_by_day[row["date"]]}
+                for row in dashboard["request_trends"]
+            ],
+        )
+        self.assertEqual(
+            sum(row["requests"] for row in dashboard["request_trends"]),
+            sum(timezone.localdate(r.created_at) > timezone.localdate(self.now) - timedelta(days=30)
+                for r in requests),
+        )
+
+
+class DailyStatsSignalTests(TestCase):
+    """The incrementally maintained rollup must equal a full rebuild"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("tech", password="x")
+        cls.building = Building.objects.create(name="Annex")
+
+    def rollup(self):
+        return {
+            (row.date, row.building_id, row.status, row.assigned_to_id): (row.created_count, row.completed_count)
+            for row in MaintenanceDailyStats.objects.all()
+            if row.created_count or row.completed_count
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollup()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.rollup())
+        return incremental
+
+    def test_create_complete_and_delete(self):
+        request = MaintenanceRequest.objects.create(description="x", role="staff", building=self.building)
+        today = timezone.localdate()
+        self.assertEqual(self.assertMatchesRebuild(), {(today, self.building.id, "pending", None): (1, 0)})
+
+        request.status = "completed"
+        request.assigned_to = self.staff
+        request.save()
+        self.assertIsNotNone(request.completed_at)
+        self.assertEqual(
+            self.assertMatchesRebuild(), {(today, self.building.id, "completed", self.staff.id): (1, 1)}
+        )
+
+        request.delete()
+        self.assertEqual(self.assertMatchesRebuild(), {})
+
+    def test_later_edits_keep_the_completion_day(self):
+        request = MaintenanceRequest.objects.create(
+            description="x", role="staff", building=self.building, status="completed"
+        )
+        completed_at = timezone.now() - timedelta(days=3)
+        MaintenanceRequest.objects.filter(pk=request.pk).update(completed_at=completed_at)
+        rollups.rebuild()
+
+        request = MaintenanceRequest.objects.get(pk=request.pk)
+        request.description = "edited"
+        request.assigned_to = self.staff
+        request.save()
+
+        stats = self.assertMatchesRebuild()
+        completed_day = timezone.localdate(completed_at)
+        self.assertEqual(stats[(completed_day, self.building.id, "completed", self.staff.id)], (0, 1))
+        self.assertEqual(request.completed_at, completed_at)
+
+    def test_reopening_clears_the_completion(self):
+        request = MaintenanceRequest.objects.create(
+            description="x", role="staff", building=self.building, status="completed"
+        )
+        request.status = "in_progress"
+        request.save(update_fields=["status"])
+
+        self.assertIsNone(MaintenanceRequest.objects.get(pk=request.pk).completed_at)
+        self.assertEqual(
+            self.assertMatchesRebuild(), {(timezone.localdate(), self.building.id, "in_progress", None): (1, 0)}
+        )
+
+    def test_missing_buckets_do_not_fail_saves(self):
+        request = MaintenanceRequest.objects.create(description="x", role="staff", building=self.building)
+        MaintenanceDailyStats.objects.all().delete()
+
+        # The decrement of the missing "pending" bucket is a no-op
+        request.status = "approved"
+        request.save()
+        self.assertEqual(self.rollup(), {(timezone.localdate(), self.building.id, "approved", None): (1, 0)})
+
+    def test_one_row_per_bucket(self):
+        MaintenanceRequest.objects.create(description="x", role="staff", building=None)
+        row = MaintenanceDailyStats.objects.get()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MaintenanceDailyStats.objects.create(date=row.date, status=row.status, created_count=1)
+
+
+    def test_deleting_buildings_merges_their_buckets(self):
+        first = Building.objects.create(name="PA")
+        second = Building.objects.create(name="PB")
+        MaintenanceRequest.objects.create(description="x", role="staff", building=first)
+        MaintenanceRequest.objects.create(description="y", role="staff", building=second)
+
+        first.delete()
+        second.delete()
+
+        self.assertEqual(self.assertMatchesRebuild(), {(timezone.localdate(), None, "pending", None): (2, 0)})
+
+    def test_deleting_a_user_merges_their_buckets(self):
+        staff = User.objects.create_user("leaving", password="x")
+        floor = Floor.objects.create(building=self.building, number=1, label="Ground")
+        MaintenanceRequest.objects.create(description="x", role="staff", building=self.building, floor=floor)
+        MaintenanceRequest.objects.create(
+            description="y", role="staff", building=self.building, floor=floor, assigned_to=staff
+        )
+
+        staff.delete()
+
+        self.assertEqual(
+            self.assertMatchesRebuild(), {(timezone.localdate(), self.building.id, "pending", None): (2, 0)}
+        )
+        self.assertEqual(MaintenanceDailyStats.objects.count(), 1)
+
+
+
+class ChangeTrackingTests(TestCase):
+    """Saving a loaded request must not re-read it to find what changed"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("tech", password="x")
+        building = Building.objects.create(name="Annex")
+        cls.request = MaintenanceRequest.objects.create(description="x", role="staff", building=building)
+
+    def request_selects(self, func):
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return [
+            q["sql"] for q in context.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "maintenance_maintenancerequest"' in q["sql"]
+        ]
+
+    def claim(self, request):
+        request.assigned_to = self.staff
+        request.status = "in_progress"
+        request.save()
+
+    def test_loaded_request_saves_without_select(self):
+        request = MaintenanceRequest.objects.get(pk=self.request.pk)
+        self.assertEqual(self.request_selects(lambda: self.claim(request)), [])
+        self.assertEqual(
+            request.get_original_values()["assigned_to_id"], self.staff.id
+        )
+
+    def test_refresh_from_db_takes_a_new_snapshot(self):
+        request = MaintenanceRequest.objects.get(pk=self.request.pk)
+        MaintenanceRequest.objects.filter(pk=request.pk).update(status="approved")
+        request.refresh_from_db()
+
+        self.assertEqual(request.get_original_values()["status"], "approved")
+        self.assertEqual(self.request_selects(lambda: self.claim(request)), [])
+
+    def test_deferred_fields_fall_back_to_one_query(self):
+        request = MaintenanceRequest.objects.only("id", "description").get(pk=self.request.pk)
+        with self.assertNumQueries(1):
+            original = request.get_original_values()
+        self.assertEqual((original["status"], original["assigned_to_id"]), ("pending", None))
+
+        with self.assertNumQueries(0):
+            request.get_original_values()
+
+    def test_loading_deferred_fields_snapshots_them(self):
+        request = MaintenanceRequest.objects.only("id", "description").get(pk=self.request.pk)
+        request.refresh_from_db(fields=MaintenanceRequest.TRACKED_FIELDS)
+        with self.assertNumQueries(0):
+            self.assertEqual(request.get_original_values()["status"], "pending")
+
+
+class StatusTransitionEventTests(TestCase):
+    """Every transition endpoint logs exactly one event, atomically with the change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.building = Building.objects.create(name="Annex")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.request = MaintenanceRequest.objects.create(
+            description="x", role="staff", building=self.building
+        )
+
+    def assertLogged(self, to_status):
+        events = list(MaintenanceStatusEvent.objects.filter(request=self.request))
+        self.assertEqual([(e.from_status, e.to_status) for e in events], [("pending", to_status)])
+        self.assertEqual(events[0].actor, self.admin)
+
+    def test_approve(self):
+        response = self.client.patch(f"/api/maintenance/requests/{self.request.id}/", {"status": "approved"})
+        self.assertEqual(response.status_code, 200)
+        self.assertLogged("approved")
+
+    def test_claim(self):
+        response = self.client.post(f"/api/maintenance/requests/{self.request.id}/claim/")
+        self.assertEqual(response.status_code, 200)
+        self.assertLogged("in_progress")
+
+    def test_complete(self):
+        response = self.client.post(
+            f"/api/maintenance/requests/{self.request.id}/complete/", {"completion_notes": "done"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertLogged("completed")
+
+    def test_update_status(self):
+        response = self.client.post(
+            f"/api/maintenance/requests/{self.request.id}/update-status/", {"status": "in_progress"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertLogged("in_progress")
+
+    def test_failed_log_rolls_back_the_change(self):
+        with mock.patch.object(MaintenanceStatusEvent, "record", side_effect=RuntimeError), \
+                self.assertRaises(RuntimeError):
+            self.client.post(f"/api/maintenance/requests/{self.request.id}/claim/")
+
+        self.request.refresh_from_db()
+        self.assertEqual((self.request.status, self.request.assigned_to), ("pending", None))
+
+
+class RequestOwnershipTests(TestCase):
+    """created_by comes from the authenticated submitter and scopes requests/mine/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True, is_superuser=True)
+        cls.requester = User.objects.create_user("requester", password="x")
+        cls.building = Building.objects.create(name="Annex")
+
+    def create(self, user, **data):
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = {"description": "Leak", "role": "staff", "building_id": self.building.id, **data}
+        response = client.post("/api/maintenance/requests/create/", payload)
+        self.assertEqual(response.status_code, 201, response.data)
+        return MaintenanceRequest.objects.get(id=response.data["id"])
+
+    def test_created_by_is_the_submitter(self):
+        request = self.create(self.requester, created_by=self.admin.id)
+        self.assertEqual(request.created_by, self.requester)
+
+    def test_mine_lists_only_own_requests_for_every_role(self):
+        own = self.create(self.admin)
+        self.create(self.requester)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/maintenance/requests/mine/", {"page_size": 3})
+        self.assertEqual([row["id"] for row in response.data["results"]], [own.id])
+
+
+class ReadOnlyAdminTests(TestCase):
+    """Status events and rollup rows are written by the application only"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("root", password="x")
+        request = MaintenanceRequest.objects.create(description="x", role="staff")
+        cls.event = MaintenanceStatusEvent.record(request, None, actor=cls.admin)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_status_event_cannot_be_changed(self):
+        url = f"/admin/maintenance/maintenancestatusevent/{self.event.id}/change/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.post(url, {"to_status": "completed"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get("/admin/maintenance/maintenancestatusevent/add/").status_code, 403)
 
-# Create your tests here.
+    def test_daily_stats_are_browse_only(self):
+        self.assertEqual(self.client.get("/admin/maintenance/maintenancedailystats/").status_code, 200)
+        row = MaintenanceDailyStats.objects.first()
+        url = f"/admin/maintenance/maintenancedailystats/{row.id}/change/"
+        self.assertEqual(self.client.post(url, {"created_count": 5}).status_code, 403)
@@ -3,17 +3,25 @@ from django.urls import path
 from .views import (
     CreateRequestView,
     ListRequestsView,
+    ListUserRequestsView,
+    SearchRequestsView,
     ClaimRequestView,
     CompleteRequestView,
     UpdateStatusView,
     ApproveRejectRequestView,  # ✅ NEW
+    AnalyticsView,
+    TrendsView,
 )
 
 urlpatterns = [
     path("requests/", ListRequestsView.as_view(), name="list_requests"),
+    path("requests/mine/", ListUserRequestsView.as_view(), name="list_user_requests"),
+    path("requests/search/", SearchRequestsView.as_view(), name="search_requests"),
     path("requests/create/", CreateRequestView.as_view(), name="create_request"),
     path("requests/<int:pk>/claim/", ClaimRequestView.as_view(), name="claim_request"),
     path("requests/<int:pk>/complete/", CompleteRequestView.as_view(), name="complete_request"),
     path("requests/<int:pk>/update-status/", UpdateStatusView.as_view(), name="update_status"),
+    path("analytics/", AnalyticsView.as_view(), name="maintenance_analytics"),
+    path("analytics/trends/", TrendsView.as_view(), name="maintenance_trends"),
     path("requests/<int:pk>/", ApproveRejectRequestView.as_view(), name="approve_reject_request"),  # ✅ NEW - PATCH endpoint
 ]
\ No newline at end of file
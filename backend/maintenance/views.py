@@ -1,15 +1,23 @@
 # maintenance/views.py
+from django.db import transaction
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from accounts.models import User
 
-from .models import MaintenanceRequest
+from . import search
+from .analytics import TREND_DAYS, build_dashboard, trends
+from .filters import MaintenanceRequestFilterSet
+from .models import MaintenanceRequest, MaintenanceStatusEvent
+from .pagination import MaintenanceCursorPagination
 from .serializers import (
     MaintenanceRequestSerializer,
+    MaintenanceRequestListSerializer,
     ClaimRequestSerializer,
     CompleteRequestSerializer,
+    REQUEST_VALUE_FIELDS,
+    serialize_request_rows,
 )
 
 
@@ -19,63 +27,110 @@ class CreateRequestView(generics.CreateAPIView):
     serializer_class = MaintenanceRequestSerializer
     
     def perform_create(self, serializer):
-        # Log the incoming data for debugging
-        print("Creating maintenance request with data:", self.request.data)
-        serializer.save()
+        # The submitter owns the request ("my requests" is keyed on created_by)
+        serializer.save(created_by=self.request.user)
+
+
+class CompactListMixin:
+    """
+    Use MaintenanceRequestListSerializer when the client asks for the
+    compact representation (?compact=true) or shapes the response with
+    ?fields= / ?expand=; otherwise render the full representation through
+    the .values() fast path.
+    """
+
+    def get_serializer_class(self):
+        params = self.request.query_params
+        compact = params.get("compact", "").lower() in ("1", "true", "yes")
+        if compact or "fields" in params or "expand" in params:
+            return MaintenanceRequestListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the full representation straight from .values() rows
+
+        The output is identical to MaintenanceRequestSerializer(many=True)
+        but skips building model instances and serializer fields per row.
+        """
+        if self.get_serializer_class() is not MaintenanceRequestSerializer:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*REQUEST_VALUE_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_request_rows(page, request))
+        return Response(serialize_request_rows(queryset, request))
 
 
 # Staff + admin can see all
-class ListRequestsView(generics.ListAPIView):
+class ListRequestsView(CompactListMixin, generics.ListAPIView):
     serializer_class = MaintenanceRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MaintenanceCursorPagination
+    filterset_class = MaintenanceRequestFilterSet
+    ordering_fields = ["created_at", "updated_at"]
 
     def get_queryset(self):
-        queryset = MaintenanceRequest.objects.all().order_by("-created_at")
-        
-        # ✅ Filter by room if provided
-        room_id = self.request.query_params.get('room', None)
-        if room_id:
-            queryset = queryset.filter(room_id=room_id)
-        
-        # ✅ Filter by building if provided
-        building_id = self.request.query_params.get('building', None)
-        if building_id:
-            queryset = queryset.filter(building_id=building_id)
-        
-        # ✅ Filter by floor if provided
-        floor_id = self.request.query_params.get('floor', None)
-        if floor_id:
-            queryset = queryset.filter(floor_id=floor_id)
-        
-        return queryset
+        return MaintenanceRequest.objects.for_listing().order_by("-created_at")
 
 
-class ListUserRequestsView(generics.ListAPIView):
+class ListUserRequestsView(CompactListMixin, generics.ListAPIView):
     serializer_class = MaintenanceRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MaintenanceCursorPagination
+    filterset_class = MaintenanceRequestFilterSet
+    ordering_fields = ["created_at", "updated_at"]
     
     def get_queryset(self):
-        user = self.request.user
-        
-        # Try to get role from staff_profile or check if superuser
+        # Only the caller's own requests, whatever their role; staff and
+        # admins list everything through ListRequestsView
+        return (
+            MaintenanceRequest.objects.for_listing()
+            .filter(created_by=self.request.user)
+            .order_by("-created_at")
+        )
+
+
+class SearchRequestsView(APIView):
+    """
+    Full-text search over description, completion notes and rejection reason
+
+    GET /api/maintenance/requests/search/?q=leaking sink&limit=20&offset=0
+    Results are ranked best first and carry a highlighted snippet.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response({"error": "q is required"}, status=400)
         try:
-            # Check if user is superuser (admin)
-            if user.is_superuser or user.is_staff:
-                return MaintenanceRequest.objects.all().order_by("-created_at")
-            
-            # Check if user has staff_profile
-            if hasattr(user, 'staff_profile'):
-                role = user.staff_profile.role.lower()
-                # Staff and maintenance staff see all requests
-                if 'staff' in role or role == 'admin' or role == 'administrator':
-                    return MaintenanceRequest.objects.all().order_by("-created_at")
-        except AttributeError:
-            pass  # User doesn't have staff_profile, treat as regular user
-        
-        # Regular users see only their own requests
-        return MaintenanceRequest.objects.filter(
-            requester_name__iexact=user.username
-        ).order_by("-created_at")
+            limit = int(request.query_params.get("limit", self.DEFAULT_LIMIT))
+            offset = int(request.query_params.get("offset", 0))
+        except ValueError:
+            return Response({"error": "limit and offset must be integers"}, status=400)
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        offset = max(0, offset)
+
+        total, hits = search.search(text, limit=limit, offset=offset)
+        requests_by_id = MaintenanceRequest.objects.for_listing().in_bulk(
+            [hit["id"] for hit in hits]
+        )
+
+        results = []
+        for hit in hits:
+            maintenance = requests_by_id.get(hit["id"])
+            if maintenance is None:
+                continue  # deleted since it was indexed
+            data = MaintenanceRequestListSerializer(
+                maintenance, context={"request": request}
+            ).data
+            results.append({**data, "rank": hit["rank"], "snippet": hit["snippet"]})
+
+        return Response({"count": total, "results": results})
 
 
 # ✅ NEW: Approve/Reject endpoint
@@ -101,6 +156,7 @@ class ApproveRejectRequestView(APIView):
             )
 
         # Update status
+        old_status = maintenance.status
         maintenance.status = new_status
         
         # Save rejection reason if rejecting
@@ -127,22 +183,38 @@ class ApproveRejectRequestView(APIView):
                 except (ValueError, User.DoesNotExist):
                     return Response({"error": "Invalid user ID"}, status=400)
         
-        maintenance.save()
+        # The status change and its log entry commit together
+        with transaction.atomic():
+            maintenance.save()
+            MaintenanceStatusEvent.record(maintenance, old_status, request.user)
         
         serializer = MaintenanceRequestSerializer(maintenance)
         return Response(serializer.data)
 
 
 class AnalyticsView(APIView):
+    """Dashboard metrics computed with grouped queries on the server"""
     permission_classes = [permissions.IsAdminUser]
     
     def get(self, request):
-        # Pre-calculated analytics
-        # This would be more efficient than processing on frontend
+        return Response(build_dashboard())
+
+
+class TrendsView(APIView):
+    """Daily created/completed counts served from the daily rollup table"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", TREND_DAYS))
+        except ValueError:
+            return Response({"error": "days must be an integer"}, status=400)
+        days = max(1, min(days, 366))
+
+        request_series, completion_series = trends(days=days)
         return Response({
-            'avg_response_time': 0,
-            'avg_completion_time': 0,
-            # etc.
+            "request_trends": request_series,
+            "completion_trends": completion_series,
         })
 
 
@@ -160,9 +232,12 @@ class ClaimRequestView(APIView):
             return Response({"error": "Already taken"}, status=400)
 
         # Assign to the user directly (not staff profile)
+        old_status = maintenance.status
         maintenance.assigned_to = request.user
         maintenance.status = "in_progress"
-        maintenance.save()
+        with transaction.atomic():
+            maintenance.save()
+            MaintenanceStatusEvent.record(maintenance, old_status, request.user)
         return Response({"message": "Request claimed successfully"})
 
 
@@ -176,6 +251,8 @@ class CompleteRequestView(APIView):
         except MaintenanceRequest.DoesNotExist:
             return Response({"error": "Request not found"}, status=404)
         
+        old_status = maintenance.status
+
         # ✅ Handle assigned_to if provided (admin only)
         assigned_to = request.data.get('assigned_to')
         if assigned_to:
@@ -190,7 +267,9 @@ class CompleteRequestView(APIView):
             maintenance, data=request.data, partial=True
         )
         if serializer.is_valid():
-            serializer.save(status="completed")
+            with transaction.atomic():
+                serializer.save(status="completed")
+                MaintenanceStatusEvent.record(maintenance, old_status, request.user)
             return Response({"message": "Request completed"})
         return Response(serializer.errors, status=400)
 
@@ -206,6 +285,8 @@ class UpdateStatusView(APIView):
         except MaintenanceRequest.DoesNotExist:
             return Response({"error": "Request not found"}, status=404)
         
+        old_status = maintenance_request.status
+
         # Use the serializer to validate and save
         serializer = CompleteRequestSerializer(
             maintenance_request, 
@@ -214,7 +295,9 @@ class UpdateStatusView(APIView):
         )
         
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
+                MaintenanceStatusEvent.record(maintenance_request, old_status, request.user)
             # Return the full request data
             response_serializer = MaintenanceRequestSerializer(maintenance_request)
             return Response(response_serializer.data)
@@ -228,9 +311,7 @@ class MaintenanceDetailView(APIView):
     
     def get(self, request, pk):
         try:
-            maintenance = MaintenanceRequest.objects.select_related(
-                'building', 'floor', 'room', 'assigned_to', 'created_by'
-            ).get(id=pk)
+            maintenance = MaintenanceRequest.objects.for_listing().get(id=pk)
         except MaintenanceRequest.DoesNotExist:
             return Response({"error": "Request not found"}, status=404)
         
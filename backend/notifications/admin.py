@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationArchive, NotificationOutbox
 
 # Register your models here.
-admin.site.register(Notification)
\ No newline at end of file
+admin.site.register(Notification)
+admin.site.register(NotificationOutbox)
+admin.site.register(NotificationArchive)
@@ -0,0 +1,123 @@
+"""
+Per-user unread notification counters.
+
+Every code path that creates, reads or deletes notifications adjusts the
+``NotificationCounter`` row of the affected users so the unread count can be
+served without counting the ``Notification`` table. Counters that do not
+exist yet are initialised from the table the first time they are touched.
+"""
+
+from collections import Counter
+
+from django.db.models import (
+    Case, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Greatest
+
+from .models import Notification, NotificationCounter
+
+
+def _counts(user_ids):
+    """``{user_id: (unread count, latest notification id)}`` from the table"""
+    rows = (
+        Notification.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(unread=Count("id", filter=Q(is_read=False)), last_id=Max("id"))
+        .order_by()
+    )
+    counts = {user_id: (0, 0) for user_id in user_ids}
+    counts.update({row["user_id"]: (row["unread"], row["last_id"]) for row in rows})
+    return counts
+
+
+def recount(user_ids):
+    """Recompute the counters of ``user_ids`` from the notification table"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return
+    NotificationCounter.objects.bulk_create(
+        [
+            NotificationCounter(user_id=user_id, unread=unread, last_notification_id=last_id)
+            for user_id, (unread, last_id) in _counts(user_ids).items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["unread", "last_notification_id"],
+    )
+
+
+def get_state(user_id):
+    """Return ``(unread count, latest notification id)`` of a user (one primary-key lookup)"""
+    state = (
+        NotificationCounter.objects.filter(user_id=user_id)
+        .values_list("unread", "last_notification_id")
+        .first()
+    )
+    if state is None:
+        recount([user_id])
+        return _counts([user_id])[user_id]
+    return state
+
+
+def get_unread_count(user_id):
+    """Return a user's unread count (one primary-key lookup)"""
+    return get_state(user_id)[0]
+
+
+def notifications_created(notifications):
+    """
+    Account for newly inserted unread notifications
+
+    Call after the rows are written: counters that do not exist yet are
+    initialised from the table (which already includes the new rows), the
+    others are incremented, and their latest notification id advanced, with
+    a single UPDATE.
+    """
+    per_user = Counter(n.user_id for n in notifications if not n.is_read)
+    if not per_user:
+        return
+
+    existing = set(
+        NotificationCounter.objects.filter(user_id__in=per_user).values_list(
+            "user_id", flat=True
+        )
+    )
+    recount([user_id for user_id in per_user if user_id not in existing])
+    if not existing:
+        return
+
+    last_ids = {}
+    for notification in notifications:
+        if notification.pk is not None:
+            last_ids[notification.user_id] = max(last_ids.get(notification.user_id, 0), notification.pk)
+
+    def per_user_value(values):
+        return Case(
+            *[When(user_id=user_id, then=Value(values[user_id])) for user_id in existing],
+            output_field=IntegerField(),
+        )
+
+    update = {"unread": F("unread") + per_user_value(per_user)}
+    if all(user_id in last_ids for user_id in existing):
+        update["last_notification_id"] = Greatest(F("last_notification_id"), per_user_value(last_ids))
+    else:
+        # Backends that return no primary keys from bulk_create
+        update["last_notification_id"] = Subquery(
+            Notification.objects.filter(user_id=OuterRef("user_id"))
+            .order_by("-id")
+            .values("id")[:1]
+        )
+    # One UPDATE for every recipient of the batch
+    NotificationCounter.objects.filter(user_id__in=existing).update(**update)
+
+
+def decrement(user_id, count=1):
+    """Account for ``count`` notifications of a user that stopped being unread"""
+    if count <= 0:
+        return
+    updated = NotificationCounter.objects.filter(user_id=user_id).update(
+        unread=Greatest(F("unread") - count, 0)
+    )
+    if not updated:
+        recount([user_id])
+
@@ -1,66 +1,124 @@
 """
 Helper functions for creating notifications
 Place this in: notifications/helpers.py
+
+All fan-out goes through NotificationBatch so that a notification sent to
+many users costs a single INSERT instead of one query per recipient.
 """
 
 from django.contrib.auth.models import User
+from django.db.models import Q
+from notifications import counters
 from notifications.models import Notification
 
 
+def admin_user_ids():
+    """
+    Return the ids of all admin users (is_staff or is_superuser)
+
+    Resolve this once per event and pass it around instead of querying
+    again for every notification.
+    """
+    return list(
+        User.objects.filter(Q(is_staff=True) | Q(is_superuser=True)).values_list(
+            "id", flat=True
+        )
+    )
+
+
+class NotificationBatch:
+    """
+    Collect notifications for several recipients and write them at once
+
+    Usage:
+        batch = NotificationBatch()
+        batch.add(user.id, "Hello", maintenance_request=req)
+        batch.add_many(admin_user_ids(), "Hello admins", maintenance_request=req)
+        batch.send()
+    """
+
+    def __init__(self):
+        self._notifications = []
+
+    def __len__(self):
+        return len(self._notifications)
+
+    def add(self, user_id, message, maintenance_request=None):
+        """Queue a notification for a single user id (ignored if None)"""
+        if user_id is None:
+            return
+        self._notifications.append(
+            Notification(
+                user_id=user_id,
+                message=message,
+                maintenance_request=maintenance_request,
+            )
+        )
+
+    def add_many(self, user_ids, message, maintenance_request=None, exclude=()):
+        """Queue the same notification for every user id not in ``exclude``"""
+        excluded = {user_id for user_id in exclude if user_id is not None}
+        for user_id in user_ids:
+            if user_id not in excluded:
+                self.add(user_id, message, maintenance_request)
+
+    def discard_after(self, count):
+        """Drop everything queued after the first ``count`` notifications"""
+        del self._notifications[count:]
+
+    def send(self):
+        """Write all queued notifications with one bulk_create"""
+        if not self._notifications:
+            return []
+        created = Notification.objects.bulk_create(self._notifications)
+        self._notifications = []
+        counters.notifications_created(created)
+        return created
+
+
 def notify_admins(message, maintenance_request=None):
     """
     Send notification to all admin users
-    
+
     Args:
         message (str): Notification message
         maintenance_request (MaintenanceRequest, optional): Related request
     """
-    admin_users = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
-    admin_users = admin_users.distinct()
-    
-    for admin in admin_users:
-        Notification.objects.create(
-            user=admin,
-            message=message,
-            maintenance_request=maintenance_request,
-        )
+    batch = NotificationBatch()
+    batch.add_many(admin_user_ids(), message, maintenance_request)
+    return batch.send()
 
 
 def notify_user(user, message, maintenance_request=None):
     """
     Send notification to a specific user
-    
+
     Args:
         user (User): User to notify
         message (str): Notification message
         maintenance_request (MaintenanceRequest, optional): Related request
     """
     if user:
-        Notification.objects.create(
+        notification = Notification.objects.create(
             user=user,
             message=message,
             maintenance_request=maintenance_request,
         )
+        counters.notifications_created([notification])
+        return notification
 
 
 def notify_staff_and_admins(message, maintenance_request=None, exclude_user=None):
     """
     Send notification to all staff and admins, optionally excluding a user
-    
+
     Args:
         message (str): Notification message
         maintenance_request (MaintenanceRequest, optional): Related request
         exclude_user (User, optional): User to exclude from notifications
     """
-    users = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
-    users = users.distinct()
-    
-    if exclude_user:
-        users = users.exclude(id=exclude_user.id)
-    
-    for user in users:
-        Notification.objects.create(
-            user=user,
-            message=message,
-            maintenance_request=maintenance_request,
-        )
\ No newline at end of file
+    exclude = [exclude_user.id] if exclude_user else []
+
+    batch = NotificationBatch()
+    batch.add_many(admin_user_ids(), message, maintenance_request, exclude=exclude)
+    return batch.send()
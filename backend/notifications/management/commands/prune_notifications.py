@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the notification retention policy: collapse repeated status-change "
+        "notifications, delete (or archive) old read notifications and drop "
+        "processed outbox events"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "NOTIFICATION_RETENTION_DAYS", 90),
+            help="Remove read notifications older than this many days",
+        )
+        parser.add_argument(
+            "--outbox-days",
+            type=int,
+            default=getattr(settings, "NOTIFICATION_OUTBOX_RETENTION_DAYS", 7),
+            help="Remove outbox events processed more than this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Copy notifications to NotificationArchive before deleting them",
+        )
+        parser.add_argument(
+            "--skip-compaction",
+            action="store_true",
+            help="Do not collapse repeated status-change notifications",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many notifications would be removed",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        prefix = "Would remove" if dry_run else "Removed"
+
+        if not options["skip_compaction"]:
+            compacted = retention.compact_status_changes(
+                batch_size=options["batch_size"], dry_run=dry_run
+            )
+            self.stdout.write(f"{prefix} {compacted} repeated status-change notifications")
+
+        purged = retention.purge_read(
+            options["days"],
+            batch_size=options["batch_size"],
+            archive=options["archive"],
+            dry_run=dry_run,
+        )
+        message = f"{prefix} {purged} read notifications older than {options['days']} days"
+        if options["archive"] and not dry_run:
+            message += " (archived)"
+        self.stdout.write(message)
+
+        outbox = retention.purge_outbox(
+            options["outbox_days"], batch_size=options["batch_size"], dry_run=dry_run
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {outbox} outbox events processed more than {options['outbox_days']} days ago"
+        ))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import process_pending
+
+
+class Command(BaseCommand):
+    help = "Drain the notification outbox and create notifications in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Outbox events processed per batch (default: 100)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the outbox is empty (default: 2)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        self.stdout.write(f"Notification worker started (batch size {batch_size})")
+
+        try:
+            while True:
+                processed = process_pending(batch_size=batch_size)
+                if processed:
+                    self.stdout.write(f"Processed {processed} outbox events")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Notification worker stopped")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:29
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_last_notification_id(apps, schema_editor):
+    NotificationCounter = apps.get_model("notifications", "NotificationCounter")
+    Notification = apps.get_model("notifications", "Notification")
+    latest = (
+        Notification.objects.filter(user_id=OuterRef("user_id"))
+        .values("user_id")
+        .annotate(last_id=Max("id"))
+        .values("last_id")
+    )
+    NotificationCounter.objects.update(last_notification_id=Coalesce(Subquery(latest), 0))
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notificationarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationcounter',
+            name='last_notification_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_notification_id, migrations.RunPython.noop),
+    ]
@@ -18,5 +18,99 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Serves "my notifications" (optionally only unread) newest first
+            models.Index(
+                fields=["user", "is_read", "-created_at", "-id"],
+                name="notif_user_read_created_idx",
+            ),
+            models.Index(fields=["user", "-created_at", "-id"], name="notif_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Notif for {self.user.username}: {self.message[:30]}"
+
+class NotificationOutbox(models.Model):
+    """
+    Durable queue of notification events waiting to be fanned out.
+
+    Signals write one row per event inside the request/schedule save; the
+    ``run_notification_worker`` management command drains the queue and
+    creates the actual ``Notification`` rows out of band.
+    """
+
+    EVENT_CHOICES = [
+        ("request_created", "Request created"),
+        ("request_updated", "Request updated"),
+        ("schedule_saved", "Schedule saved"),
+    ]
+
+    event = models.CharField(max_length=30, choices=EVENT_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="notif_outbox_pending_idx",
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        state = "done" if self.processed_at else "pending"
+        return f"Outbox #{self.id} {self.event} ({state})"
+
+
+class NotificationCounter(models.Model):
+    """
+    Cached number of unread notifications per user.
+
+    Read with a single primary-key lookup by the unread-count endpoint and
+    the notification stream; kept in sync by ``notifications.counters``.
+    ``last_notification_id`` tells open streams whether there is anything
+    new to fetch.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(default=0)
+    last_notification_id = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for notifications removed by the retention job.
+
+    Keeps the request id as a plain integer so archived rows survive the
+    deletion of the maintenance request.
+    """
+
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_notifications"
+    )
+    message = models.TextField()
+    maintenance_request_id = models.BigIntegerField(null=True, blank=True)
+    is_read = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
     def __str__(self):
-        return f"Notif for {self.user.username}: {self.message[:30]}"
\ No newline at end of file
+        return f"Archived notif for {self.user_id}: {self.message[:30]}"
@@ -0,0 +1,223 @@
+"""
+Notification outbox: enqueue in the request thread, fan out in a worker.
+
+Signals call ``enqueue()`` which writes a single ``NotificationOutbox`` row
+in the same transaction as the triggering save. ``process_pending()`` (run
+by ``manage.py run_notification_worker``) turns queued events into
+``Notification`` rows, resolving the admin recipients once per batch and
+writing all notifications of the batch with one ``bulk_create``.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from maintenance.models import MaintenanceRequest
+from .helpers import NotificationBatch, admin_user_ids
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+STATUS_LABELS = dict(MaintenanceRequest.STATUS_CHOICES)
+
+
+def enqueue(event, **payload):
+    """
+    Queue a notification event
+
+    With ``NOTIFICATIONS_DISPATCH_INLINE`` enabled (e.g. local development
+    without a worker) the event is processed as soon as the surrounding
+    transaction commits.
+    """
+    entry = NotificationOutbox.objects.create(event=event, payload=payload)
+    if getattr(settings, "NOTIFICATIONS_DISPATCH_INLINE", False):
+        transaction.on_commit(process_pending)
+    return entry
+
+
+# =============================================================================
+# EVENT HANDLERS - add the notifications of one event to the batch
+# =============================================================================
+def _request_created(batch, payload, context):
+    req = context["requests"][payload["request_id"]]
+    requester = req.requester_name or (
+        req.created_by.username if req.created_by else "Unknown"
+    )
+    batch.add_many(
+        context["admin_ids"],
+        f"New maintenance request #{req.id} created by {requester}.",
+        maintenance_request=req,
+    )
+
+
+def _recipient(context, payload, field):
+    """The user id stored in ``payload[field]``, or None if that user is gone"""
+    user_id = payload.get(field)
+    return user_id if user_id in context["users"] else None
+
+
+def _request_updated(batch, payload, context):
+    req = context["requests"][payload["request_id"]]
+    assigned_to_id = _recipient(context, payload, "assigned_to_id")
+    created_by_id = _recipient(context, payload, "created_by_id")
+
+    # Staff accepted/claimed the request
+    if payload.get("old_assigned_to_id") is None and payload.get("assigned_to_id") is not None:
+        staff = context["users"].get(assigned_to_id)
+        staff_name = (staff.get_full_name() or staff.username) if staff else "staff"
+        batch.add_many(
+            context["admin_ids"],
+            f"Request #{req.id} has been accepted by {staff_name}.",
+            maintenance_request=req,
+            exclude=[assigned_to_id],
+        )
+
+    old_status = payload.get("old_status")
+    status = payload.get("status")
+    if old_status and old_status != status:
+        status_label = STATUS_LABELS.get(status, status)
+        batch.add(
+            created_by_id,
+            f"Your maintenance request #{req.id} status changed to {status_label}.",
+            maintenance_request=req,
+        )
+        if assigned_to_id != created_by_id:
+            batch.add(
+                assigned_to_id,
+                f"Request #{req.id} status changed to {status_label}.",
+                maintenance_request=req,
+            )
+        batch.add_many(
+            context["admin_ids"],
+            f"Request #{req.id} status changed to {status_label}.",
+            maintenance_request=req,
+            exclude=[assigned_to_id, created_by_id],
+        )
+
+
+def _schedule_saved(batch, payload, context):
+    req = context["requests"][payload["request_id"]]
+    scheduled_for = payload["scheduled_for"]
+    batch.add(
+        _recipient(context, payload, "created_by_id"),
+        f"Your maintenance request #{req.id} has been scheduled for {scheduled_for}.",
+        maintenance_request=req,
+    )
+    batch.add(
+        _recipient(context, payload, "assigned_staff_id"),
+        f"You have been assigned a maintenance task (Request #{req.id}) scheduled for {scheduled_for}.",
+        maintenance_request=req,
+    )
+
+
+HANDLERS = {
+    "request_created": _request_created,
+    "request_updated": _request_updated,
+    "schedule_saved": _schedule_saved,
+}
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+RECIPIENT_FIELDS = ("created_by_id", "assigned_to_id", "assigned_staff_id")
+
+
+def _load_context(entries):
+    """
+    Fetch everything the handlers need for a batch in a few queries
+
+    Payloads are snapshots taken at enqueue time, so a recipient may have
+    been deleted since; only users that still exist end up in ``users``.
+    """
+    request_ids = {entry.payload.get("request_id") for entry in entries}
+    user_ids = {
+        entry.payload.get(field) for entry in entries for field in RECIPIENT_FIELDS
+    }
+    user_ids.discard(None)
+    return {
+        "admin_ids": admin_user_ids(),
+        "requests": MaintenanceRequest.objects.select_related("created_by").in_bulk(
+            request_ids
+        ),
+        "users": User.objects.in_bulk(user_ids) if user_ids else {},
+    }
+
+
+def _pending():
+    return NotificationOutbox.objects.filter(
+        processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS
+    ).order_by("id")
+
+
+def _process_batch(batch_size, ids=None):
+    """Fan out one batch in one transaction; see process_pending()"""
+    with transaction.atomic():
+        entries = _pending().select_for_update(skip_locked=True)
+        if ids is not None:
+            entries = entries.filter(id__in=ids)
+        entries = list(entries[:batch_size])
+        if not entries:
+            return 0
+
+        context = _load_context(entries)
+        batch = NotificationBatch()
+        done, failed = [], []
+
+        for entry in entries:
+            handler = HANDLERS.get(entry.event)
+            if handler is None or entry.payload.get("request_id") not in context["requests"]:
+                done.append(entry.id)
+                continue
+            queued = len(batch)
+            try:
+                handler(batch, entry.payload, context)
+            except Exception as exc:
+                logger.exception("Failed to fan out notification outbox #%s", entry.id)
+                batch.discard_after(queued)
+                entry.attempts += 1
+                entry.last_error = str(exc)
+                failed.append(entry)
+            else:
+                done.append(entry.id)
+
+        batch.send()
+        NotificationOutbox.objects.filter(id__in=done).update(processed_at=timezone.now())
+        if failed:
+            NotificationOutbox.objects.bulk_update(failed, ["attempts", "last_error"])
+
+    return len(entries)
+
+
+def process_pending(batch_size=100):
+    """
+    Fan out up to ``batch_size`` queued events
+
+    Returns the number of outbox rows processed. Events whose request no
+    longer exists are marked processed without creating notifications;
+    events whose handler fails are retried up to ``MAX_ATTEMPTS`` times.
+
+    If writing the batch fails as a whole (e.g. a foreign key violation
+    reported at commit), its events are retried one per transaction so a
+    single bad event is charged an attempt instead of stalling the queue.
+    """
+    try:
+        return _process_batch(batch_size)
+    except Exception:
+        logger.exception("Notification outbox batch failed; retrying its events one by one")
+
+    ids = list(_pending().values_list("id", flat=True)[:batch_size])
+    for entry_id in ids:
+        try:
+            _process_batch(1, ids=[entry_id])
+        except Exception as exc:
+            logger.exception("Failed to fan out notification outbox #%s", entry_id)
+            NotificationOutbox.objects.filter(id=entry_id).update(
+                attempts=F("attempts") + 1, last_error=str(exc)
+            )
+    return len(ids)
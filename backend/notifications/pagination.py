@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first
+
+    Unlike page numbers this needs no COUNT(*) and no OFFSET scan, and pages
+    stay stable while new notifications arrive.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,129 @@
+"""
+Retention policy for the ``Notification`` table.
+
+* ``purge_read`` deletes (optionally archiving first) read notifications
+  older than a cutoff, a chunk at a time so no single transaction locks
+  the table for long.
+* ``compact_status_changes`` collapses repeated "status changed" notifications
+  a user received about the same request into the most recent one.
+* ``purge_outbox`` deletes processed ``NotificationOutbox`` events older than
+  a cutoff (events that ran out of attempts are kept for inspection).
+
+All are run by ``manage.py prune_notifications``.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from . import counters
+from .models import Notification, NotificationArchive, NotificationOutbox
+
+STATUS_CHANGE_MARKER = "status changed to"
+
+
+def purge_read(older_than_days, batch_size=1000, archive=False, dry_run=False):
+    """Delete read notifications older than ``older_than_days``; returns the count"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    queryset = Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.order_by("id").values(
+                    "id", "user_id", "message", "maintenance_request_id", "is_read", "created_at"
+                )[:batch_size]
+            )
+            if not rows:
+                break
+            if archive:
+                NotificationArchive.objects.bulk_create(
+                    [
+                        NotificationArchive(
+                            original_id=row["id"],
+                            user_id=row["user_id"],
+                            message=row["message"],
+                            maintenance_request_id=row["maintenance_request_id"],
+                            is_read=row["is_read"],
+                            created_at=row["created_at"],
+                        )
+                        for row in rows
+                    ],
+                    ignore_conflicts=True,
+                )
+            Notification.objects.filter(id__in=[row["id"] for row in rows]).delete()
+        total += len(rows)
+    return total
+
+
+def compact_status_changes(batch_size=500, dry_run=False):
+    """
+    Keep only the newest status-change notification per (user, request)
+
+    Returns the number of notifications removed. Counters of users who lose
+    unread notifications are recomputed.
+    """
+    status_changes = Notification.objects.filter(
+        message__contains=STATUS_CHANGE_MARKER, maintenance_request__isnull=False
+    )
+    groups = list(
+        status_changes.values("user_id", "maintenance_request_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    if dry_run:
+        return sum(group["total"] - 1 for group in groups)
+
+    removed = 0
+    for start in range(0, len(groups), batch_size):
+        chunk = groups[start:start + batch_size]
+        wanted = {(g["user_id"], g["maintenance_request_id"]) for g in chunk}
+        rows = status_changes.filter(
+            user_id__in={g["user_id"] for g in chunk},
+            maintenance_request_id__in={g["maintenance_request_id"] for g in chunk},
+        ).order_by("-created_at", "-id").values_list(
+            "id", "user_id", "maintenance_request_id", "is_read"
+        )
+
+        seen = set()
+        stale_ids, affected_users = [], set()
+        for notification_id, user_id, request_id, is_read in rows:
+            key = (user_id, request_id)
+            if key not in wanted:
+                continue
+            if key in seen:
+                stale_ids.append(notification_id)
+                if not is_read:
+                    affected_users.add(user_id)
+            else:
+                seen.add(key)
+
+        with transaction.atomic():
+            Notification.objects.filter(id__in=stale_ids).delete()
+            counters.recount(affected_users)
+        removed += len(stale_ids)
+    return removed
+
+
+def purge_outbox(older_than_days, batch_size=1000, dry_run=False):
+    """Delete outbox events processed more than ``older_than_days`` ago; returns the count"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    queryset = NotificationOutbox.objects.filter(processed_at__lt=cutoff)
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    while True:
+        # Events are processed roughly in id order, so old ones come first
+        ids = list(queryset.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        NotificationOutbox.objects.filter(id__in=ids).delete()
+        total += len(ids)
+    return total
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from maintenance.serializers import format_datetime
 from .models import Notification
 
 
@@ -99,4 +100,36 @@ class NotificationSerializerAlternative(serializers.ModelSerializer):
                 'id': request.id,
                 'request_type': 'Error loading details',
                 'status': request.status,
-            }
\ No newline at end of file
+            }
+
+# Fast read-only path: NotificationSerializer output built from .values() rows
+NOTIFICATION_VALUE_FIELDS = (
+    'id', 'message', 'maintenance_request_id', 'is_read', 'created_at',
+    'maintenance_request__description',
+    'maintenance_request__status',
+    'maintenance_request__building__name',
+    'maintenance_request__room__name',
+)
+
+
+def notification_row_to_dict(row):
+    """Turn one .values(*NOTIFICATION_VALUE_FIELDS) row into NotificationSerializer output"""
+    request_id = row['maintenance_request_id']
+    details = None
+    if request_id is not None:
+        description = row['maintenance_request__description']
+        details = {
+            'id': request_id,
+            'request_type': description[:50] if description else 'N/A',
+            'status': row['maintenance_request__status'],
+            'building': row['maintenance_request__building__name'],
+            'room': row['maintenance_request__room__name'],
+        }
+    return {
+        'id': row['id'],
+        'message': row['message'],
+        'maintenance_request': request_id,
+        'request_details': details,
+        'is_read': row['is_read'],
+        'created_at': format_datetime(row['created_at']),
+    }
@@ -1,10 +1,15 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from django.contrib.auth.models import User
+from django.utils.dateparse import parse_date
+from . import counters
 from .models import Notification
+from .outbox import enqueue
 from calendar_system.models import MaintenanceSchedule
 from maintenance.models import MaintenanceRequest
 
+# Signals only enqueue a single NotificationOutbox row per save; the fan-out
+# to admins/requesters/staff happens in notifications.outbox (worker).
+
 
 # =============================================================================
 # NEW REQUEST CREATION - Notify all admins
@@ -13,17 +18,7 @@ from maintenance.models import MaintenanceRequest
 def notify_new_request(sender, instance, created, **kwargs):
     """Notify all admins when a new maintenance request is created"""
     if created:
-        # Get all admin users (users with is_staff=True or is_superuser=True)
-        admin_users = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
-        admin_users = admin_users.distinct()
-        
-        # Create notification for each admin
-        for admin in admin_users:
-            Notification.objects.create(
-                user=admin,
-                message=f"New maintenance request #{instance.id} created by {instance.requester_name or instance.created_by.username if instance.created_by else 'Unknown'}.",
-                maintenance_request=instance,
-            )
+        enqueue("request_created", request_id=instance.id)
 
 
 # =============================================================================
@@ -31,77 +26,35 @@ def notify_new_request(sender, instance, created, **kwargs):
 # =============================================================================
 @receiver(pre_save, sender=MaintenanceRequest)
 def store_old_assigned_to(sender, instance, **kwargs):
-    """Store the old assigned_to value before save"""
-    if instance.pk:
-        try:
-            old_instance = sender.objects.get(pk=instance.pk)
-            instance._old_assigned_to = old_instance.assigned_to
-            instance._old_status = old_instance.status
-        except sender.DoesNotExist:
-            instance._old_assigned_to = None
-            instance._old_status = None
-    else:
-        instance._old_assigned_to = None
-        instance._old_status = None
+    """Store the old assigned_to id and status before save (no extra query)"""
+    original = instance.get_original_values() or {}
+    instance._old_assigned_to_id = original.get("assigned_to_id")
+    instance._old_status = original.get("status")
 
 
 @receiver(post_save, sender=MaintenanceRequest)
 def notify_staff_acceptance(sender, instance, created, **kwargs):
-    """Notify admins when staff accepts/claims a request"""
+    """Notify admins when staff accepts/claims a request, and everyone involved of status changes"""
     if created:
         return  # Skip on creation (handled by notify_new_request)
     
-    old_assigned_to = getattr(instance, "_old_assigned_to", None)
+    old_assigned_to_id = getattr(instance, "_old_assigned_to_id", None)
     old_status = getattr(instance, "_old_status", None)
-    
-    # Check if assigned_to changed from None to a staff member (staff accepted/claimed)
-    if old_assigned_to is None and instance.assigned_to is not None:
-        # Get all admin users
-        admin_users = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
-        admin_users = admin_users.distinct()
-        
-        staff_name = instance.assigned_to.get_full_name() or instance.assigned_to.username
-        
-        # Notify all admins
-        for admin in admin_users:
-            # Don't notify if the admin is the one who accepted (in case admin accepted it)
-            if admin != instance.assigned_to:
-                Notification.objects.create(
-                    user=admin,
-                    message=f"Request #{instance.id} has been accepted by {staff_name}.",
-                    maintenance_request=instance,
-                )
-    
-    # Notify status changes (existing functionality)
-    if old_status and old_status != instance.status:
-        # Notify the requester
-        if instance.created_by:
-            Notification.objects.create(
-                user=instance.created_by,
-                message=f"Your maintenance request #{instance.id} status changed to {instance.get_status_display()}.",
-                maintenance_request=instance,
-            )
-
-        # Notify assigned staff if any
-        if instance.assigned_to and instance.assigned_to != instance.created_by:
-            Notification.objects.create(
-                user=instance.assigned_to,
-                message=f"Request #{instance.id} status changed to {instance.get_status_display()}.",
-                maintenance_request=instance,
-            )
-        
-        # Notify admins of status changes
-        admin_users = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
-        admin_users = admin_users.distinct()
-        
-        for admin in admin_users:
-            # Don't send duplicate notification if admin is the assigned staff or requester
-            if admin != instance.assigned_to and admin != instance.created_by:
-                Notification.objects.create(
-                    user=admin,
-                    message=f"Request #{instance.id} status changed to {instance.get_status_display()}.",
-                    maintenance_request=instance,
-                )
+
+    accepted = old_assigned_to_id is None and instance.assigned_to_id is not None
+    status_changed = bool(old_status) and old_status != instance.status
+    if not accepted and not status_changed:
+        return
+
+    enqueue(
+        "request_updated",
+        request_id=instance.id,
+        old_assigned_to_id=old_assigned_to_id,
+        assigned_to_id=instance.assigned_to_id,
+        created_by_id=instance.created_by_id,
+        old_status=old_status,
+        status=instance.status,
+    )
 
 
 # =============================================================================
@@ -110,28 +63,33 @@ def notify_staff_acceptance(sender, instance, created, **kwargs):
 @receiver(post_save, sender=MaintenanceSchedule)
 def notify_schedule(sender, instance, created, **kwargs):
     """Notify when a schedule is added or updated"""
-    req = instance.request
-    staff = instance.assigned_staff
-
-    # Notify requester (the person who created the request)
-    if req.created_by:
-        Notification.objects.create(
-            user=req.created_by,
-            message=f"Your maintenance request #{req.id} has been scheduled for {instance.schedule_date.strftime('%B %d, %Y')}.",
-            maintenance_request=req,
-        )
-
-    # Notify assigned staff
-    if staff and hasattr(staff, 'user') and staff.user:
-        Notification.objects.create(
-            user=staff.user,
-            message=f"You have been assigned a maintenance task (Request #{req.id}) scheduled for {instance.schedule_date.strftime('%B %d, %Y')}.",
-            maintenance_request=req,
-        )
-    elif staff and isinstance(staff, User):
-        # In case assigned_staff is directly a User object
-        Notification.objects.create(
-            user=staff,
-            message=f"You have been assigned a maintenance task (Request #{req.id}) scheduled for {instance.schedule_date.strftime('%B %d, %Y')}.",
-            maintenance_request=req,
-        )
\ No newline at end of file
+    schedule_date = instance.schedule_date
+    if isinstance(schedule_date, str):
+        schedule_date = parse_date(schedule_date)
+
+    enqueue(
+        "schedule_saved",
+        request_id=instance.request_id,
+        created_by_id=instance.request.created_by_id,
+        assigned_staff_id=instance.assigned_staff_id,
+        scheduled_for=schedule_date.strftime('%B %d, %Y'),
+    )
+
+
+# =============================================================================
+# UNREAD COUNTERS - notifications removed by cascade when a request is deleted
+# =============================================================================
+@receiver(pre_delete, sender=MaintenanceRequest)
+def store_unread_notification_users(sender, instance, **kwargs):
+    """Remember whose unread notifications are about to be cascade-deleted"""
+    instance._unread_notification_users = list(
+        Notification.objects.filter(maintenance_request=instance, is_read=False)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=MaintenanceRequest)
+def recount_unread_notifications(sender, instance, **kwargs):
+    """Resync the counters of users who lost unread notifications"""
+    counters.recount(getattr(instance, "_unread_notification_users", []))
@@ -0,0 +1,185 @@
+"""
+Server-Sent Events stream of a user's notifications.
+
+Served by the async view ``notification_stream`` under the ASGI application
+(``backend/asgi.py``). Each connection only sends what changed: new
+notifications (as ``notification`` events, with their id as the SSE event id)
+and unread-count deltas (``unread_count`` events). Clients reconnect with
+``Last-Event-ID`` after the stream is recycled or dropped.
+
+An idle connection costs one primary-key read of the user's
+``NotificationCounter`` per POLL_INTERVAL: the write path advances its
+``last_notification_id``, and notification rows are only queried when it
+moves.
+
+Streaming needs the ASGI server (``uvicorn backend.asgi:application``).
+Under WSGI (``runserver``, gunicorn) Django would buffer the whole stream
+before sending a byte, so the ticket and stream endpoints answer 503 there
+and clients keep polling instead.
+
+EventSource cannot send an Authorization header, so browsers first trade
+their access token for a stream ticket (``POST stream/ticket/``): a signed,
+stream-only value that expires after STREAM_TICKET_MAX_AGE seconds and is
+safe to put in the URL, unlike the JWT itself.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .counters import get_state
+from .models import Notification
+from .serializers import NOTIFICATION_VALUE_FIELDS, notification_row_to_dict
+
+POLL_INTERVAL = 5  # seconds between counter reads
+HEARTBEAT_INTERVAL = 15  # seconds of silence before a keep-alive comment
+MAX_STREAM_SECONDS = 300  # recycle connections; clients reconnect with a new ticket
+STREAM_TICKET_MAX_AGE = 60  # seconds a ticket can be used to open a stream
+STREAM_TICKET_SALT = "notifications.stream-ticket"
+
+
+def streaming_available(request):
+    """Whether this request is served by the ASGI application"""
+    return isinstance(request, ASGIRequest)
+
+
+def _stream_unavailable():
+    return JsonResponse(
+        {"error": "Live notifications need the ASGI server; poll the unread count instead."},
+        status=503,
+    )
+
+
+def issue_stream_ticket(user):
+    return signing.dumps({"user": user.id}, salt=STREAM_TICKET_SALT)
+
+
+def _ticket_user(ticket):
+    try:
+        data = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_MAX_AGE)
+    except signing.BadSignature:  # also raised for expired tickets
+        return None
+    return User.objects.filter(id=data.get("user"), is_active=True).first()
+
+
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+def stream_ticket(request):
+    """POST /api/notifications/stream/ticket/ - a short-lived ticket for the stream URL"""
+    if not streaming_available(request._request):
+        return _stream_unavailable()
+    return Response({"ticket": issue_stream_ticket(request.user), "expires_in": STREAM_TICKET_MAX_AGE})
+
+
+def authenticate_stream_request(request):
+    """
+    Resolve the user from the Authorization header or, since EventSource
+    cannot send headers, from a ``?ticket=`` issued by ``stream_ticket``.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            return auth.get_user(auth.get_validated_token(raw_token))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None
+    ticket = request.GET.get("ticket")
+    return _ticket_user(ticket) if ticket else None
+
+
+def _format_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+_state = sync_to_async(get_state)
+
+
+@sync_to_async
+def _notifications_after(user_id, last_id):
+    rows = (
+        Notification.objects.filter(user_id=user_id, id__gt=last_id)
+        .order_by("id")
+        .values(*NOTIFICATION_VALUE_FIELDS)
+    )
+    return [notification_row_to_dict(row) for row in rows]
+
+
+async def event_stream(user_id, last_id=None):
+    """Yield SSE frames for one user until MAX_STREAM_SECONDS have passed"""
+    unread, latest_id = await _state(user_id)
+    if last_id is None:
+        last_id = latest_id
+    yield _format_event("unread_count", {"unread_count": unread, "delta": 0})
+    sent_unread = unread
+
+    elapsed = 0
+    silent = 0
+    while True:
+        # Rows are only read when the counter shows newer ones (or on resume)
+        if latest_id > last_id:
+            for notification in await _notifications_after(user_id, last_id):
+                last_id = notification["id"]
+                silent = 0
+                yield _format_event("notification", notification, event_id=last_id)
+            last_id = max(last_id, latest_id)
+
+        if unread != sent_unread:
+            silent = 0
+            yield _format_event(
+                "unread_count", {"unread_count": unread, "delta": unread - sent_unread}
+            )
+            sent_unread = unread
+
+        if silent >= HEARTBEAT_INTERVAL:
+            silent = 0
+            yield ": keep-alive\n\n"
+
+        if elapsed >= MAX_STREAM_SECONDS:
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+        elapsed += POLL_INTERVAL
+        silent += POLL_INTERVAL
+        unread, latest_id = await _state(user_id)
+
+
+@require_GET
+async def notification_stream(request):
+    """GET /api/notifications/stream/ - push new notifications over SSE"""
+    if not streaming_available(request):
+        return _stream_unavailable()
+    user = await sync_to_async(authenticate_stream_request)(request)
+    if user is None:
+        return JsonResponse(
+            {"error": "Authentication credentials were not provided."}, status=401
+        )
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+
+    response = StreamingHttpResponse(
+        event_stream(user.id, last_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
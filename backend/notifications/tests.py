@@ -1,3 +1,516 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.management import call_command
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from buildings.models import Building, Floor, Room
+from maintenance.models import MaintenanceRequest
+from . import counters, retention, stream
+from .helpers import NotificationBatch, notify_admins, notify_staff_and_admins, notify_user
+from .models import Notification, NotificationArchive, NotificationCounter, NotificationOutbox
+from .outbox import process_pending
+from .serializers import (
+    NOTIFICATION_VALUE_FIELDS,
+    NotificationSerializer,
+    notification_row_to_dict,
+)
+
+
+class FastNotificationSerializationTests(TestCase):
+    """The .values() notification path must render exactly what the serializer does"""
+
+    def test_rows_match_serializer(self):
+        user = User.objects.create_user("jane", password="x")
+        building = Building.objects.create(name="Main")
+        floor = Floor.objects.create(building=building, number=1, label="Ground")
+        room = Room.objects.create(building=building, floor=floor, name="101")
+        request = MaintenanceRequest.objects.create(
+            description="x" * 80, role="student", building=building, floor=floor, room=room
+        )
+        bare = MaintenanceRequest.objects.create(description="", role="staff", building=building)
+        Notification.objects.create(user=user, message="With room", maintenance_request=request)
+        Notification.objects.create(user=user, message="No description", maintenance_request=bare)
+        Notification.objects.create(user=user, message="Standalone")
+
+        notifications = Notification.objects.filter(user=user).order_by("id")
+        expected = NotificationSerializer(notifications, many=True).data
+        actual = [notification_row_to_dict(row) for row in notifications.values(*NOTIFICATION_VALUE_FIELDS)]
+
+        self.assertEqual(actual, [dict(item) for item in expected])
+
+
+
+class FanOutTests(TestCase):
+    """Notifying every admin costs the same queries whatever their number"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.requester = User.objects.create_user("jane", password="x")
+
+    def add_admins(self, count):
+        start = User.objects.count()
+        User.objects.bulk_create(User(username=f"admin{start + i}", is_staff=True) for i in range(count))
+        return list(User.objects.filter(is_staff=True).order_by("id"))[-count:]
+
+    def fan_out(self, send):
+        with CaptureQueriesContext(connection) as context:
+            created = send()
+        inserts = [q["sql"] for q in context.captured_queries if q["sql"].startswith('INSERT INTO "notifications_notification"')]
+        self.assertEqual(len(inserts), 1)
+        return created, len(context)
+
+    def test_notify_admins_is_one_insert(self):
+        admins = self.add_admins(3)
+        notify_admins("Creates the counters")
+        created, few = self.fan_out(lambda: notify_admins("Hello"))
+        self.assertEqual({n.user_id for n in created}, {a.id for a in admins})
+
+        admins += self.add_admins(40)
+        notify_admins("Creates the new counters")
+        created, many = self.fan_out(lambda: notify_admins("Hello again"))
+        self.assertEqual(sorted(n.user_id for n in created), sorted(a.id for a in admins))
+        self.assertEqual(many, few)
+
+    def test_staff_and_admins_exclude_the_actor(self):
+        admins = self.add_admins(5)
+        superuser = User.objects.create_superuser("root", password="x")
+        created, _ = self.fan_out(lambda: notify_staff_and_admins("Claimed", exclude_user=admins[0]))
+
+        self.assertEqual({n.user_id for n in created}, {a.id for a in admins[1:]} | {superuser.id})
+        self.assertFalse(Notification.objects.filter(user=self.requester).exists())
+
+
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.building = Building.objects.create(name="Main")
+
+    def test_deleted_recipient_is_skipped(self):
+        requester = User.objects.create_user("jane", password="x")
+        staff = User.objects.create_user("tech", password="x")
+        request = MaintenanceRequest.objects.create(
+            description="x", role="staff", building=self.building, created_by=requester
+        )
+        request.assigned_to = staff
+        request.status = "in_progress"
+        request.save()
+        # Both recipients leave between enqueue and the worker run
+        requester.delete()
+        staff.delete()
+
+        self.assertEqual(process_pending(), 2)
+        self.assertFalse(NotificationOutbox.objects.filter(processed_at__isnull=True).exists())
+        self.assertEqual(
+            set(Notification.objects.values_list("user_id", flat=True)), {self.admin.id}
+        )
+
+    def test_failed_batch_is_retried_per_event(self):
+        for index in range(3):
+            MaintenanceRequest.objects.create(description=f"x{index}", role="staff", building=self.building)
+
+        send = NotificationBatch.send
+        calls = []
+
+        def fail_first_and_second_event(batch):
+            calls.append(len(batch))
+            # The whole batch fails, then the first event alone fails again
+            if len(calls) <= 2:
+                raise IntegrityError("FOREIGN KEY constraint failed")
+            return send(batch)
+
+        with mock.patch.object(NotificationBatch, "send", autospec=True, side_effect=fail_first_and_second_event), \
+                self.assertLogs("notifications.outbox", "ERROR"):
+            self.assertEqual(process_pending(), 3)
+
+        first, *others = NotificationOutbox.objects.order_by("id")
+        self.assertEqual((first.processed_at, first.attempts), (None, 1))
+        self.assertIn("FOREIGN KEY", first.last_error)
+        self.assertTrue(all(entry.processed_at and entry.attempts == 0 for entry in others))
+        self.assertEqual(Notification.objects.count(), 2)
+
+
+    def test_processed_events_are_pruned(self):
+        for index in range(3):
+            MaintenanceRequest.objects.create(description=f"x{index}", role="staff", building=self.building)
+        process_pending()
+        failed = NotificationOutbox.objects.create(event="request_created", attempts=5, last_error="boom")
+        pending = NotificationOutbox.objects.create(event="request_created")
+        old = timezone.now() - timedelta(days=30)
+        NotificationOutbox.objects.filter(processed_at__isnull=False).update(processed_at=old)
+        recent = NotificationOutbox.objects.create(event="request_created", processed_at=timezone.now())
+
+        self.assertEqual(retention.purge_outbox(7, dry_run=True), 3)
+        self.assertEqual(retention.purge_outbox(7, batch_size=2), 3)
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list("id", flat=True)), {failed.id, pending.id, recent.id}
+        )
+
+
+class NotificationStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("jane", password="x")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def notify(self, message):
+        batch = NotificationBatch()
+        batch.add(self.user.id, message)
+        batch.send()
+        return Notification.objects.get(user=self.user, message=message)
+
+    def collect(self, last_id=None, ticks=0):
+        """Frames of one stream that ends after ``ticks`` poll intervals"""
+        async def run():
+            return [frame async for frame in stream.event_stream(self.user.id, last_id)]
+
+        async def no_wait(seconds):
+            pass
+
+        with mock.patch.object(stream, "MAX_STREAM_SECONDS", ticks * stream.POLL_INTERVAL), \
+                mock.patch.object(stream.asyncio, "sleep", no_wait):
+            return async_to_sync(run)()
+
+    def asgi(self, method, path, token=None, **kwargs):
+        """Call an endpoint through the ASGI handler, as uvicorn would"""
+        if token:
+            kwargs["headers"] = {"Authorization": f"Bearer {token}"}
+        return async_to_sync(getattr(self.async_client, method))(path, **kwargs)
+
+    def access_token(self):
+        return str(RefreshToken.for_user(self.user).access_token)
+
+    def test_requires_credentials(self):
+        self.assertEqual(self.asgi("get", "/api/notifications/stream/").status_code, 401)
+        self.assertEqual(self.asgi("get", "/api/notifications/stream/?ticket=forged").status_code, 401)
+        self.assertEqual(self.asgi("post", "/api/notifications/stream/ticket/").status_code, 401)
+
+    def test_access_token_is_not_accepted_in_the_url(self):
+        response = self.asgi("get", f"/api/notifications/stream/?token={self.access_token()}")
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket_opens_the_stream(self):
+        ticket = self.asgi("post", "/api/notifications/stream/ticket/", token=self.access_token()).json()["ticket"]
+
+        with mock.patch.object(stream, "MAX_STREAM_SECONDS", 0):
+            response = self.asgi("get", "/api/notifications/stream/", data={"ticket": ticket})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+
+    def test_unavailable_under_wsgi(self):
+        # WSGI would buffer the whole stream; clients must fall back to polling
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.post("/api/notifications/stream/ticket/").status_code, 503)
+        ticket = stream.issue_stream_ticket(self.user)
+        self.assertEqual(self.client.get("/api/notifications/stream/", {"ticket": ticket}).status_code, 503)
+
+    def test_expired_ticket_is_rejected(self):
+        ticket = stream.issue_stream_ticket(self.user)
+        later = signing.time.time() + stream.STREAM_TICKET_MAX_AGE + 1
+        with mock.patch.object(signing.time, "time", return_value=later):
+            self.assertIsNone(stream._ticket_user(ticket))
+        self.assertEqual(stream._ticket_user(ticket), self.user)
+
+    def test_resume_sends_only_newer_notifications(self):
+        first = self.notify("first")
+        second = self.notify("second")
+        third = self.notify("third")
+
+        frames = self.collect(last_id=first.id)
+
+        events = [frame for frame in frames if "event: notification" in frame]
+        self.assertEqual(len(events), 2)
+        self.assertIn(f"id: {second.id}\n", events[0])
+        self.assertIn(f"id: {third.id}\n", events[1])
+        self.assertEqual(json.loads(frames[0].split("data: ")[1])["unread_count"], 3)
+
+    def test_new_stream_starts_after_existing_notifications(self):
+        self.notify("old")
+        frames = self.collect()
+        self.assertFalse(any("event: notification" in frame for frame in frames))
+
+    def test_idle_stream_reads_only_the_counter_and_sends_heartbeats(self):
+        self.notify("old")
+        ticks = stream.HEARTBEAT_INTERVAL // stream.POLL_INTERVAL
+        with mock.patch.object(stream, "_notifications_after", side_effect=AssertionError):
+            frames = self.collect(ticks=ticks)
+        self.assertEqual(frames[1:], [": keep-alive\n\n"])
+
+    def test_counter_change_wakes_the_stream(self):
+        self.notify("old")
+        polls = []
+        state = stream._state
+
+        async def counter_then_insert(user_id):
+            polls.append(user_id)
+            if len(polls) == 2:
+                await stream.sync_to_async(self.notify)("new")
+            return await state(user_id)
+
+        with mock.patch.object(stream, "_state", counter_then_insert):
+            frames = self.collect(ticks=1)
+
+        self.assertIn("event: notification", frames[1])
+        self.assertIn('"message": "new"', frames[1])
+        self.assertEqual(json.loads(frames[2].split("data: ")[1]), {"unread_count": 2, "delta": 1})
+
+
+class UnreadCounterTests(TestCase):
+    """Every write path must leave the counter equal to a count of the table"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("jane", password="x")
+        cls.other = User.objects.create_user("joe", password="x")
+        cls.building = Building.objects.create(name="Main")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertCounterMatchesTable(self, user, unread):
+        latest = Notification.objects.filter(user=user).order_by("-id").values_list("id", flat=True).first()
+        self.assertEqual(Notification.objects.filter(user=user, is_read=False).count(), unread)
+        self.assertEqual(counters.get_state(user.id), (unread, latest or 0))
+
+    def test_created(self):
+        notify_user(self.user, "first")
+        self.assertTrue(NotificationCounter.objects.filter(user=self.user).exists())
+        notify_user(self.user, "second")
+        batch = NotificationBatch()
+        batch.add_many([self.user.id, self.other.id], "third")
+        batch.send()
+
+        self.assertCounterMatchesTable(self.user, 3)
+        self.assertCounterMatchesTable(self.other, 1)
+
+    def test_mark_read(self):
+        notification = notify_user(self.user, "first")
+        notify_user(self.user, "second")
+
+        response = self.client.post(f"/api/notifications/{notification.id}/mark-read/")
+        self.assertTrue(response.data["is_read"])
+        self.assertCounterMatchesTable(self.user, 1)
+
+        # Marking it again must not count it twice
+        self.client.post(f"/api/notifications/{notification.id}/mark-read/")
+        self.assertCounterMatchesTable(self.user, 1)
+
+    def test_concurrent_mark_read_decrements_once(self):
+        notification = notify_user(self.user, "first")
+        notify_user(self.user, "second")
+        get = Notification.objects.get
+
+        def read_by_another_request(*args, **kwargs):
+            # Another request flips the row after this one loaded it unread
+            found = get(*args, **kwargs)
+            if Notification.objects.filter(id=found.id, is_read=False).update(is_read=True):
+                counters.decrement(self.user.id)
+            return found
+
+        with mock.patch.object(Notification.objects, "get", side_effect=read_by_another_request):
+            self.client.post(f"/api/notifications/{notification.id}/mark-read/")
+            self.client.post(f"/api/notifications/{notification.id}/mark-read/")
+
+        self.assertCounterMatchesTable(self.user, 1)
+
+    def test_mark_all_read(self):
+        notify_user(self.user, "first")
+        notify_user(self.user, "second")
+        notify_user(self.other, "other")
+
+        self.assertEqual(self.client.post("/api/notifications/mark-all-read/").data["count"], 2)
+        self.assertCounterMatchesTable(self.user, 0)
+        self.assertCounterMatchesTable(self.other, 1)
+
+        notify_user(self.user, "third")
+        self.assertEqual(self.client.post("/api/notifications/mark-all-read/").data["count"], 1)
+        self.assertCounterMatchesTable(self.user, 0)
+
+    def test_delete(self):
+        unread = notify_user(self.user, "unread")
+        read = notify_user(self.user, "read")
+        notify_user(self.user, "kept")
+        self.client.post(f"/api/notifications/{read.id}/mark-read/")
+
+        self.assertEqual(self.client.delete(f"/api/notifications/{unread.id}/").status_code, 204)
+        self.assertCounterMatchesTable(self.user, 1)
+        self.assertEqual(self.client.delete(f"/api/notifications/{unread.id}/").status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/notifications/{read.id}/").status_code, 204)
+        self.assertCounterMatchesTable(self.user, 1)
+
+    def test_cascade_delete_of_request(self):
+        request = MaintenanceRequest.objects.create(description="x", role="staff", building=self.building)
+        Notification.objects.all().delete()
+        counters.recount([self.user.id])
+        notify_user(self.user, "about the request", request)
+        notify_user(self.user, "standalone")
+
+        request.delete()
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+        self.assertEqual(Notification.objects.filter(user=self.user, is_read=False).count(), 1)
+
+    def test_retention_deletes(self):
+        old = notify_user(self.user, "old")
+        notify_user(self.user, "unread")
+        Notification.objects.filter(id=old.id).update(is_read=True)
+        counters.decrement(self.user.id)
+        Notification.objects.update(created_at=timezone.now() - timedelta(days=90))
+
+        self.assertEqual(retention.purge_read(older_than_days=30), 1)
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+
+
+class RetentionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("jane", password="x")
+        cls.other = User.objects.create_user("joe", password="x")
+        building = Building.objects.create(name="Main")
+        cls.request = MaintenanceRequest.objects.create(description="x", role="staff", building=building)
+        cls.second_request = MaintenanceRequest.objects.create(description="y", role="staff", building=building)
+
+    def setUp(self):
+        Notification.objects.all().delete()
+        self.now = timezone.now()
+
+    def notification(self, message, days_ago=0, is_read=False, user=None, request=None):
+        notification = Notification.objects.create(
+            user=user or self.user, message=message, is_read=is_read, maintenance_request=request
+        )
+        Notification.objects.filter(id=notification.id).update(
+            created_at=self.now - timedelta(days=days_ago)
+        )
+        notification.refresh_from_db()
+        return notification
+
+    def status_change(self, status, days_ago, is_read=False, user=None, request=None):
+        request = request or self.request
+        return self.notification(
+            f"Request #{request.id} status changed to {status}.", days_ago, is_read, user, request
+        )
+
+    def test_purge_archives_a_copy(self):
+        old = [self.notification(f"old {i}", days_ago=100, is_read=True, request=self.request) for i in range(3)]
+        recent = self.notification("recent", days_ago=5, is_read=True)
+        unread = self.notification("old unread", days_ago=100)
+
+        self.assertEqual(retention.purge_read(90, batch_size=2, archive=True), 3)
+
+        self.assertEqual(set(Notification.objects.values_list("id", flat=True)), {recent.id, unread.id})
+        archived = {row.original_id: row for row in NotificationArchive.objects.all()}
+        self.assertEqual(set(archived), {n.id for n in old})
+        for notification in old:
+            copy = archived[notification.id]
+            self.assertEqual(
+                (copy.user_id, copy.message, copy.maintenance_request_id, copy.is_read, copy.created_at),
+                (notification.user_id, notification.message, self.request.id, True, notification.created_at),
+            )
+
+    def test_dry_run_removes_nothing(self):
+        self.notification("old", days_ago=100, is_read=True)
+        self.status_change("in progress", days_ago=2)
+        self.status_change("completed", days_ago=1)
+        out = StringIO()
+
+        call_command("prune_notifications", "--dry-run", "--archive", "--days=90", stdout=out)
+
+        self.assertIn("Would remove 1 repeated status-change notifications", out.getvalue())
+        self.assertIn("Would remove 1 read notifications older than 90 days", out.getvalue())
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertFalse(NotificationArchive.objects.exists())
+
+    def test_compaction_keeps_the_newest_status_change_per_request(self):
+        self.status_change("pending", days_ago=3)
+        self.status_change("in progress", days_ago=2)
+        newest = self.status_change("completed", days_ago=1)
+        other_request = self.status_change("in progress", days_ago=3, request=self.second_request)
+        other_user = self.status_change("in progress", days_ago=3, user=self.other)
+        unrelated = self.notification("New comment", days_ago=4, request=self.request)
+
+        self.assertEqual(retention.compact_status_changes(batch_size=1), 2)
+
+        self.assertEqual(
+            set(Notification.objects.values_list("id", flat=True)),
+            {newest.id, other_request.id, other_user.id, unrelated.id},
+        )
+
+    def test_compaction_keeps_counters_consistent(self):
+        self.status_change("pending", days_ago=3)
+        self.status_change("in progress", days_ago=2, is_read=True)
+        self.status_change("completed", days_ago=1)
+        self.notification("standalone")
+        counters.recount([self.user.id])
+
+        retention.compact_status_changes()
+
+        self.assertEqual(Notification.objects.filter(user=self.user, is_read=False).count(), 2)
+        self.assertEqual(counters.get_unread_count(self.user.id), 2)
+
+
+class NotificationListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("jane", password="x")
+        cls.other = User.objects.create_user("joe", password="x")
+        start = timezone.now() - timedelta(hours=10)
+        cls.notifications = []
+        for hour in range(6):
+            notification = Notification.objects.create(user=cls.user, message=f"#{hour}", is_read=hour % 2 == 0)
+            Notification.objects.filter(id=notification.id).update(created_at=start + timedelta(hours=hour))
+            notification.refresh_from_db()
+            cls.notifications.append(notification)
+        Notification.objects.create(user=cls.other, message="not yours")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def messages(self, **params):
+        response = self.client.get("/api/notifications/my/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["message"] for row in response.data["results"]]
+
+    def test_newest_first_and_only_own(self):
+        self.assertEqual(self.messages(), ["#5", "#4", "#3", "#2", "#1", "#0"])
+
+    def test_since_id(self):
+        self.assertEqual(self.messages(since=self.notifications[3].id), ["#5", "#4"])
+
+    def test_since_timestamp(self):
+        since = self.notifications[3].created_at.isoformat()
+        self.assertEqual(self.messages(since=since), ["#5", "#4"])
+
+    def test_since_junk(self):
+        response = self.client.get("/api/notifications/my/", {"since": "junk"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.data)
+
+    def test_is_read(self):
+        self.assertEqual(self.messages(is_read="false"), ["#5", "#3", "#1"])
+        self.assertEqual(self.messages(is_read="true"), ["#4", "#2", "#0"])
+
+    def test_cursor_pages_are_stable_while_rows_arrive(self):
+        first = self.client.get("/api/notifications/my/", {"page_size": 2}).data
+        self.assertEqual([row["message"] for row in first["results"]], ["#5", "#4"])
+        self.assertNotIn("count", first)
 
-# Create your tests here.
+        notify_user(self.user, "new")
+        second = self.client.get(first["next"]).data
+        self.assertEqual([row["message"] for row in second["results"]], ["#3", "#2"])
+        third = self.client.get(second["next"]).data
+        self.assertEqual([row["message"] for row in third["results"]], ["#1", "#0"])
+        self.assertIsNone(third["next"])
@@ -1,13 +1,18 @@
 from django.urls import path
 from .views import (
     UserNotificationsView,
+    unread_count,
     mark_notification_read,
     mark_all_read,
     delete_notification,
 )
+from .stream import notification_stream, stream_ticket
 
 urlpatterns = [
     path("my/", UserNotificationsView.as_view(), name="my_notifications"),
+    path("stream/", notification_stream, name="notification_stream"),
+    path("stream/ticket/", stream_ticket, name="notification_stream_ticket"),
+    path("unread-count/", unread_count, name="notification_unread_count"),
     path("<int:pk>/mark-read/", mark_notification_read, name="mark_notification_read"),
     path("mark-all-read/", mark_all_read, name="mark_all_read"),
     path("<int:pk>/", delete_notification, name="delete_notification"),
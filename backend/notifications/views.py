@@ -1,32 +1,88 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from . import counters
 from .models import Notification
-from .serializers import NotificationSerializer
+from .pagination import NotificationCursorPagination
+from .serializers import (
+    NOTIFICATION_VALUE_FIELDS,
+    NotificationSerializer,
+    notification_row_to_dict,
+)
 
 
 class UserNotificationsView(generics.ListAPIView):
+    """
+    List the current user's notifications, newest first (cursor paginated)
+
+    Query params:
+        since: only notifications newer than this notification id or ISO
+               timestamp (delta sync for clients that already have the rest)
+        is_read: "true"/"false" to filter by read state
+    """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(
+        queryset = Notification.objects.filter(
             user=self.request.user
         ).select_related(
             'maintenance_request',
             'maintenance_request__building',
             'maintenance_request__room'  # Add this if room is ForeignKey
-        ).order_by("-created_at")
+        )
+
+        is_read = self.request.query_params.get('is_read')
+        if is_read is not None:
+            queryset = queryset.filter(is_read=is_read.lower() in ('1', 'true', 'yes'))
+
+        since = self.request.query_params.get('since')
+        if since:
+            queryset = self.filter_since(queryset, since)
+
+        return queryset.order_by("-created_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        """Render NotificationSerializer's JSON straight from .values() rows"""
+        queryset = self.filter_queryset(self.get_queryset()).values(*NOTIFICATION_VALUE_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([notification_row_to_dict(row) for row in page])
+        return Response([notification_row_to_dict(row) for row in queryset])
+
+    def filter_since(self, queryset, since):
+        """Keep notifications newer than a notification id or a timestamp"""
+        if since.isdigit():
+            return queryset.filter(id__gt=int(since))
+
+        timestamp = parse_datetime(since)
+        if timestamp is None:
+            raise ValidationError({"since": "Expected a notification id or an ISO 8601 timestamp."})
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        return queryset.filter(created_at__gt=timestamp)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def unread_count(request):
+    """Return the number of unread notifications (cached per-user counter)"""
+    return Response({"unread_count": counters.get_unread_count(request.user.id)})
 
 
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
 def mark_notification_read(request, pk):
     """Mark a single notification as read"""
+    # Only the request that actually flips the row adjusts the counter
+    if Notification.objects.filter(id=pk, user=request.user, is_read=False).update(is_read=True):
+        counters.decrement(request.user.id)
     try:
         notification = Notification.objects.get(id=pk, user=request.user)
-        notification.is_read = True
-        notification.save()
         serializer = NotificationSerializer(notification)
         return Response(serializer.data)
     except Notification.DoesNotExist:
@@ -42,6 +98,7 @@ def mark_all_read(request):
     updated = Notification.objects.filter(user=request.user, is_read=False).update(
         is_read=True
     )
+    counters.decrement(request.user.id, updated)
 
     return Response(
         {"message": f"{updated} notifications marked as read", "count": updated}
@@ -52,13 +109,13 @@ def mark_all_read(request):
 @permission_classes([permissions.IsAuthenticated])
 def delete_notification(request, pk):
     """Delete a notification"""
-    try:
-        notification = Notification.objects.get(id=pk, user=request.user)
-        notification.delete()
-        return Response(
-            {"message": "Notification deleted"}, status=status.HTTP_204_NO_CONTENT
-        )
-    except Notification.DoesNotExist:
+    notifications = Notification.objects.filter(id=pk, user=request.user)
+    if notifications.filter(is_read=False).delete()[0]:
+        counters.decrement(request.user.id)
+    elif not notifications.delete()[0]:
         return Response(
             {"error": "Notification not found"}, status=status.HTTP_404_NOT_FOUND
-        )
\ No newline at end of file
+        )
+    return Response(
+        {"message": "Notification deleted"}, status=status.HTTP_204_NO_CONTENT
+    )
@@ -0,0 +1,21 @@
+// Print the built-in floor plans of src/utils/roomLayouts.js as a layout
+// import file for the backend:
+//
+//   node scripts/export-room-layouts.mjs > layouts.json
+//   python manage.py load_floor_layouts layouts.json
+import { getDefaultRoomsForFloor, listLayoutFloors } from '../src/utils/roomLayouts.js';
+
+const layouts = listLayoutFloors().map(([building, floor]) => {
+  const { rooms, canvasWidth, canvasHeight } = getDefaultRoomsForFloor(building, floor);
+  return {
+    building,
+    floor,
+    canvas_width: Math.round(canvasWidth),
+    canvas_height: Math.round(canvasHeight),
+    rooms: rooms.map(({ id, room_number, room_name, x, y, width, height, special }) => ({
+      id, room_number, room_name, x, y, width, height, special,
+    })),
+  };
+});
+
+process.stdout.write(JSON.stringify({ layouts }, null, 2) + '\n');
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { maintenanceAPI } from '../services/api';
+import { requestsAPI } from '../services/api';
 import Header from './Header';
 import Footer from './Footer';
 import { Calendar, Clock, MapPin, User } from 'lucide-react';
@@ -21,7 +21,14 @@ function MaintenanceCalendar() {
     setError(null);
     
     try {
-      const response = await maintenanceAPI.getAll();
+      // Only the visible month, read as one range over the created_at index
+      const year = currentDate.getFullYear();
+      const month = String(currentDate.getMonth() + 1).padStart(2, '0');
+      const lastDay = new Date(year, currentDate.getMonth() + 1, 0).getDate();
+      const response = await requestsAPI.getAll({
+        created_after: `${year}-${month}-01`,
+        created_before: `${year}-${month}-${lastDay}`,
+      });
       
       // Handle both array and object responses
       const requestsData = Array.isArray(response.data) 
@@ -46,10 +46,74 @@ function NotificationBell() {
 
   useEffect(() => {
     fetchNotifications();
-    // Refresh every 15 seconds for more responsive updates
-    const interval = setInterval(fetchNotifications, 15000);
-    return () => clearInterval(interval);
-  }, [fetchNotifications]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  // Live updates pushed by the server; fall back to polling if the stream fails.
+  // Tickets expire quickly, so every (re)connect asks for a fresh one.
+  useEffect(() => {
+    let interval = null;
+    let source = null;
+    let retry = null;
+    let failures = 0;
+    let lastEventId = null;
+    let closed = false;
+
+    const fallBackToPolling = () => {
+      if (!interval) interval = setInterval(fetchNotifications, 15000);
+    };
+
+    const connect = async () => {
+      let ticket;
+      try {
+        ticket = (await notificationAPI.getStreamTicket()).data.ticket;
+      } catch (error) {
+        // Also 503 when the backend runs without its ASGI server
+        fallBackToPolling();
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(notificationAPI.streamUrl(ticket, lastEventId));
+
+      source.addEventListener('notification', (event) => {
+        failures = 0;
+        lastEventId = event.lastEventId || lastEventId;
+        const notification = JSON.parse(event.data);
+        if (!notification.is_read) {
+          setNotifications(prev => [notification, ...prev.filter(n => n.id !== notification.id)]);
+          setShowNewBadge(true);
+          setTimeout(() => setShowNewBadge(false), 3000);
+        }
+      });
+
+      source.addEventListener('unread_count', (event) => {
+        failures = 0;
+        const { unread_count } = JSON.parse(event.data);
+        setUnreadCount(unread_count);
+      });
+
+      source.onerror = () => {
+        // The browser would retry with the same (soon expired) ticket
+        source.close();
+        failures += 1;
+        if (failures > 3) {
+          fallBackToPolling();
+        } else if (!closed) {
+          retry = setTimeout(connect, 1000 * failures);
+        }
+      };
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      if (source) source.close();
+      if (retry) clearTimeout(retry);
+      if (interval) clearInterval(interval);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
 
   const markAsRead = async (id) => {
     try {
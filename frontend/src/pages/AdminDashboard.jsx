@@ -25,7 +25,10 @@ function AdminDashboard() {
 
   const fetchDashboardData = async () => {
     try {
-      const response = await requestAPI.getAll();
+      const [response, trendsResponse] = await Promise.all([
+        requestAPI.getAll(),
+        api.get('/maintenance/analytics/trends/', { params: { days: 30 } }),
+      ]);
       
       let requests;
       if (Array.isArray(response.data)) {
@@ -43,8 +46,8 @@ function AdminDashboard() {
       const totalTasks = requests.length;
 
       const recentRequests = requests.slice(0, 4);
-      const requestTrends = calculateRequestTrends(requests, 30);
-      const completionTrends = calculateCompletionTrends(requests, 30);
+      const requestTrends = trendsResponse.data.request_trends.map(formatTrend);
+      const completionTrends = trendsResponse.data.completion_trends.map(formatTrend);
 
       setStats({
         totalTasks,
@@ -69,52 +72,11 @@ function AdminDashboard() {
     }
   };
 
-  const calculateRequestTrends = (requests, days) => {
-    const trends = {};
-    const now = new Date();
-    
-    for (let i = days - 1; i >= 0; i--) {
-      const date = new Date(now.getTime() - i * 24 * 60 * 60 * 1000);
-      const dateStr = date.toISOString().split('T')[0];
-      trends[dateStr] = 0;
-    }
-
-    requests.forEach(req => {
-      const reqDate = new Date(req.created_at).toISOString().split('T')[0];
-      if (trends.hasOwnProperty(reqDate)) {
-        trends[reqDate]++;
-      }
-    });
-
-    return Object.entries(trends).map(([date, count]) => ({
-      date: new Date(date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      requests: count
-    }));
-  };
-
-  const calculateCompletionTrends = (requests, days) => {
-    const trends = {};
-    const now = new Date();
-    
-    for (let i = days - 1; i >= 0; i--) {
-      const date = new Date(now.getTime() - i * 24 * 60 * 60 * 1000);
-      const dateStr = date.toISOString().split('T')[0];
-      trends[dateStr] = 0;
-    }
-
-    const completedRequests = requests.filter(r => r.status === 'completed');
-    completedRequests.forEach(req => {
-      const reqDate = new Date(req.updated_at).toISOString().split('T')[0];
-      if (trends.hasOwnProperty(reqDate)) {
-        trends[reqDate]++;
-      }
-    });
-
-    return Object.entries(trends).map(([date, count]) => ({
-      date: new Date(date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      completed: count
-    }));
-  };
+  // Trend series come pre-aggregated from the daily rollup table
+  const formatTrend = (point) => ({
+    ...point,
+    date: new Date(point.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
+  });
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-purple-50">
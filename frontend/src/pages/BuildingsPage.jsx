@@ -106,29 +106,26 @@ const BuildingsPage = () => {
       
       setCurrentFloorObj(floor);
       
-      // Step 3: Get rooms for this floor
-      const roomsResponse = await buildingsAPI.getRooms(floor.id);
-      const apiRoomsData = Array.isArray(roomsResponse.data) 
-        ? roomsResponse.data 
-        : roomsResponse.data.results || [];
-
-      // Step 4: Get ALL maintenance requests for this building/floor
-      const maintenanceResponse = await requestsAPI.getAll();
-      const allRequests = Array.isArray(maintenanceResponse.data) 
-        ? maintenanceResponse.data 
-        : maintenanceResponse.data.results || [];
-
-      // Filter requests for current building and floor
-      const floorRequests = allRequests.filter(req => 
-        req.building?.id === building.id && 
-        req.floor?.id === floor.id &&
-        req.status !== 'approved'
-      );
+      // Step 3: Use the plan stored server-side; its rooms were matched at
+      // import time and come with their request status
+      const storedLayout = await buildingsAPI.getFloorLayout(floor.id).catch(error => {
+        if (error.response?.status === 404) return null;
+        throw error;
+      });
+      if (storedLayout) {
+        const { rooms, canvas_width, canvas_height } = storedLayout.data;
+        const layoutRooms = rooms.map(room => ({ ...room, id: room.room_id ?? room.id }));
+        setBlueprintData({ rooms: layoutRooms, canvasWidth: canvas_width, canvasHeight: canvas_height });
+        setStatistics(calculateStatistics(layoutRooms));
+        return;
+      }
 
-      // Step 5: Get the default layout
+      // Step 4: No stored plan - merge the built-in layout with the
+      // per-room status (aggregated server-side in one grouped query)
+      const heatmapResponse = await buildingsAPI.getFloorHeatmap(floor.id);
+      const apiRoomsData = heatmapResponse.data.rooms || [];
       const blueprint = getDefaultRoomsForFloor(currentBuilding, currentFloor);
 
-      // Step 6: Merge API data with layout AND add real maintenance status
       const mergedRooms = blueprint.rooms.map(layoutRoom => {
         // Skip special rooms (hallways, stairs)
         if (layoutRoom.special === 'hallway' || layoutRoom.special === 'stairs') {
@@ -149,30 +146,12 @@ const BuildingsPage = () => {
         });
         
         if (apiRoom) {
-          // Room exists in backend - get its maintenance requests
-          const roomRequests = floorRequests.filter(req => 
-            req.room?.id === apiRoom.id && 
-            req.status !== 'approved'
-          );
-          
-          // Calculate status based on requests
-          let status = 'no_request';
-          if (roomRequests.length > 0) {
-            const hasPending = roomRequests.some(r => r.status === 'pending');
-            const hasInProgress = roomRequests.some(r => r.status === 'in_progress');
-            const allCompleted = roomRequests.every(r => r.status === 'completed');
-            
-            if (hasPending) status = 'pending';
-            else if (hasInProgress) status = 'in_progress';
-            else if (allCompleted) status = 'completed';
-          }
-          
           return {
             ...layoutRoom,
             id: apiRoom.id,
             room_name: apiRoom.name,
-            status: status,
-            request_count: roomRequests.length
+            status: apiRoom.status,
+            request_count: apiRoom.total
           };
         }
         
@@ -202,14 +181,11 @@ const BuildingsPage = () => {
     
     setIsLoadingRequests(true);
     try {
-      const response = await requestsAPI.getByRoom(roomId);
-      const allRequestsData = Array.isArray(response.data) 
+      const response = await requestsAPI.getByRoom(roomId, { exclude_status: 'approved' });
+      const requestsData = Array.isArray(response.data) 
         ? response.data 
         : response.data.results || [];
 
-      // Filter out approved requests
-      const requestsData = allRequestsData.filter(req => req.status !== 'approved');
-
       setRequests(requestsData);
     } catch (error) {
       console.error('Error fetching requests:', error);
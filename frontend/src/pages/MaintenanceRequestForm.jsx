@@ -74,37 +74,25 @@ function MaintenanceRequestForm({ onSuccess }) {
     }
   };
 
+  // Load the whole building > floor > room tree once; the browser
+  // revalidates it with its ETag on later visits
   const fetchBuildings = async () => {
     try {
-      const response = await api.get('location/buildings/');
-      const data = Array.isArray(response.data) ? response.data : response.data.results || [];
-      setBuildings(data);
+      const response = await api.get('location/tree/');
+      setBuildings(Array.isArray(response.data) ? response.data : []);
     } catch (err) {
-      console.error('Error fetching buildings:', err);
+      console.error('Error fetching locations:', err);
     }
   };
 
-  const fetchFloors = async (buildingId) => {
-    try {
-      const response = await api.get(`location/buildings/${buildingId}/floors/`);
-      const data = Array.isArray(response.data) ? response.data : response.data.results || [];
-      setFloors(data);
-    } catch (err) {
-      console.error('Error fetching floors:', err);
-      setFloors([]);
-    }
+  const selectFloors = (buildingId) => {
+    const building = buildings.find(b => String(b.id) === String(buildingId));
+    setFloors(building ? building.floors : []);
   };
 
-  // ✅ FIXED: Fetch rooms by floor, not by building
-  const fetchRoomsByFloor = async (floorId) => {
-    try {
-      const response = await api.get(`location/floors/${floorId}/rooms/`);
-      const data = Array.isArray(response.data) ? response.data : response.data.results || [];
-      setRooms(data);
-    } catch (err) {
-      console.error('Error fetching rooms:', err);
-      setRooms([]);
-    }
+  const selectRoomsByFloor = (floorId) => {
+    const floor = floors.find(f => String(f.id) === String(floorId));
+    setRooms(floor ? floor.rooms : []);
   };
 
   const handleChange = (e) => {
@@ -113,14 +101,14 @@ function MaintenanceRequestForm({ onSuccess }) {
 
     // When building changes, fetch floors and reset floor/room
     if (name === 'building' && value) {
-      fetchFloors(value);
+      selectFloors(value);
       setFormData(prev => ({ ...prev, floor: '', room: '' }));
       setRooms([]);
     }
 
     // When floor changes, fetch rooms for that floor
     if (name === 'floor' && value) {
-      fetchRoomsByFloor(value);
+      selectRoomsByFloor(value);
       setFormData(prev => ({ ...prev, room: '' }));
     }
   };
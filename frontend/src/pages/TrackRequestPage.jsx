@@ -31,7 +31,10 @@ export default function TrackRequest() {
       }
 
       // Use the configured axios instance instead of raw fetch
-      const response = await api.get('/maintenance/requests/');
+      // Only request the columns this table renders
+      const response = await api.get('/maintenance/requests/', {
+        params: { fields: 'id,status,building,floor,room,requester_name,description,created_at' }
+      });
       
       console.log('API Response:', response.data); // Debug log
       
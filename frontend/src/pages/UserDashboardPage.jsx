@@ -27,20 +27,12 @@ function UserDashboard() {
   const fetchUserRequests = async () => {
     try {
       setLoading(true);
-      const userData = JSON.parse(localStorage.getItem('user') || '{}');
-      const response = await api.get('/maintenance/requests/');
+      // Served from the (created_by, created_at) index - only this user's requests
+      const response = await api.get('/maintenance/requests/mine/');
       
-      let allRequests = Array.isArray(response.data) 
+      const userRequests = Array.isArray(response.data) 
         ? response.data 
         : response.data.results || [];
-      
-      const requesterName = userData.first_name && userData.last_name
-        ? `${userData.first_name} ${userData.last_name}`.toLowerCase().trim()
-        : userData.username?.toLowerCase() || '';
-
-      const userRequests = allRequests.filter(
-        req => req.requester_name?.toLowerCase() === requesterName
-      );
 
       const pendingCount = userRequests.filter(r => r.status === 'pending').length;
       const inProgressCount = userRequests.filter(r => r.status === 'in_progress').length;
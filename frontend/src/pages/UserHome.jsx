@@ -23,27 +23,22 @@ function UserHome() {
   useEffect(() => {
   const userData = JSON.parse(localStorage.getItem('user') || '{}');
   
-  const requesterName = userData.first_name && userData.last_name
-    ? `${userData.first_name} ${userData.last_name}`.toLowerCase().trim()
-    : userData.username?.toLowerCase() || '';
-
   setUser(userData);
-  fetchRecentRequests(requesterName);
+  fetchRecentRequests();
 }, []);
 
-  const fetchRecentRequests = async (requesterName) => {
+  const fetchRecentRequests = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/maintenance/requests/');
+      // Newest first, only this user's requests
+      const response = await api.get('/maintenance/requests/mine/', {
+        params: { page_size: 3 }
+      });
       
-      let allRequests = Array.isArray(response.data) 
+      const userRequests = Array.isArray(response.data) 
         ? response.data 
         : response.data.results || [];
       
-      const userRequests = allRequests
-        .filter(req => req.requester_name?.toLowerCase().trim() === requesterName)
-        .slice(0, 3);
-      
       setRecentRequests(userRequests);
     } catch (error) {
       console.error('Error fetching recent requests:', error);
@@ -106,25 +106,47 @@ export const requestAPI = {
 // Notification API
 export const notificationAPI = {
   getAll: () => api.get('/notifications/my/'),
+  // Delta sync: only notifications newer than the given id or ISO timestamp
+  getSince: (since) => api.get('/notifications/my/', { params: { since } }),
+  getUnreadCount: () => api.get('/notifications/unread-count/'),
   markAsRead: (id) => api.post(`/notifications/${id}/mark-read/`),
   markAllAsRead: () => api.post('/notifications/mark-all-read/'),
   delete: (id) => api.delete(`/notifications/${id}/`),
+  // Server-Sent Events stream. EventSource cannot send headers, so the URL
+  // carries a short-lived stream ticket instead of the access token.
+  getStreamTicket: () => api.post('/notifications/stream/ticket/'),
+  streamUrl: (ticket, lastEventId) => {
+    const params = new URLSearchParams({ ticket });
+    if (lastEventId) params.set('last_event_id', lastEventId);
+    return `${API_BASE_URL}/api/notifications/stream/?${params}`;
+  },
 };
 
 // Calendar/Schedule API
 export const calendarAPI = {
-  // Get schedules for a specific month
+  // Get calendar events dated start..end (YYYY-MM-DD, inclusive) - one
+  // indexed range read for week, month and agenda views; pass
+  // { assigned_staff } to narrow it to one staff member. Events are compact
+  // ({ id, request, date, title, status, location, assignee }); load the
+  // full schedule of one with getRequestSchedule(event.request)
+  getRange: (start, end, params = {}) =>
+    api.get('/calendar/calendar/range/', {
+      params: { start, end, compact: true, ...params }
+    }),
+
+  // Get calendar events for a specific month (compact, as getRange)
   getMonthSchedules: (year, month) => {
     console.log(`📅 Fetching schedules for ${year}-${month}`);
     return api.get('/calendar/calendar/month/', {
-      params: { year, month }
+      params: { year, month, compact: true }
     });
   },
   
-  // ✅ NEW: Get ALL schedules (fallback if month filtering doesn't work)
+  // ✅ NEW: Get ALL schedules as compact events (fallback if month filtering
+  // doesn't work); load one in full with getRequestSchedule(event.request)
   getAllSchedules: () => {
     console.log('📅 Fetching ALL schedules');
-    return api.get('/calendar/calendar/');
+    return api.get('/calendar/calendar/', { params: { compact: true } });
   },
   
   // Create/update schedule for a maintenance request
@@ -133,7 +155,7 @@ export const calendarAPI = {
     return api.post(`/calendar/schedule/${requestId}/`, data);
   },
   
-  // Get schedule for a specific request
+  // Get the full schedule (with request details) of a specific request
   getRequestSchedule: (requestId) => {
     console.log(`📅 Getting schedule for request ${requestId}`);
     return api.get(`/calendar/schedule/${requestId}/`);
@@ -143,10 +165,18 @@ export const calendarAPI = {
 // Buildings/Location API
 export const buildingsAPI = {
   getAll: () => api.get('/location/buildings/'),
+  // Open request counts per building (cached server-side)
+  getIssues: () => api.get('/location/buildings/issues/'),
   getFloors: (buildingId) => 
     api.get(`/location/buildings/${buildingId}/floors/`),
   getRooms: (floorId) => 
-    api.get(`/location/floors/${floorId}/rooms/`)
+    api.get(`/location/floors/${floorId}/rooms/`),
+  // Rooms of a floor with their aggregated request status
+  getFloorHeatmap: (floorId) =>
+    api.get(`/location/floors/${floorId}/heatmap/`),
+  // Stored floor plan with rooms already matched and their status (404 if none)
+  getFloorLayout: (floorId) =>
+    api.get(`/location/floors/${floorId}/layout/`)
 };
 
 // ✅ UPDATED: Requests API with proper filtering support
@@ -158,14 +188,19 @@ export const requestsAPI = {
     if (filters.building) params.building = filters.building;
     if (filters.floor) params.floor = filters.floor;
     if (filters.status) params.status = filters.status;
+    if (filters.exclude_status) params.exclude_status = filters.exclude_status;
+    if (filters.assigned_to) params.assigned_to = filters.assigned_to;
+    if (filters.created_after) params.created_after = filters.created_after;
+    if (filters.created_before) params.created_before = filters.created_before;
+    if (filters.search) params.search = filters.search;
     
     return api.get('/maintenance/requests/', { params });
   },
   
   // Get requests for a specific room
-  getByRoom: (roomId) => 
+  getByRoom: (roomId, filters = {}) => 
     api.get('/maintenance/requests/', {
-      params: { room: roomId }
+      params: { room: roomId, ...filters }
     }),
   
   // Get requests for a specific building
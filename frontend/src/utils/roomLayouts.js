@@ -6,8 +6,10 @@ const createRoom = (id, room_number, room_name, x, y, width, height, status = 'n
   id, room_number, room_name, x, y, width, height, status, request_count, special
 });
 
-export const getDefaultRoomsForFloor = (building, floor) => {
-  const layouts = {
+// Built-in plans, keyed by building name and floor label. Plans stored
+// server-side (see buildings/layouts.py) take precedence over these; run
+// `node scripts/export-room-layouts.mjs` to produce an import file from them.
+const layouts = {
   'New Building': {
     'Ground Floor': () => {
       const rooms = [];
@@ -943,10 +945,18 @@ export const getDefaultRoomsForFloor = (building, floor) => {
     } // Close the layouts object
   }
   };
+
+export const getDefaultRoomsForFloor = (building, floor) => {
   const layout = layouts[building]?.[floor];
   return layout ? layout() : { rooms: [], canvasWidth: 800, canvasHeight: 600 };
 };
 
+// Every built-in plan as [building, floor label] pairs
+export const listLayoutFloors = () =>
+  Object.entries(layouts).flatMap(([building, floors]) =>
+    Object.keys(floors).map(floor => [building, floor])
+  );
+
 // NOTE: Due to the large size of this file, you should copy the entire
 // getDefaultRoomsForFloor function from your original component.
 // The structure is already set up correctly above.
\ No newline at end of file